@@ -0,0 +1,282 @@
+"""Benchmark handler bot dengan update Telegram sintetis dan Sheets palsu.
+
+Contoh:
+    python -m bench.bench_handlers --sizes 1000 10000 100000 --backend sqlite --latency 0.05
+
+Update diproses oleh Application dari `src.bot.build_application` (ConversationHandler
+dan command handler asli). Request ke Telegram dijawab oleh FakeRequest, sedangkan
+Google Sheets diganti FakeGspreadClient sehingga benchmark berjalan sepenuhnya offline.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+from telegram import Update
+from telegram.ext import Application
+from telegram.request import BaseRequest, RequestData
+from bench.fake_sheets import FakeGspreadClient, make_rows
+from src import list_cache, sheets, state, storage
+from src.bot import build_application
+from src.config import Config
+from src.expiry import ExpiryScheduler
+from src.metrics import LIST_CACHE
+from src.models import parse_sheet
+from src.index import AirdropIndex
+from src.sheets import AsyncSheetsClient, GoogleSheetsClient
+from src.storage import AirdropRepository, SQLiteRepository, SheetsRepository
+from src.write_queue import WriteBehindQueue
+
+class FakeRequest(BaseRequest):
+    """Menjawab semua request Bot API secara lokal dan menghitungnya per endpoint"""
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self._message_id = 0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+
+    async def do_request(self, url: str, method: str, request_data: Optional[RequestData] = None,
+                         read_timeout=None, write_timeout=None, connect_timeout=None, pool_timeout=None
+                         ) -> Tuple[int, bytes]:
+        endpoint = url.rsplit('/', 1)[-1]
+        self.calls[endpoint] += 1
+        params = request_data.parameters if request_data else {}
+        if endpoint == 'getMe':
+            result = {'id': 1, 'is_bot': True, 'first_name': 'bench', 'username': 'bench_bot'}
+        elif endpoint in ('sendMessage', 'editMessageText', 'sendDocument'):
+            self._message_id += 1
+            result = {
+                'message_id': self._message_id,
+                'date': int(time.time()),
+                'chat': {'id': params.get('chat_id', 0), 'type': 'private'},
+                'text': params.get('text', ''),
+            }
+        else:
+            result = True
+        return 200, json.dumps({'ok': True, 'result': result}).encode()
+
+class Bench:
+    def __init__(self, application: Application, fake: FakeGspreadClient, request: FakeRequest):
+        self.application = application
+        self.fake = fake
+        self.request = request
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self._update_id = 0
+
+    def make_update(self, user_id: int, text: str) -> Update:
+        self._update_id += 1
+        return Update.de_json(update_data(self._update_id, user_id, text), self.application.bot)
+
+    async def send(self, label: str, user_id: int, text: str) -> None:
+        update = self.make_update(user_id, text)
+        start = time.perf_counter()
+        await self.application.process_update(update)
+        self.latencies[label].append(time.perf_counter() - start)
+
+    async def run_users(self, scripts: List[List[Tuple[str, str]]], concurrency: int, first_user: int) -> float:
+        """Menjalankan skrip per user secara bersamaan; langkah dalam satu user berurutan"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(user_id: int, script: List[Tuple[str, str]]) -> None:
+            async with semaphore:
+                for label, text in script:
+                    await self.send(label, user_id, text)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run(first_user + i, s) for i, s in enumerate(scripts)))
+        return time.perf_counter() - start
+
+CALLBACK_PREFIX = 'callback:'
+
+def update_data(update_id: int, user_id: int, text: str) -> dict:
+    """JSON update Telegram; teks berawalan CALLBACK_PREFIX menjadi penekanan tombol inline"""
+    user = {'id': user_id, 'is_bot': False, 'first_name': f'user{user_id}'}
+    chat = {'id': user_id, 'type': 'private'}
+    if text.startswith(CALLBACK_PREFIX):
+        return {
+            'update_id': update_id,
+            'callback_query': {
+                'id': str(update_id),
+                'from': user,
+                'chat_instance': str(user_id),
+                'data': text[len(CALLBACK_PREFIX):],
+                'message': {'message_id': update_id, 'date': int(time.time()), 'chat': chat, 'text': '📋'},
+            },
+        }
+    entities = []
+    if text.startswith('/'):
+        entities.append({'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])})
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': chat,
+            'from': user,
+            'text': text,
+            'entities': entities,
+        },
+    }
+
+def list_script() -> List[Tuple[str, str]]:
+    return [('/list', '/list'), ('/list <type> <page>', '/list Galxe 3'),
+            ('/list --network', '/list --network Ethereum 4'),
+            ('/list tombol berikutnya', f'{CALLBACK_PREFIX}list:2::'),
+            ('/search', '/search project 12'), ('/search --before', '/search galxe eth --before 2099-12-31')]
+
+def submit_script(i: int) -> List[Tuple[str, str]]:
+    steps = [
+        '/start', f'Bench {i}', f'https://twitter.com/bench{i}', f'https://discord.gg/bench{i}', 'https://t.me/b',
+        f'https://bench{i}.xyz', 'Galxe', '2099-12-31', '100 XYZ', 'Ethereum',
+    ]
+    return [('conversation step', text) for text in steps] + [('confirm', 'ya')]
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def make_repository(backend: str, client: AsyncSheetsClient, workdir: str) -> AirdropRepository:
+    if backend == 'sheets':
+        queue = WriteBehindQueue(client, journal_path=os.path.join(workdir, 'journal.jsonl'))
+        return SheetsRepository(client, AirdropIndex(client), queue)
+    return SQLiteRepository(os.path.join(workdir, 'bench.db'), client)
+
+async def drain(repository: AirdropRepository) -> None:
+    """Memaksa antrian tulis / mirror mengirim semua data tertunda"""
+    if isinstance(repository, SheetsRepository):
+        while repository.queue.pending:
+            await repository.queue.flush()
+    elif isinstance(repository, SQLiteRepository) and repository._mirror:
+        while await repository.unsynced_rows(1) or await repository.unsynced_statuses(1):
+            await repository._mirror.sync_once()
+
+async def bench_size(args: argparse.Namespace, size: int) -> None:
+    workdir = tempfile.mkdtemp(prefix='airdrop-bench-')
+    fake = FakeGspreadClient(make_rows(size), args.latency, args.quota, args.error_rate)
+    client = AsyncSheetsClient(GoogleSheetsClient(fake))
+    sheets._shared_client = client
+    storage._shared_repository = make_repository(args.backend, client, workdir)
+    state._shared_store = state.MemoryStateStore()
+    list_cache._shared_cache = list_cache.ListPageCache()
+    Config.RATE_LIMIT_ENABLED = False
+
+    request = FakeRequest()
+    application = build_application(
+        Application.builder().token('0:bench').request(request).get_updates_request(FakeRequest())
+    )
+    await application.initialize()
+    await application.start()
+    await application.post_init(application)
+    await drain(storage._shared_repository)
+    bench = Bench(application, fake, request)
+    print(f"\n=== {size} baris, backend={args.backend}, latency={args.latency}s ===")
+
+    for name, scripts in (
+        ('list', [list_script() for _ in range(args.users)]),
+        ('submit', [submit_script(i) for i in range(args.users)]),
+    ):
+        calls_before = sum(fake.calls.values())
+        bench.latencies.clear()
+        elapsed = await bench.run_users(scripts, args.concurrency, first_user=1000 if name == 'list' else 5000)
+        await drain(storage._shared_repository)
+        updates = sum(len(v) for v in bench.latencies.values())
+        commands = len(scripts) * (len(list_script()) if name == 'list' else 1)
+        api_calls = sum(fake.calls.values()) - calls_before
+        print(f"[{name}] {updates} update dalam {elapsed:.2f}s = {updates / elapsed:.1f} update/detik, "
+              f"{api_calls / commands:.2f} panggilan Sheets per perintah")
+        for label, values in bench.latencies.items():
+            print(f"  {label:<22} n={len(values):<5} p50={percentile(values, 50) * 1000:8.2f}ms "
+                  f"p99={percentile(values, 99) * 1000:8.2f}ms")
+
+    print(f"Cache /list: {dict(LIST_CACHE.values)}")
+    await bench_expiry(size, args)
+    await bench_gviz(size, args)
+    print(f"Panggilan Sheets per method: {dict(fake.calls)}; error: {dict(fake.errors)}")
+    await application.stop()
+    await application.shutdown()
+    await application.post_shutdown(application)
+
+async def bench_expiry(size: int, args: argparse.Namespace) -> None:
+    """Membandingkan scan penuh update_status dengan ExpiryScheduler"""
+    fake = FakeGspreadClient(make_rows(size), args.latency)
+    start = time.perf_counter()
+    GoogleSheetsClient(fake).update_status()
+    legacy = time.perf_counter() - start
+    legacy_calls = sum(fake.calls.values())
+
+    fake = FakeGspreadClient(make_rows(size), args.latency)
+    client = AsyncSheetsClient(GoogleSheetsClient(fake))
+    repository = make_repository(args.backend, client, tempfile.mkdtemp(prefix='airdrop-bench-'))
+    await repository.start()
+    await repository.warm_up()
+    scheduler = ExpiryScheduler(repository, _NullJobQueue())
+    scheduler.heap = await repository.pending_deadlines()
+    calls_before = sum(fake.calls.values())
+    start = time.perf_counter()
+    await scheduler.expire_due()
+    await drain(repository)
+    incremental = time.perf_counter() - start
+    print(f"[update_status] scan penuh {legacy * 1000:.1f}ms / {legacy_calls} panggilan; "
+          f"heap {incremental * 1000:.1f}ms / {sum(fake.calls.values()) - calls_before} panggilan")
+    await repository.stop()
+
+async def bench_gviz(size: int, args: argparse.Namespace) -> None:
+    """Query sisi server (jalur /list saat indeks dingin) untuk kolom Deadline bertipe teks dan tanggal"""
+    rows = make_rows(size)
+    _, records = parse_sheet(rows)
+    due = next(record.due for record in records if record.due)
+    cases = [(None, None, None), ('Galxe', None, None), ('Galxe', 'Ethereum', due)]
+    for label, date_columns in (('teks', ()), ('tanggal', ('Deadline',))):
+        fake = FakeGspreadClient(rows, args.latency, date_columns=date_columns)
+        client = AsyncSheetsClient(GoogleSheetsClient(fake))
+        index = AirdropIndex(client)  # pembanding
+        index.load(rows)
+        matched = 0
+        start = time.perf_counter()
+        for type_, network, deadline in cases:
+            _, total = await client.query_active(type_, network, deadline.isoformat() if deadline else None)
+            expected = await index.query(type_=type_, network=network, deadline=deadline)
+            matched += total == len(expected)
+        elapsed = time.perf_counter() - start
+        print(f"[gviz Deadline {label}] {elapsed / len(cases) * 1000:.1f}ms per query, "
+              f"total cocok dengan indeks {matched}/{len(cases)}, {fake.calls['gviz']} panggilan gviz")
+
+async def run_all(args: argparse.Namespace) -> None:
+    # Satu event loop untuk semua ukuran karena antrian Sheets dipakai bersama
+    for size in args.sizes:
+        await bench_size(args, size)
+
+class _NullJobQueue:
+    def run_once(self, callback, when, name=None):
+        return None
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--backend', choices=['sheets', 'sqlite'], default=Config.STORAGE_BACKEND)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0, help='latensi buatan per panggilan Sheets (detik)')
+    parser.add_argument('--quota', type=int, default=None, help='batas panggilan Sheets per menit')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='peluang error 503 per panggilan')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.disable(logging.INFO)
+    asyncio.run(run_all(args))
+
+if __name__ == '__main__':
+    main()
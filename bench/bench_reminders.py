@@ -0,0 +1,125 @@
+"""Benchmark fan-out pengingat Deadline ke banyak pelanggan, tanpa jaringan.
+
+Contoh:
+    python -m bench.bench_reminders --rows 100000 --chats 500 --latency 0.05
+
+Airdrop sintetis dimuat ke DeadlineIndex lalu ReminderScheduler.run_once mengantrekan
+pesan untuk pelanggan di MemoryStateStore. Pesan dikirim lewat Bot dengan FakeRequest,
+yang mencatat waktu setiap sendMessage sehingga batas global per detik dan jarak antar
+pesan per chat bisa diperiksa.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from telegram import Bot
+from telegram.request import RequestData
+from bench.bench_handlers import FakeRequest
+from bench.fake_sheets import NETWORKS, TYPES, make_rows
+from src.models import parse_sheet
+from src.reminders import NotificationQueue, ReminderScheduler, subscribe, topic
+from src.state import MemoryStateStore
+
+class RecordingRequest(FakeRequest):
+    """FakeRequest yang mencatat (waktu, chat_id) setiap sendMessage, dengan latensi buatan"""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+        self.sent: List[Tuple[float, int]] = []
+
+    async def do_request(self, url: str, method: str, request_data: Optional[RequestData] = None,
+                         read_timeout=None, write_timeout=None, connect_timeout=None, pool_timeout=None
+                         ) -> Tuple[int, bytes]:
+        if url.endswith('/sendMessage'):
+            self.sent.append((time.monotonic(), int(request_data.parameters['chat_id'])))
+            await asyncio.sleep(self.latency)
+        return await super().do_request(url, method, request_data)
+
+class _Repository:
+    def __init__(self, records):
+        self.records = records
+        self.add_listeners = []
+
+    async def list_active(self):
+        return self.records
+
+class _JobQueue:
+    def __init__(self, bot: Bot):
+        self.application = type('App', (), {'bot': bot})()
+
+    def run_daily(self, callback: Any, time: Any, name: Optional[str] = None) -> None:
+        return None
+
+def max_per_second(times: List[float]) -> int:
+    """Jumlah pesan terbanyak dalam jendela 1 detik mana pun"""
+    best, start = 0, 0
+    for end in range(len(times)):
+        while times[end] - times[start] >= 1.0:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+async def run(args: argparse.Namespace) -> None:
+    _, records = parse_sheet(make_rows(args.rows))
+    store = MemoryStateStore()
+    rng = random.Random(7)
+    topics = [topic('type', t) for t in TYPES] + [topic('network', n) for n in NETWORKS]
+    for chat_id in range(1, args.chats + 1):
+        for name in rng.sample(topics, args.topics):
+            await subscribe(store, chat_id, name)
+
+    request = RecordingRequest(args.latency)
+    bot = Bot('0:bench', request=request)
+    await bot.initialize()
+    job_queue = _JobQueue(bot)
+    queue = NotificationQueue(bot, rate=args.rate)
+    scheduler = ReminderScheduler(_Repository(records), job_queue, store, queue=queue)
+    today = date.today()
+
+    start = time.perf_counter()
+    scheduler.index.load(records, today)
+    load = time.perf_counter() - start
+    start = time.perf_counter()
+    window = scheduler.index.between(today, today.replace(year=today.year + 1))
+    lookup = time.perf_counter() - start
+    print(f"[indeks] {len(scheduler.index)} deadline dimuat dalam {load * 1000:.1f}ms; "
+          f"query rentang {len(window)} baris dalam {lookup * 1000:.2f}ms")
+
+    start = time.perf_counter()
+    chats = await scheduler.run_once(today)
+    queued = len(queue)
+    enqueue = time.perf_counter() - start
+    await queue.join()
+    elapsed = time.perf_counter() - start
+
+    times = sorted(t for t, _ in request.sent)
+    per_chat: Dict[int, List[float]] = defaultdict(list)
+    for t, chat_id in request.sent:
+        per_chat[chat_id].append(t)
+    gaps = [b - a for ts in per_chat.values() for a, b in zip(ts, ts[1:])]
+    print(f"[fan-out] {chats} chat, {queued} pesan diantrekan dalam {enqueue * 1000:.1f}ms; "
+          f"terkirim {len(request.sent)} dalam {elapsed:.1f}s")
+    print(f"  maks {max_per_second(times)} pesan/detik (batas {args.rate}); "
+          f"jarak minimum per chat {min(gaps):.2f}s" if gaps else
+          f"  maks {max_per_second(times)} pesan/detik (batas {args.rate})")
+    await bot.shutdown()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--chats', type=int, default=300)
+    parser.add_argument('--topics', type=int, default=2, help='topik per chat')
+    parser.add_argument('--rate', type=int, default=25, help='pesan per detik')
+    parser.add_argument('--latency', type=float, default=0.05, help='latensi buatan per sendMessage (detik)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Mengirim update sintetis lewat HTTP POST ke WebhookServer lokal.
+
+Contoh:
+    python -m bench.bench_webhook --rows 10000 --users 50 --concurrency 16
+
+Application dan Sheets sama seperti bench_handlers (FakeRequest + FakeGspreadClient),
+tetapi update masuk melalui server webhook sungguhan sehingga validasi secret token,
+batas concurrency, urutan per chat, dan drain saat shutdown ikut teruji.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from typing import List, Tuple
+from telegram.ext import Application
+from bench.bench_handlers import FakeRequest, drain, list_script, make_repository, submit_script, update_data
+from bench.fake_sheets import FakeGspreadClient, make_rows
+from src import list_cache, sheets, state, storage
+from src.bot import build_application
+from src.config import Config
+from src.sheets import AsyncSheetsClient, GoogleSheetsClient
+from src.webhook import WebhookServer
+
+SECRET = 'bench-secret'
+
+def make_payload(update_id: int, user_id: int, text: str) -> bytes:
+    return json.dumps(update_data(update_id, user_id, text)).encode()
+
+async def post(port: int, path: str, body: bytes, secret: str = SECRET) -> int:
+    """Satu request POST seperti yang dikirim server Telegram; mengembalikan status HTTP"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(
+        f'POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n'
+        f'X-Telegram-Bot-Api-Secret-Token: {secret}\r\nContent-Length: {len(body)}\r\n\r\n'.encode() + body
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1])
+
+async def run(args: argparse.Namespace) -> None:
+    fake = FakeGspreadClient(make_rows(args.rows), args.latency)
+    client = AsyncSheetsClient(GoogleSheetsClient(fake))
+    sheets._shared_client = client
+    storage._shared_repository = make_repository(args.backend, client, tempfile.mkdtemp(prefix='airdrop-bench-'))
+    state._shared_store = state.MemoryStateStore()
+    list_cache._shared_cache = list_cache.ListPageCache()
+    Config.RATE_LIMIT_ENABLED = False
+
+    request = FakeRequest()
+    application = build_application(
+        Application.builder().token('0:bench').request(request).get_updates_request(FakeRequest())
+    )
+    await application.initialize()
+    await application.start()
+    await application.post_init(application)
+    server = WebhookServer(application, host='127.0.0.1', port=0, path='/telegram',
+                           secret_token=SECRET, max_concurrency=args.concurrency)
+    await server.start()
+
+    rejected = await post(server.port, '/telegram', make_payload(1, 1, '/help'), secret='salah')
+    print(f"Secret salah -> HTTP {rejected}")
+
+    scripts: List[List[Tuple[str, str]]] = [
+        submit_script(i) if i % 2 else list_script() for i in range(args.users)
+    ]
+    counter = iter(range(10, 10 ** 9))
+
+    async def user(user_id: int, script: List[Tuple[str, str]]) -> None:
+        # Telegram mengirim update satu chat secara berurutan
+        for _, text in script:
+            assert await post(server.port, '/telegram', make_payload(next(counter), user_id, text)) == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(1000 + i, s) for i, s in enumerate(scripts)))
+    accepted = time.perf_counter() - start
+    await server.stop()
+    elapsed = time.perf_counter() - start
+    await drain(storage._shared_repository)
+
+    updates = sum(len(s) for s in scripts)
+    print(f"{updates} update diterima dalam {accepted:.2f}s, selesai diproses dalam {elapsed:.2f}s "
+          f"({updates / elapsed:.1f} update/detik)")
+    print(f"Panggilan Bot API: {dict(request.calls)}")
+    await application.stop()
+    await application.shutdown()
+    await application.post_shutdown(application)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--backend', choices=['sheets', 'sqlite'], default=Config.STORAGE_BACKEND)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=Config.WEBHOOK_MAX_CONCURRENCY)
+    parser.add_argument('--latency', type=float, default=0.0, help='latensi buatan per panggilan Sheets (detik)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+if __name__ == '__main__':
+    main()
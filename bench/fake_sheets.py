@@ -0,0 +1,221 @@
+"""Pengganti lokal gspread Client/Spreadsheet/Worksheet untuk benchmark.
+
+Mendukung latensi buatan, kuota per menit (APIError 429), dan error acak (503).
+Semua panggilan API dihitung per method di `FakeGspreadClient.calls`. Endpoint gviz
+(Query Visualization) ditiru untuk bentuk query yang dibuat `query_active`, termasuk
+kolom yang diketik Google sebagai tanggal (`date_columns`).
+"""
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+import gspread
+import requests
+from src.sheets import HEADERS
+
+TYPES = ['Galxe', 'Testnet', 'Layer3', 'Waitlist', 'Node']
+NETWORKS = ['Ethereum', 'Binance', 'Polygon', 'Arbitrum', 'Solana']
+
+def make_rows(n: int, seed: int = 42) -> List[List[str]]:
+    """Membuat n baris airdrop sintetis (termasuk header)"""
+    rng = random.Random(seed)
+    today = date.today()
+    rows = [list(HEADERS)]
+    for i in range(n):
+        deadline = today + timedelta(days=rng.randint(-30, 90)) if rng.random() < 0.8 else None
+        rows.append([
+            f'Project {i}',
+            f'https://twitter.com/project{i}',
+            f'https://discord.gg/project{i}',
+            f'https://t.me/project{i}',
+            f'https://project{i}.xyz/airdrop',
+            rng.choice(TYPES),
+            deadline.isoformat() if deadline else '',
+            f'{rng.randint(1, 1000)} XYZ',
+            str(rng.randint(1, 10_000)),
+            'Active',
+            rng.choice(NETWORKS),
+            '2025-01-01T00:00:00',
+        ])
+    return rows
+
+def _api_error(status: int, message: str) -> gspread.exceptions.APIError:
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps({'error': {'code': status, 'message': message, 'status': message}}).encode()
+    return gspread.exceptions.APIError(response)
+
+class FakeGspreadClient:
+    """Meniru bagian gspread.Client yang dipakai bot"""
+
+    def __init__(
+        self,
+        rows: List[List[str]],
+        latency: float = 0.0,
+        quota_per_minute: Optional[int] = None,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        date_columns: Tuple[str, ...] = ()
+    ):
+        self.latency = latency
+        self.date_columns = set(date_columns)
+        self.quota_per_minute = quota_per_minute
+        self.error_rate = error_rate
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._window: deque = deque()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.spreadsheet = FakeSpreadsheet(self, rows)
+
+    def api_call(self, method: str) -> None:
+        """Mencatat satu request API dan menerapkan latensi, kuota, serta error"""
+        with self._lock:
+            self.calls[method] += 1
+            now = time.monotonic()
+            while self._window and now - self._window[0] > 60:
+                self._window.popleft()
+            if self.quota_per_minute is not None and len(self._window) >= self.quota_per_minute:
+                self.errors['429'] += 1
+                raise _api_error(429, 'RESOURCE_EXHAUSTED')
+            self._window.append(now)
+            fail = self._rng.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            self.errors['503'] += 1
+            raise _api_error(503, 'UNAVAILABLE')
+
+    def open_by_key(self, key: str) -> 'FakeSpreadsheet':
+        self.api_call('open_by_key')
+        return self.spreadsheet
+
+    def request(self, method: str, url: str, params: Optional[dict] = None, **kwargs) -> requests.Response:
+        """Seperti gspread.Client.request; hanya endpoint gviz/tq yang didukung"""
+        self.api_call('gviz')
+        payload = FakeGviz(self.spreadsheet.main.rows, self.date_columns).run(params['tq'])
+        response = requests.Response()
+        response.status_code = 200
+        response._content = f'/*O_o*/\ngoogle.visualization.Query.setResponse({json.dumps(payload)});'.encode()
+        return response
+
+_CONDITION = re.compile(r"(?:(lower|toDate)\()?([A-Z]+)\)? = (date )?'([^']*)'")
+_QUERY = re.compile(r"(?:select (.+?))?\s*(?:where (.+?))?\s*(?:limit (\d+))?\s*(?:offset (\d+))?")
+
+class FakeGviz:
+    """Menjalankan subset Query Visualization (select, count, where ... and ..., limit, offset)"""
+
+    def __init__(self, rows: List[List[str]], date_columns: Set[str]):
+        self.headers = rows[0] if rows else []
+        self.rows = rows[1:]
+        letters = [gspread.utils.rowcol_to_a1(1, i + 1)[:-1] for i in range(len(self.headers))]
+        self.columns = {letter: i for i, letter in enumerate(letters)}
+        self.cols = [{'id': letter, 'label': header, 'type': 'date' if header in date_columns else 'string'}
+                     for letter, header in zip(letters, self.headers)]
+
+    def value(self, row: List[str], i: int) -> Optional[str]:
+        """Nilai sel seperti dibaca gviz: sel yang tidak sesuai tipe kolom menjadi null"""
+        text = row[i] if i < len(row) else ''
+        if self.cols[i]['type'] == 'date':
+            try:
+                day = date.fromisoformat(text)
+            except ValueError:
+                return None
+            return f'Date({day.year},{day.month - 1},{day.day})'
+        return text or None
+
+    def run(self, query: str) -> dict:
+        try:
+            select, where, limit, offset = _QUERY.fullmatch(query.strip()).groups()
+            rows = [row for row in self.rows if all(self.matches(row, c) for c in (where or '').split(' and ') if c)]
+            if select and select.startswith('count('):
+                i = self.columns[select[len('count('):-1]]
+                count = sum(1 for row in rows if self.value(row, i) is not None)
+                return self.table([{'id': 'A', 'label': '', 'type': 'number'}], [[float(count)]])
+            indexes = [self.columns[c.strip()] for c in select.split(',')] if select else list(range(len(self.cols)))
+            start = int(offset or 0)
+            rows = rows[start:start + int(limit)] if limit is not None else rows[start:]
+            return self.table([self.cols[i] for i in indexes], [[self.value(row, i) for i in indexes] for row in rows])
+        except (AttributeError, KeyError, ValueError) as e:
+            return {'status': 'error', 'errors': [{'reason': 'invalid_query', 'detailed_message': str(e)}]}
+
+    def matches(self, row: List[str], condition: str) -> bool:
+        function, letter, date_literal, literal = _CONDITION.fullmatch(condition.strip()).groups()
+        i = self.columns[letter]
+        is_date = self.cols[i]['type'] == 'date'
+        if is_date != bool(date_literal) or (function == 'toDate') != (self.cols[i]['type'] == 'datetime'):
+            # Seperti gviz: membandingkan tipe berbeda adalah error, bukan hasil kosong
+            raise ValueError(f"Can't compare column {letter} ({self.cols[i]['type']}) with {condition}")
+        value = self.value(row, i)
+        if value is None:
+            return False
+        if is_date:
+            day = date.fromisoformat(literal)
+            return value == f'Date({day.year},{day.month - 1},{day.day})'
+        return (value.lower() if function == 'lower' else value) == literal
+
+    @staticmethod
+    def table(cols: List[dict], rows: List[List[object]]) -> dict:
+        return {'status': 'ok', 'table': {'cols': cols, 'rows': [
+            {'c': [None if v is None else {'v': v} for v in row]} for row in rows
+        ]}}
+
+class FakeSpreadsheet:
+    def __init__(self, client: FakeGspreadClient, rows: List[List[str]]):
+        self.client = client
+        self.sheets: Dict[str, FakeWorksheet] = {}
+        self.main = FakeWorksheet(self, 'airdropbot', 0, rows)
+        self.sheets[self.main.title] = self.main
+
+    def worksheet(self, title: str) -> 'FakeWorksheet':
+        self.client.api_call('worksheet')
+        if title not in self.sheets:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self.sheets[title]
+
+    def add_worksheet(self, title: str, rows: int, cols: int) -> 'FakeWorksheet':
+        self.client.api_call('add_worksheet')
+        ws = FakeWorksheet(self, title, len(self.sheets), [])
+        self.sheets[title] = ws
+        return ws
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet: FakeSpreadsheet, title: str, sheet_id: int, rows: List[List[str]]):
+        self.spreadsheet = spreadsheet
+        self.client = spreadsheet.client
+        self.title = title
+        self.id = sheet_id
+        self.rows = rows
+
+    def get_all_values(self) -> List[List[str]]:
+        self.client.api_call('get_all_values')
+        return [list(r) for r in self.rows]
+
+    def append_row(self, values: List[str]) -> dict:
+        return self.append_rows([values], _method='append_row')
+
+    def append_rows(self, values: List[List[str]], _method: str = 'append_rows') -> dict:
+        self.client.api_call(_method)
+        first = len(self.rows) + 1
+        self.rows.extend(list(v) for v in values)
+        return {'updates': {'updatedRange': f'{self.title}!A{first}:L{len(self.rows)}'}}
+
+    def batch_update(self, data: List[dict]) -> None:
+        self.client.api_call('batch_update')
+        for item in data:
+            self._write_range(item['range'], item['values'])
+
+    def _write_range(self, a1: str, values: List[List[str]]) -> None:
+        match = re.fullmatch(r'([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?', a1)
+        col = gspread.utils.a1_to_rowcol(f'{match.group(1)}1')[1] - 1
+        start = int(match.group(2)) - 1
+        for offset, row_values in enumerate(values):
+            row = self.rows[start + offset]
+            for j, value in enumerate(row_values):
+                while len(row) <= col + j:
+                    row.append('')
+                row[col + j] = value
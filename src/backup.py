@@ -0,0 +1,227 @@
+"""Backup inkremental ke file lokal.
+
+Setiap snapshot hanya menyimpan baris yang berubah sejak snapshot sebelumnya, dalam
+chunk JSONL terkompresi gzip yang diberi nama sesuai hash isinya. Manifest per
+snapshot mencatat chunk mana saja yang dipakai. Isi tabel pada snapshot tertentu
+diperoleh dengan menerapkan semua snapshot sampai snapshot tersebut secara berurutan;
+baris yang hilang dicatat sebagai tombstone (isi baris null).
+
+Contoh:
+    python -m src.backup list
+    python -m src.backup restore backup_20250101_235900 --output restored.db
+    python -m src.backup compact
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+Change = Tuple[int, Optional[List[str]]]  # (key baris, isi baris sesuai HEADERS; None = baris dihapus)
+
+def row_hash(row: List[str]) -> str:
+    return hashlib.sha256(json.dumps(row, ensure_ascii=False).encode()).hexdigest()[:16]
+
+class IncrementalBackup:
+    """Penyimpanan snapshot inkremental: `<dir>/manifests/*.json` dan `<dir>/chunks/<hash>.jsonl.gz`"""
+
+    def __init__(
+        self,
+        directory: str = Config.BACKUP_DIR,
+        retention: int = Config.BACKUP_RETENTION,
+        chunk_rows: int = 5000
+    ):
+        self.directory = directory
+        self.retention = retention
+        self.chunk_rows = chunk_rows
+        self.manifest_dir = os.path.join(directory, 'manifests')
+        self.chunk_dir = os.path.join(directory, 'chunks')
+        self.hashes_path = os.path.join(directory, 'row_hashes.json.gz')
+
+    def snapshots(self) -> List[dict]:
+        """Semua manifest, dari yang terlama"""
+        if not os.path.isdir(self.manifest_dir):
+            return []
+        manifests = []
+        for filename in sorted(os.listdir(self.manifest_dir)):
+            if filename.endswith('.json'):
+                with open(os.path.join(self.manifest_dir, filename), encoding='utf-8') as f:
+                    manifests.append(json.load(f))
+        return manifests
+
+    def write_snapshot(self, changes: List[Change]) -> str:
+        """Menulis baris yang berubah sebagai snapshot baru lalu menjalankan compaction jika perlu"""
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        os.makedirs(self.chunk_dir, exist_ok=True)
+        name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        existing = {m['name'] for m in self.snapshots()}
+        suffix = 1
+        while name in existing:
+            suffix += 1
+            name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{suffix}"
+
+        chunks = [self._write_chunk(changes[i:i + self.chunk_rows]) for i in range(0, len(changes), self.chunk_rows)]
+        self._write_manifest({'name': name, 'created': datetime.now().isoformat(), 'rows': len(changes), 'chunks': chunks})
+        logger.info("Snapshot %s: %d baris berubah, %d chunk", name, len(changes), len(chunks))
+        # Compaction membaca seluruh isi tabel, jadi baru dijalankan setelah
+        # snapshot mencapai dua kali retensi (biayanya terbagi ke banyak backup)
+        if len(existing) + 1 >= 2 * self.retention:
+            self.compact()
+        return name
+
+    def snapshot_rows(self, rows: Iterable[Change]) -> str:
+        """Snapshot dari isi tabel lengkap; perubahan dicari lewat hash baris snapshot sebelumnya.
+
+        Dipakai jika penyimpanan tidak mencatat baris yang berubah (backend Sheets).
+        Yang ditulis ke disk tetap hanya baris yang berubah, ditambah tombstone untuk
+        key yang tidak ada lagi (baris dihapus, atau sheet memendek karena baris bergeser).
+        """
+        previous = self._load_hashes()
+        current: Dict[str, str] = {}
+        changes = []
+        for key, row in rows:
+            digest = current[str(key)] = row_hash(row)
+            if previous.get(str(key)) != digest:
+                changes.append((key, row))
+        changes.extend((int(key), None) for key in previous.keys() - current.keys())
+        name = self.write_snapshot(changes)
+        self._save_hashes(current)
+        return name
+
+    def materialize(self, name: Optional[str] = None) -> Dict[int, List[str]]:
+        """Isi tabel pada snapshot `name` (default: snapshot terbaru)"""
+        snapshots = self.snapshots()
+        if name is not None and name not in {m['name'] for m in snapshots}:
+            raise KeyError(f"Snapshot tidak ditemukan: {name}")
+        rows: Dict[int, List[str]] = {}
+        for manifest in snapshots:
+            for chunk in manifest['chunks']:
+                for key, row in self.read_chunk(chunk):
+                    if row is None:
+                        rows.pop(key, None)
+                    else:
+                        rows[key] = row
+            if manifest['name'] == name:
+                break
+        return rows
+
+    def compact(self) -> int:
+        """Menggabungkan snapshot di luar retensi ke snapshot tertua yang dipertahankan.
+
+        Snapshot sebelum `retention` snapshot terakhir tidak bisa dipulihkan lagi, dan
+        tombstone di dalamnya ikut dibuang. Mengembalikan jumlah chunk yang dihapus.
+        """
+        snapshots = self.snapshots()
+        if len(snapshots) <= self.retention:
+            return 0
+        base = snapshots[-self.retention]
+        rows = sorted(self.materialize(base['name']).items())
+        base['chunks'] = [self._write_chunk(rows[i:i + self.chunk_rows]) for i in range(0, len(rows), self.chunk_rows)]
+        base['rows'] = len(rows)
+        base['compacted'] = True
+        self._write_manifest(base)
+        for manifest in snapshots[:-self.retention]:
+            os.remove(self._manifest_path(manifest['name']))
+
+        referenced = {chunk for manifest in snapshots[-self.retention:] for chunk in manifest['chunks']}
+        removed = 0
+        for filename in os.listdir(self.chunk_dir):
+            if filename.split('.', 1)[0] not in referenced:
+                os.remove(os.path.join(self.chunk_dir, filename))
+                removed += 1
+        logger.info("Compaction: %d snapshot digabung ke %s, %d chunk dihapus",
+                    len(snapshots) - self.retention, base['name'], removed)
+        return removed
+
+    def restore_to_sqlite(self, name: Optional[str], path: str) -> int:
+        """Menulis isi snapshot ke database SQLite baru dengan skema SQLiteRepository"""
+        from src.models import Airdrop
+        from src.storage import SCHEMA, SQLiteRepository
+
+        if os.path.exists(path):
+            raise FileExistsError(f"File tujuan sudah ada: {path}")
+        rows = self.materialize(name)
+        conn = sqlite3.connect(path)
+        try:
+            conn.executescript(SCHEMA)
+            SQLiteRepository.migrate(conn)
+            with conn:
+                # Semua baris ditandai belum tersinkron agar mirror Sheets menulis ulang
+                conn.executemany(
+                    SQLiteRepository._INSERT_SQL,
+                    [SQLiteRepository._insert_params(Airdrop.from_row(row), None, False)
+                     for _, row in sorted(rows.items())]
+                )
+        finally:
+            conn.close()
+        return len(rows)
+
+    def read_chunk(self, chunk: str) -> Iterator[Change]:
+        with gzip.open(os.path.join(self.chunk_dir, f'{chunk}.jsonl.gz'), 'rt', encoding='utf-8') as f:
+            for line in f:
+                key, row = json.loads(line)
+                yield key, row
+
+    def _write_chunk(self, rows: List[Change]) -> str:
+        payload = ''.join(json.dumps([key, row], ensure_ascii=False) + '\n' for key, row in rows).encode()
+        chunk = hashlib.sha256(payload).hexdigest()[:32]
+        path = os.path.join(self.chunk_dir, f'{chunk}.jsonl.gz')
+        if not os.path.exists(path):  # isi sama = file sama
+            self._atomic_write(path, gzip.compress(payload))
+        return chunk
+
+    def _manifest_path(self, name: str) -> str:
+        return os.path.join(self.manifest_dir, f'{name}.json')
+
+    def _write_manifest(self, manifest: dict) -> None:
+        self._atomic_write(self._manifest_path(manifest['name']), json.dumps(manifest, indent=1).encode())
+
+    def _load_hashes(self) -> Dict[str, str]:
+        if not os.path.exists(self.hashes_path):
+            return {}
+        with gzip.open(self.hashes_path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_hashes(self, hashes: Dict[str, str]) -> None:
+        self._atomic_write(self.hashes_path, gzip.compress(json.dumps(hashes).encode()))
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default=Config.BACKUP_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='daftar snapshot')
+    restore = commands.add_parser('restore', help='memulihkan snapshot ke database SQLite baru')
+    restore.add_argument('name', nargs='?', help='nama snapshot (default: terbaru)')
+    restore.add_argument('--output', required=True, help='path database SQLite tujuan')
+    commands.add_parser('compact', help='menerapkan retensi BACKUP_RETENTION')
+    args = parser.parse_args()
+
+    engine = IncrementalBackup(args.dir)
+    if args.command == 'list':
+        for manifest in engine.snapshots():
+            print(f"{manifest['name']}  {manifest['rows']:>8} baris  {len(manifest['chunks'])} chunk"
+                  f"{'  (gabungan)' if manifest.get('compacted') else ''}")
+    elif args.command == 'restore':
+        count = engine.restore_to_sqlite(args.name, args.output)
+        print(f"{count} baris dipulihkan ke {args.output}; set SQLITE_PATH ke file ini untuk memakainya")
+    elif args.command == 'compact':
+        print(f"{engine.compact()} chunk dihapus")
+
+if __name__ == '__main__':
+    main()
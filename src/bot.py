@@ -1,12 +1,36 @@
+import time
+
+_started_at = time.perf_counter()  # awal pengukuran startup (metrik airdrop_startup_seconds)
+
+import asyncio
 import logging
+from typing import Optional
+from telegram import Update
 from telegram.ext import (
-    Application, CommandHandler, MessageHandler, filters, ConversationHandler, TypeHandler
+    Application, ApplicationBuilder, ApplicationHandlerStop, CallbackQueryHandler, CommandHandler, ContextTypes,
+    MessageHandler, filters, ConversationHandler, TypeHandler
 )
 from src.config import Config
-from src.handlers.conversation import *
-from src.handlers.commands import help_command, backup_command, list_command
-from src.sheets import GoogleSheetsClient
-import time
+from src.handlers.conversation import (
+    NAMA, TWITTER, DISCORD, TELEGRAM, LINK, TYPE, DEADLINE, REWARD, NETWORK, CONFIRM,
+    start, get_nama, get_twitter, get_discord, get_telegram, get_link, get_type, get_deadline, get_reward, get_network,
+    confirm, cancel
+)
+from src.handlers.commands import (
+    help_command, backup_command, export_command, import_command, list_command, list_page_callback, stats_command,
+    search_command, subscribe_command, unsubscribe_command
+)
+from src.metrics import STARTUP_SECONDS, MetricsServer, instrument_application
+from src.ratelimit import classify, get_rate_limiter
+from src.storage import get_repository
+from src.expiry import ExpiryScheduler
+from src.reminders import ReminderScheduler
+from src.search import get_search
+from src.state import StorePersistence, get_state_store, load_rate_limits, save_rate_limits, worker_partition
+from src.webhook import run_webhook
+from src.workers import run_workers
+from datetime import time as dt_time
+import math
 
 # Setup logging
 logging.basicConfig(
@@ -19,30 +43,107 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+STARTUP_SECONDS.set(time.perf_counter() - _started_at, phase='import')
+
+_metrics_server: Optional[MetricsServer] = None
+_warmup_task: Optional[asyncio.Task] = None
+_reminders: Optional[ReminderScheduler] = None
+
 async def limit_rate(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    user_id = update.effective_user.id
-    last_request = context.user_data.get('last_request', 0)
-    if time.time() - last_request < Config.RATE_LIMIT_SECONDS:
-        await update.message.reply_text(f"⏳ Tunggu {Config.RATE_LIMIT_SECONDS} detik")
-        raise Application.handler_stop
-    context.user_data['last_request'] = time.time()
+    if not Config.RATE_LIMIT_ENABLED or not update.effective_user:
+        return
+    message = update.effective_message
+    query = update.callback_query
+    if query:
+        # callback_data diawali nama perintahnya (mis. "list:2:type:galxe")
+        text = f"/{(query.data or '').split(':', 1)[0]}"
+    else:
+        text = (message.text or message.caption) if message else None
+    wait = get_rate_limiter().acquire(update.effective_user.id, classify(text))
+    if wait:
+        if query:
+            await query.answer(f"⏳ Tunggu {math.ceil(wait)} detik")
+        elif message:
+            await message.reply_text(f"⏳ Tunggu {math.ceil(wait)} detik")
+        raise ApplicationHandlerStop
 
-def main() -> None:
-    Config.validate()
-    application = Application.builder().token(Config.BOT_TOKEN).build()
-    sheets_client = GoogleSheetsClient()
-
-    # Job harian untuk backup dan update status
-    application.job_queue.run_daily(
-        lambda ctx: sheets_client.backup(),
-        time=time(hour=23, minute=59),
-        days=tuple(range(7))
-    )
-    application.job_queue.run_daily(
-        lambda ctx: sheets_client.update_status(),
-        time=time(hour=0, minute=0),
-        days=tuple(range(7))
-    )
+async def warm_up(application: Application) -> None:
+    """Autentikasi Sheets, cache worksheet/indeks, indeks pencarian, dan penjadwal, tanpa menahan startup.
+
+    Jika Google tidak bisa dihubungi, dicoba ulang dengan jeda yang terus bertambah;
+    handler tetap berjalan dan memakai Sheets secara lazy.
+    """
+    global _reminders
+    repository = get_repository()
+    # Indeks /search dibangun di setiap worker; penjadwal hanya di worker 0
+    schedulers = [get_search()]
+    if Config.WORKER_INDEX == 0:
+        # Status Ended ditulis tepat saat Deadline tiba, bukan lewat scan harian
+        schedulers.append(ExpiryScheduler(repository, application.job_queue))
+        _reminders = ReminderScheduler(repository, application.job_queue, get_state_store(), shared=Config.WORKERS > 1)
+        schedulers.append(_reminders)
+    started = time.perf_counter()
+    delay = 1.0
+    while True:
+        try:
+            await repository.warm_up()
+            for scheduler in schedulers:
+                await scheduler.start()
+            break
+        except Exception as e:
+            logger.warning("Warmup gagal, dicoba lagi dalam %.0f detik: %s", delay, e)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, Config.WARMUP_MAX_BACKOFF)
+    elapsed = time.perf_counter() - started
+    STARTUP_SECONDS.set(elapsed, phase='warmup')
+    logger.info("Warmup selesai dalam %.0f ms", elapsed * 1000)
+
+async def on_startup(application: Application) -> None:
+    global _metrics_server, _warmup_task
+    await get_repository().start()
+    await load_rate_limits(get_rate_limiter(), get_state_store(), worker_partition())
+    if Config.METRICS_PORT:
+        _metrics_server = MetricsServer(Config.METRICS_HOST, Config.METRICS_PORT)
+        await _metrics_server.start()
+    _warmup_task = asyncio.create_task(warm_up(application))
+    ready = time.perf_counter() - _started_at
+    STARTUP_SECONDS.set(ready, phase='ready')
+    logger.info("Bot siap dalam %.0f ms", ready * 1000)
+
+async def on_shutdown(application: Application) -> None:
+    if _warmup_task and not _warmup_task.done():
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+    if _reminders:
+        await _reminders.stop()
+    if _metrics_server:
+        await _metrics_server.stop()
+    await get_repository().stop()
+    store = get_state_store()
+    await save_rate_limits(get_rate_limiter(), store)
+    await store.aclose()
+
+def build_application(builder: Optional[ApplicationBuilder] = None) -> Application:
+    """Membangun Application beserta semua handler dan job"""
+    builder = builder or Application.builder().token(Config.BOT_TOKEN)
+    # State percakapan dan user_data disimpan agar tidak hilang saat restart
+    persistence = StorePersistence(get_state_store(), worker_partition())
+    application = builder.persistence(persistence).post_init(on_startup).post_shutdown(on_shutdown).build()
+    repository = get_repository()
+
+    async def backup_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+        await repository.backup()
+
+    # Job harian untuk backup (sekali saja, di worker 0)
+    if Config.WORKER_INDEX == 0:
+        application.job_queue.run_daily(
+            backup_job,
+            time=dt_time(hour=23, minute=59),
+            days=tuple(range(7))
+        )
 
     # Conversation handler
     conv_handler = ConversationHandler(
@@ -60,17 +161,40 @@ def main() -> None:
             CONFIRM: [MessageHandler(filters.TEXT & ~filters.COMMAND, confirm)],
         },
         fallbacks=[CommandHandler('cancel', cancel)],
-        conversation_timeout=Config.CONVERSATION_TIMEOUT
+        conversation_timeout=Config.CONVERSATION_TIMEOUT,
+        name='airdrop_submission',
+        persistent=True
     )
 
     application.add_handler(conv_handler)
     application.add_handler(CommandHandler('help', help_command))
     application.add_handler(CommandHandler('backup', backup_command))
     application.add_handler(CommandHandler('list', list_command))
+    application.add_handler(CallbackQueryHandler(list_page_callback, pattern=r'^list:'))
+    application.add_handler(CommandHandler('stats', stats_command))
+    application.add_handler(CommandHandler('search', search_command))
+    application.add_handler(CommandHandler('subscribe', subscribe_command))
+    application.add_handler(CommandHandler('unsubscribe', unsubscribe_command))
+    application.add_handler(CommandHandler('import', import_command))
+    application.add_handler(MessageHandler(filters.Document.ALL & filters.CaptionRegex(r'^/import\b'), import_command))
+    application.add_handler(CommandHandler('export', export_command))
     application.add_handler(TypeHandler(Update, limit_rate), group=-1)
+    instrument_application(application)
+    return application
 
-    logger.info("Bot dimulai")
-    application.run_polling()
+def main() -> None:
+    Config.validate()
+    if Config.WORKERS > 1:
+        logger.info("Bot dimulai (webhook, %d worker)", Config.WORKERS)
+        asyncio.run(run_workers(Config.WORKERS))
+        return
+    application = build_application()
+    if Config.WEBHOOK_URL:
+        logger.info("Bot dimulai (webhook)")
+        asyncio.run(run_webhook(application))
+    else:
+        logger.info("Bot dimulai (polling)")
+        application.run_polling()
 
 if __name__ == '__main__':
     main()
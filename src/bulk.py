@@ -0,0 +1,204 @@
+"""Import dan export airdrop secara massal (CSV atau JSONL).
+
+Contoh:
+    python -m src.bulk import campaigns.csv --user-id 12345
+    python -m src.bulk export --format jsonl --output airdrops.jsonl
+
+Kolom mengikuti HEADERS (huruf besar/kecil bebas). Validasi sama dengan percakapan
+/start: URL lewat `is_valid_url`, Deadline lewat `parse_deadline`. Baris yang Link,
+Twitter, atau Discord-nya (setelah `normalize_url`) sudah tersimpan atau muncul lebih
+awal di file dilewati.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import logging
+import sys
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+from src.config import Config
+from src.models import HEADERS, Airdrop
+from src.storage import DEDUP_FIELDS, AirdropRepository, get_repository, url_keys
+from src.utils import is_valid_url, parse_deadline
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('csv', 'jsonl')
+URL_FIELDS = ('Twitter', 'Discord', 'Telegram', 'Link')
+MAX_REPORTED_ERRORS = 20
+
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors: List[str] = []  # hanya MAX_REPORTED_ERRORS pertama
+
+    def reject(self, line_no: int, reason: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"baris {line_no}: {reason}")
+
+    def summary(self) -> str:
+        lines = [f"Diimpor: {self.imported}", f"Duplikat dilewati: {self.duplicates}", f"Tidak valid: {self.invalid}"]
+        lines.extend(f"- {error}" for error in self.errors)
+        if self.invalid > len(self.errors):
+            lines.append(f"- ... dan {self.invalid - len(self.errors)} lainnya")
+        return '\n'.join(lines)
+
+def detect_format(filename: str) -> str:
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+def read_records(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Membaca record satu per satu beserta nomor barisnya"""
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, {str(k).strip().lower(): (v or '') for k, v in record.items() if k is not None}
+    else:
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            if not isinstance(record, dict):
+                yield line_no, {}
+                continue
+            yield line_no, {str(k).strip().lower(): '' if v is None else str(v) for k, v in record.items()}
+
+def validate_record(record: Dict[str, str], user_id: str) -> Airdrop:
+    """Mengubah record menjadi Airdrop tanpa Timestamp; ValueError jika tidak valid"""
+    values = {name: record.get(name.lower(), '').strip() for name in HEADERS}
+    if not values['Nama']:
+        raise ValueError("Nama kosong")
+    for name in URL_FIELDS:
+        if not is_valid_url(values[name]):
+            raise ValueError(f"URL {name} tidak valid")
+    if not values['Type']:
+        raise ValueError("Type kosong")
+    try:
+        deadline = parse_deadline(values['Deadline'])
+    except ValueError:
+        raise ValueError("Deadline harus YYYY-MM-DD")
+    return Airdrop(
+        nama=values['Nama'],
+        twitter=values['Twitter'],
+        discord=values['Discord'],
+        telegram=values['Telegram'],
+        link=values['Link'],
+        type=values['Type'],
+        deadline=deadline.isoformat() if deadline else '',
+        reward=values['Reward'].lower(),
+        user_id=values['User ID'] or user_id,
+        status='Active',
+        network=values['Network'].capitalize()
+    )  # Timestamp diisi saat disimpan
+
+async def import_records(
+    repository: AirdropRepository,
+    records: Iterable[Tuple[int, Dict[str, str]]],
+    user_id: str,
+    batch_size: int = Config.IMPORT_BATCH_SIZE
+) -> ImportReport:
+    """Validasi, dedupe, lalu simpan per batch; hanya satu batch yang ditahan di memori"""
+    report = ImportReport()
+    seen: Dict[str, Set[str]] = {field: set() for field in DEDUP_FIELDS}
+    batch: List[Tuple[Airdrop, Dict[str, Optional[str]]]] = []
+
+    async def flush() -> None:
+        existing = {
+            field: await repository.find_existing(field, [keys[field] for _, keys in batch if keys[field]])
+            for field in DEDUP_FIELDS
+        }
+        fresh = [row for row, keys in batch if not any(keys[f] in existing[f] for f in DEDUP_FIELDS if keys[f])]
+        # Baris yang sempat disimpan proses lain di antara cek dan simpan ikut dihitung duplikat
+        stored = await repository.add_many(fresh) if fresh else []
+        report.imported += len(stored)
+        report.duplicates += len(batch) - len(stored)
+        batch.clear()
+
+    for line_no, record in records:
+        try:
+            row = validate_record(record, user_id)
+        except ValueError as e:
+            report.reject(line_no, str(e))
+            continue
+        keys = url_keys(row)
+        if any(keys[f] in seen[f] for f in DEDUP_FIELDS if keys[f]):
+            report.duplicates += 1
+            continue
+        for field, key in keys.items():
+            if key:
+                seen[field].add(key)
+        batch.append((row, keys))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    logger.info("Import selesai: %d diimpor, %d duplikat, %d tidak valid",
+                report.imported, report.duplicates, report.invalid)
+    return report
+
+async def export_lines(repository: AirdropRepository, fmt: str) -> AsyncIterator[str]:
+    """Menghasilkan isi file export baris demi baris"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == 'csv':
+        writer.writerow(HEADERS)
+        yield buffer.getvalue()
+    async for records in repository.iter_rows():
+        rows = [record.to_row() for record in records]
+        if fmt == 'csv':
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(rows)
+            yield buffer.getvalue()
+        else:
+            yield ''.join(json.dumps(dict(zip(HEADERS, row)), ensure_ascii=False) + '\n' for row in rows)
+
+async def export_to(repository: AirdropRepository, fmt: str, out: TextIO) -> None:
+    async for chunk in export_lines(repository, fmt):
+        out.write(chunk)
+
+async def _run_cli(args: argparse.Namespace) -> None:
+    # Mirror Sheets dibiarkan ke proses bot agar baris tidak dikirim dua kali
+    Config.SHEETS_MIRROR = False
+    # Journal sendiri: journal bot ditulis ulang oleh proses bot dan tidak boleh ikut dikirim dari sini
+    Config.WRITE_JOURNAL_PATH = f'{Config.WRITE_JOURNAL_PATH}.cli'
+    repository = get_repository()
+    await repository.start()
+    try:
+        if args.command == 'import':
+            fmt = args.format or detect_format(args.file)
+            with open(args.file, encoding='utf-8-sig', newline='') as f:
+                report = await import_records(repository, read_records(f, fmt), args.user_id)
+            print(report.summary())
+        else:
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                    await export_to(repository, args.format or detect_format(args.output), f)
+            else:
+                await export_to(repository, args.format or 'csv', sys.stdout)
+    finally:
+        await repository.stop()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    importer = commands.add_parser('import', help='mengimpor file CSV/JSONL')
+    importer.add_argument('file')
+    importer.add_argument('--format', choices=FORMATS)
+    importer.add_argument('--user-id', default='', help='User ID untuk record yang tidak mengisinya')
+    exporter = commands.add_parser('export', help='mengekspor semua airdrop')
+    exporter.add_argument('--format', choices=FORMATS)
+    exporter.add_argument('--output', help='file tujuan (default: stdout)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_run_cli(args))
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 load_dotenv()
 
@@ -9,8 +9,66 @@ class Config:
     SPREADSHEET_ID: str = os.getenv('SPREADSHEET_ID') or ''
     SHEET_NAME: str = 'airdropbot'
     CREDENTIALS_PATH: str = os.getenv('CREDENTIALS_PATH', 'credentials.json')
-    RATE_LIMIT_SECONDS: int = 5
+    RATE_LIMIT_ENABLED: bool = os.getenv('RATE_LIMIT_ENABLED', '1') == '1'
+    # Kelas perintah -> (kapasitas burst, token per detik)
+    RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+        'conversation': (20, 2.0),
+        'read': (5, 0.2),
+        'write': (3, 0.05),
+        'admin': (2, 0.02),
+    }
+    SHEETS_QUOTA_PER_MINUTE: int = int(os.getenv('SHEETS_QUOTA_PER_MINUTE', '60'))
     CONVERSATION_TIMEOUT: int = 600  # 10 menit
+    SHEETS_MAX_CONCURRENCY: int = int(os.getenv('SHEETS_MAX_CONCURRENCY', '4'))
+    SHEETS_TIMEOUT: float = float(os.getenv('SHEETS_TIMEOUT', '30'))  # detik per panggilan
+    # Kuota Google Sheets API per menit (default kuota per user), dibagi rata antar worker
+    SHEETS_READ_QUOTA_PER_MINUTE: int = int(os.getenv('SHEETS_READ_QUOTA_PER_MINUTE', '60'))
+    SHEETS_WRITE_QUOTA_PER_MINUTE: int = int(os.getenv('SHEETS_WRITE_QUOTA_PER_MINUTE', '60'))
+    SHEETS_RETRIES: int = int(os.getenv('SHEETS_RETRIES', '3'))  # percobaan ulang panggilan idempoten
+    SHEETS_RETRY_BASE_DELAY: float = 0.5  # detik, dikali 2 tiap percobaan lalu diacak (full jitter)
+    SHEETS_RETRY_MAX_DELAY: float = 20.0
+    SHEETS_BREAKER_THRESHOLD: int = int(os.getenv('SHEETS_BREAKER_THRESHOLD', '5'))  # error berturut-turut
+    SHEETS_BREAKER_COOLDOWN: float = float(os.getenv('SHEETS_BREAKER_COOLDOWN', '30'))  # detik
+    TOKEN_REFRESH_SECONDS: int = 3000  # token Google berlaku 60 menit
+    INDEX_TTL_SECONDS: int = int(os.getenv('INDEX_TTL_SECONDS', '300'))  # 5 menit
+    LIST_CACHE_SIZE: int = int(os.getenv('LIST_CACHE_SIZE', '256'))  # halaman /list yang di-cache
+    WRITE_JOURNAL_PATH: str = os.getenv('WRITE_JOURNAL_PATH', 'write_journal.jsonl')
+    WRITE_FLUSH_MS: int = int(os.getenv('WRITE_FLUSH_MS', '1000'))
+    WRITE_BATCH_SIZE: int = int(os.getenv('WRITE_BATCH_SIZE', '50'))
+    WRITE_MAX_BATCH_ROWS: int = int(os.getenv('WRITE_MAX_BATCH_ROWS', '1000'))  # baris per append_rows
+    IMPORT_BATCH_SIZE: int = int(os.getenv('IMPORT_BATCH_SIZE', '500'))
+    WRITE_MAX_BACKOFF: int = 60  # detik
+    WARMUP_MAX_BACKOFF: int = 300  # detik
+    STORAGE_BACKEND: str = os.getenv('STORAGE_BACKEND', 'sqlite')  # 'sqlite' atau 'sheets'
+    SQLITE_PATH: str = os.getenv('SQLITE_PATH', 'airdrops.db')
+    SHEETS_MIRROR: bool = os.getenv('SHEETS_MIRROR', '1') == '1'
+    MIRROR_INTERVAL_SECONDS: float = float(os.getenv('MIRROR_INTERVAL_SECONDS', '5'))
+    # Zona IANA (mis. Asia/Jakarta) untuk tanggal Deadline: status Ended, /search, dan pengingat; kosong = zona server
+    TIMEZONE: str = os.getenv('TIMEZONE', '')
+    REMINDER_TIME: str = os.getenv('REMINDER_TIME', '09:00')  # jam pengingat harian (HH:MM, waktu TIMEZONE)
+    # Pengingat dikirim saat Deadline tinggal sekian hari (1 = berakhir malam ini)
+    REMINDER_DAYS: List[int] = [int(d) for d in os.getenv('REMINDER_DAYS', '3,1').split(',') if d.strip()]
+    MAX_SUBSCRIPTIONS: int = 10  # topik /subscribe per chat
+    NOTIFY_RATE_PER_SECOND: int = int(os.getenv('NOTIFY_RATE_PER_SECOND', '25'))  # Telegram: ~30 pesan/detik
+    NOTIFY_CHAT_INTERVAL: float = 1.0  # detik antar pesan ke chat yang sama
+    BACKUP_DIR: str = os.getenv('BACKUP_DIR', 'backups')
+    BACKUP_RETENTION: int = int(os.getenv('BACKUP_RETENTION', '30'))  # jumlah snapshot
+    METRICS_HOST: str = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT: int = int(os.getenv('METRICS_PORT', '0'))  # 0 = nonaktif
+    ADMIN_IDS: List[int] = [int(i) for i in os.getenv('ADMIN_IDS', '').split(',') if i.strip()]
+    WEBHOOK_URL: str = os.getenv('WEBHOOK_URL') or ''  # kosong = mode polling
+    WEBHOOK_HOST: str = os.getenv('WEBHOOK_HOST', '0.0.0.0')
+    WEBHOOK_PORT: int = int(os.getenv('WEBHOOK_PORT', '8443'))
+    WEBHOOK_PATH: str = os.getenv('WEBHOOK_PATH', '/telegram')
+    WEBHOOK_SECRET: str = os.getenv('WEBHOOK_SECRET') or ''
+    WEBHOOK_MAX_CONCURRENCY: int = int(os.getenv('WEBHOOK_MAX_CONCURRENCY', '32'))
+    STATE_BACKEND: str = os.getenv('STATE_BACKEND', 'sqlite')  # 'sqlite', 'redis' atau 'memory'
+    STATE_PATH: str = os.getenv('STATE_PATH', 'state.db')
+    REDIS_URL: str = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    PERSISTENCE_INTERVAL: float = float(os.getenv('PERSISTENCE_INTERVAL', '5'))  # detik
+    WORKERS: int = int(os.getenv('WORKERS', '1'))  # >1 hanya untuk mode webhook
+    WORKER_INDEX: int = 0  # diisi oleh proses worker
+    WORKER_PORT_BASE: int = int(os.getenv('WORKER_PORT_BASE', '8700'))
 
     @classmethod
     def validate(cls) -> None:
@@ -20,5 +78,11 @@ class Config:
             missing.append('BOT_TOKEN')
         if not cls.SPREADSHEET_ID:
             missing.append('SPREADSHEET_ID')
+        if cls.WEBHOOK_URL and not cls.WEBHOOK_SECRET:
+            missing.append('WEBHOOK_SECRET')
+        if cls.WORKERS > 1 and not cls.WEBHOOK_URL:
+            raise ValueError("WORKERS > 1 membutuhkan mode webhook (WEBHOOK_URL)")
+        if cls.WORKERS > 1 and cls.STATE_BACKEND == 'memory':
+            raise ValueError("WORKERS > 1 membutuhkan STATE_BACKEND sqlite atau redis")
         if missing:
             raise ValueError(f"Variabel lingkungan berikut hilang: {', '.join(missing)}")
@@ -0,0 +1,92 @@
+import heapq
+import logging
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, List, Optional, Tuple
+from telegram.ext import ContextTypes, Job, JobQueue
+from src.models import Airdrop
+from src.storage import AirdropRepository
+from src.utils import local_timezone, today
+
+logger = logging.getLogger(__name__)
+
+class ExpiryScheduler:
+    """Menandai airdrop Ended tepat saat Deadline tiba, berdasarkan heap (deadline, key).
+
+    Deadline berlaku sejak pukul 00:00 pada tanggal tersebut, sama seperti
+    pengecekan `strptime(deadline) < now` sebelumnya.
+
+    Heap dimuat ulang di setiap wakeup dan scheduler bangun paling lambat tiap
+    tengah malam, karena baris dari worker lain, CLI `src.bulk`, atau yang diisi
+    langsung di sheet tidak lewat add listener proses ini.
+    """
+
+    def __init__(self, repository: AirdropRepository, job_queue: JobQueue):
+        self.repository = repository
+        self.job_queue = job_queue
+        self.heap: List[Tuple[date, Any]] = []
+        self._job: Optional[Job] = None
+        self._next_due: Optional[date] = None
+        repository.add_listeners.append(self._on_added)
+
+    async def start(self) -> None:
+        """Memuat deadline yang belum lewat lalu memproses yang sudah jatuh tempo"""
+        self.heap = await self.repository.pending_deadlines()
+        heapq.heapify(self.heap)
+        logger.info("Penjadwal kedaluwarsa: %d deadline dipantau", len(self.heap))
+        await self.expire_due()
+
+    def stop(self) -> None:
+        if self._job:
+            self._job.schedule_removal()
+            self._job = None
+
+    def _on_added(self, key: Any, record: Airdrop) -> None:
+        if record.status == 'Ended' or record.due is None:
+            return
+        heapq.heappush(self.heap, (record.due, key))
+        if self._next_due is None or record.due < self._next_due:
+            self._schedule_next()
+
+    def pop_due(self, today: date) -> List[Any]:
+        """Mengeluarkan semua key dengan deadline <= today"""
+        due = []
+        while self.heap and self.heap[0][0] <= today:
+            due.append(heapq.heappop(self.heap)[1])
+        return due
+
+    async def expire_due(self) -> None:
+        due = self.pop_due(today())
+        if due:
+            try:
+                updated = await self.repository.expire(due)
+                logger.info("Status diperbarui untuk %d baris", updated)
+            except Exception as e:
+                logger.error("Gagal memperbarui status: %s", e, exc_info=True)
+                # Kembalikan ke heap agar dicoba lagi pada wakeup berikutnya
+                retry_on = today()
+                for key in due:
+                    heapq.heappush(self.heap, (retry_on, key))
+                self._schedule_in(60)
+                return
+        self._schedule_next()
+
+    async def _run(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        self._job = None
+        self._next_due = None
+        self.heap = await self.repository.pending_deadlines()
+        heapq.heapify(self.heap)
+        await self.expire_due()
+
+    def _schedule_next(self) -> None:
+        tz = local_timezone()
+        now = datetime.now(tz)
+        tomorrow = now.date() + timedelta(days=1)
+        next_due = min(self.heap[0][0], tomorrow) if self.heap else tomorrow
+        # Tengah malam di zona TIMEZONE, sama dengan tanggal yang dipakai pengingat
+        wake_at = datetime.combine(next_due, dt_time.min, tzinfo=tz)
+        self._next_due = next_due
+        self._schedule_in(max(1.0, (wake_at - now).total_seconds() + 1))
+
+    def _schedule_in(self, seconds: float) -> None:
+        self.stop()
+        self._job = self.job_queue.run_once(self._run, when=seconds, name='expiry')
@@ -1,7 +1,20 @@
-from telegram import Update
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
-from src.sheets import GoogleSheetsClient
+from src.bulk import FORMATS, detect_format, export_to, import_records, read_records
+from src.config import Config
+from src.list_cache import ListPage, get_list_cache
+from src.metrics import HANDLER_LATENCY, LIST_CACHE, ROWS_SCANNED, SHEETS_CALLS, SHEETS_ERRORS
+from src.models import parse_date
+from src.reminders import get_subscriptions, subscribe, topic, unsubscribe
+from src.search import SearchQuery, get_search, tokenize
+from src.sheets import get_sheets_client
+from src.state import get_state_store
+from src.storage import get_repository
+from typing import Optional, Tuple
 import logging
+import os
+import tempfile
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -16,6 +29,9 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 /list <type> [page] - Filter berdasarkan tipe (contoh: /list Galxe 1)
 /list --deadline <date> [page] - Filter berdasarkan deadline (contoh: /list --deadline 2025-12-31 1)
 /list --network <network> [page] - Filter berdasarkan network (contoh: /list --network Ethereum 1)
+/search <kata kunci> [--after <date>] [--before <date>] - Cari berdasarkan nama, reward, network, atau tipe
+/subscribe <type> atau /subscribe --network <network> - Pengingat sebelum Deadline
+/unsubscribe <type>|--network <network>|all - Hentikan pengingat
 🔍 Format:
 - URL harus valid (https://example.com)
 - Tipe: Galxe, Testnet, Layer3, Waitlist, Node (case insensitive)
@@ -26,151 +42,372 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     await update.message.reply_text(help_text)
 
 async def backup_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    sheets_client = GoogleSheetsClient()
-    backup_name = sheets_client.backup()
+    backup_name = await get_repository().backup()
     if backup_name:
         await update.message.reply_text(f"✅ Backup berhasil: {backup_name}")
     else:
         await update.message.reply_text("❌ Gagal membuat backup")
 
+async def import_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Import massal dari dokumen CSV/JSONL yang dikirim dengan caption /import"""
+    if update.effective_user.id not in Config.ADMIN_IDS:
+        await update.message.reply_text("❌ Perintah ini hanya untuk admin")
+        return
+    document = update.message.document
+    if not document:
+        await update.message.reply_text("📎 Kirim file CSV atau JSONL dengan caption /import")
+        return
+
+    fmt = detect_format(document.file_name or '')
+    fd, path = tempfile.mkstemp(suffix=f'.{fmt}')
+    os.close(fd)
+    try:
+        await (await document.get_file()).download_to_drive(path)
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            report = await import_records(get_repository(), read_records(f, fmt), str(update.effective_user.id))
+        await update.message.reply_text(f"📥 Import selesai\n{report.summary()}")
+    except Exception as e:
+        logger.error("Gagal mengimpor file: %s", e, exc_info=True)
+        await update.message.reply_text("🔧 Gagal mengimpor file, coba lagi nanti")
+    finally:
+        os.remove(path)
+
+async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Export semua airdrop sebagai dokumen (/export [csv|jsonl])"""
+    if update.effective_user.id not in Config.ADMIN_IDS:
+        await update.message.reply_text("❌ Perintah ini hanya untuk admin")
+        return
+    fmt = context.args[0].lower() if context.args else 'csv'
+    if fmt not in FORMATS:
+        await update.message.reply_text(f"❌ Format harus salah satu dari: {', '.join(FORMATS)}")
+        return
+
+    fd, path = tempfile.mkstemp(suffix=f'.{fmt}')
+    try:
+        # Ditulis bertahap ke file sementara, bukan dikumpulkan di memori
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            await export_to(get_repository(), fmt, f)
+        with open(path, 'rb') as f:
+            await update.message.reply_document(f, filename=f"airdrops_{datetime.now().strftime('%Y%m%d')}.{fmt}")
+    except Exception as e:
+        logger.error("Gagal mengekspor data: %s", e, exc_info=True)
+        await update.message.reply_text("🔧 Gagal mengekspor data, coba lagi nanti")
+    finally:
+        os.remove(path)
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Ringkasan metrik untuk admin"""
+    if update.effective_user.id not in Config.ADMIN_IDS:
+        await update.message.reply_text("❌ Perintah ini hanya untuk admin")
+        return
+
+    lines = ["📊 Statistik bot", "", "Handler (jumlah, p50, p99):"]
+    for key, (_, _, count) in sorted(HANDLER_LATENCY.values.items()):
+        labels = dict(key)
+        p50 = HANDLER_LATENCY.quantile(0.5, **labels) * 1000
+        p99 = HANDLER_LATENCY.quantile(0.99, **labels) * 1000
+        lines.append(f"- {labels['handler']}: {count}x, ≤{p50:g}ms, ≤{p99:g}ms")
+    lines.append("")
+    lines.append("Panggilan Sheets:")
+    for key, value in sorted(SHEETS_CALLS.values.items()):
+        lines.append(f"- {dict(key)['method']}: {value:g}")
+    for key, value in sorted(SHEETS_ERRORS.values.items()):
+        labels = dict(key)
+        lines.append(f"- error {labels['method']} ({labels['status']}): {value:g}")
+    sheets = get_sheets_client()
+    quota = sheets.scheduler.quota
+    lines.append(f"- kuota tersisa: {quota.remaining('read')} baca, {quota.remaining('write')} tulis; "
+                 f"{sheets.scheduler.pending()} antre")
+    if sheets.breaker.is_open:
+        lines.append("- ⚠️ circuit breaker terbuka, data dari cache")
+    cache = {dict(key)['result']: value for key, value in LIST_CACHE.values.items()}
+    lines.append(f"- cache /list: {cache.get('hit', 0) + cache.get('shared', 0):g} hit, {cache.get('miss', 0):g} render")
+    lines.append("")
+    lines.append("Baris dibaca:")
+    for key, value in sorted(ROWS_SCANNED.values.items()):
+        lines.append(f"- {dict(key)['source']}: {value:g}")
+    await update.message.reply_text("\n".join(lines))
+
+# Valid types (case insensitive)
+VALID_TYPES = ['galxe', 'testnet', 'layer3', 'waitlist', 'node']
+ITEMS_PER_PAGE = 5
+# Filter /list: (jenis, nilai) dengan jenis '', 'type', 'network', atau 'deadline'
+ListFilter = Tuple[str, str]
+
+async def get_list_page(list_filter: ListFilter, page: int) -> ListPage:
+    """Halaman /list dari cache, dirender ulang jika data sudah berubah"""
+    version = await get_repository().data_version()
+    return await get_list_cache().get_or_render(
+        (list_filter, page), version, lambda: render_list_page(list_filter, page)
+    )
+
+async def render_list_page(list_filter: ListFilter, page: int) -> ListPage:
+    kind, value = list_filter
+    filters = dict(
+        type_=value if kind == 'type' else None,
+        network=value if kind == 'network' else None,
+        deadline=parse_date(value) if kind == 'deadline' else None
+    )
+    repository = get_repository()
+    page = max(1, page)
+    paginated_airdrops, total_items = await repository.list_active_page(
+        offset=(page - 1) * ITEMS_PER_PAGE, limit=ITEMS_PER_PAGE, **filters
+    )
+
+    if not total_items:
+        msg = (
+            f"📋 Tidak ada airdrop aktif dengan tipe '{value.capitalize()}'."
+            if kind == 'type' else
+            f"📋 Tidak ada airdrop aktif dengan deadline '{value}'."
+            if kind == 'deadline' else
+            f"📋 Tidak ada airdrop aktif dengan network '{value.capitalize()}'."
+            if kind == 'network' else
+            "📋 Tidak ada airdrop aktif saat ini."
+        )
+        return ListPage([msg], 1, 0)
+
+    # Pagination
+    total_pages = (total_items + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
+    if page > total_pages:  # Pastikan page valid
+        page = total_pages
+        paginated_airdrops, total_items = await repository.list_active_page(
+            offset=(page - 1) * ITEMS_PER_PAGE, limit=ITEMS_PER_PAGE, **filters
+        )
+    start_idx = (page - 1) * ITEMS_PER_PAGE
+
+    # Format pesan
+    filter_text = (
+        f" ({value.capitalize()})" if kind == 'type' else
+        f" (Deadline: {value})" if kind == 'deadline' else
+        f" (Network: {value.capitalize()})" if kind == 'network' else ""
+    )
+    parts = [f"📋 Daftar Airdrop Aktif{filter_text} - Halaman {page}/{total_pages}:\n\n"]
+    for i, airdrop in enumerate(paginated_airdrops, start=start_idx + 1):
+        parts.append(
+            f"{i}. **{airdrop.nama}**\n"
+            f"   Link: {airdrop.link}\n"
+            f"   Type: {airdrop.type}\n"
+            f"   Deadline: {airdrop.deadline or 'Tidak ada'}\n"
+            f"   Network: {airdrop.network or 'Tidak ada'}\n\n"
+        )
+
+    # Tambahkan info pagination
+    if total_pages > 1:
+        filter_arg = value if kind == 'type' else f"--{kind} {value}" if kind else ""
+        parts.append(f"Gunakan '/list {filter_arg} <page>' untuk halaman lain (contoh: /list {filter_arg} 2)")
+
+    # Bagi pesan jika terlalu panjang (batas Telegram 4096 karakter)
+    response = ''.join(parts)
+    return ListPage([response[i:i + 4000] for i in range(0, len(response), 4000)], page, total_pages)
+
+def list_keyboard(list_filter: ListFilter, view: ListPage) -> Optional[InlineKeyboardMarkup]:
+    """Tombol halaman sebelumnya/berikutnya; callback_data: list:<page>:<jenis>:<nilai>"""
+    kind, value = list_filter
+    buttons = []
+    if view.page > 1:
+        buttons.append(InlineKeyboardButton("⬅️ Sebelumnya", callback_data=f"list:{view.page - 1}:{kind}:{value}"))
+    if view.page < view.total_pages:
+        buttons.append(InlineKeyboardButton("Berikutnya ➡️", callback_data=f"list:{view.page + 1}:{kind}:{value}"))
+    # callback_data dibatasi 64 byte; filter yang terlalu panjang tetap bisa lewat '/list ... <page>'
+    if not buttons or any(len(b.callback_data.encode()) > 64 for b in buttons):
+        return None
+    return InlineKeyboardMarkup([buttons])
+
+def parse_list_args(args) -> Tuple[ListFilter, int]:
+    """Filter dan halaman dari argumen /list; ValueError berisi pesan untuk user"""
+    page = 1
+    if not args:
+        return ('', ''), page
+    if args[0].lower() == '--deadline':
+        if len(args) < 2:
+            raise ValueError("❌ Harap masukkan tanggal setelah --deadline (contoh: /list --deadline 2025-12-31)")
+        try:
+            filter_deadline = datetime.strptime(args[1], '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError("❌ Format tanggal salah, gunakan YYYY-MM-DD")
+        if len(args) > 2 and args[2].isdigit():
+            page = int(args[2])
+        return ('deadline', filter_deadline.isoformat()), page
+    if args[0].lower() == '--network':
+        if len(args) < 2:
+            raise ValueError("❌ Harap masukkan network setelah --network (contoh: /list --network Ethereum)")
+        if len(args) > 2 and args[2].isdigit():
+            page = int(args[2])
+        return ('network', args[1].lower()), page
+    filter_type = args[0].lower()
+    if filter_type not in VALID_TYPES:
+        raise ValueError(
+            f"❌ Tipe '{args[0]}' tidak valid. Gunakan: {', '.join([t.capitalize() for t in VALID_TYPES])}"
+        )
+    if len(args) > 1 and args[1].isdigit():
+        page = int(args[1])
+    return ('type', filter_type), page
+
 async def list_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Menampilkan daftar airdrop dengan Status=Active, dengan filter dan pagination"""
-    sheets_client = GoogleSheetsClient()
-    
-    # Valid types (case insensitive)
-    valid_types = ['galxe', 'testnet', 'layer3', 'waitlist', 'node']
-    ITEMS_PER_PAGE = 5
-
-    # Parsing argumen
-    filter_type = None
-    filter_deadline = None
-    filter_network = None
-    page = 1
+    try:
+        list_filter, page = parse_list_args(context.args)
+    except ValueError as e:
+        await update.message.reply_text(str(e))
+        return
+
+    try:
+        view = await get_list_page(list_filter, page)
+        for chunk in view.chunks[:-1]:
+            await update.message.reply_text(chunk)
+        await update.message.reply_text(view.chunks[-1], reply_markup=list_keyboard(list_filter, view))
 
-    args = context.args
-    if args:
-        if args[0].lower() == '--deadline':
-            if len(args) < 2:
-                await update.message.reply_text("❌ Harap masukkan tanggal setelah --deadline (contoh: /list --deadline 2025-12-31)")
-                return
+        logger.info("Daftar airdrop aktif ditampilkan untuk user %s, filter: %s, page: %d",
+                   update.effective_user.id, list_filter[1] or "tanpa filter", view.page)
+    except Exception as e:
+        logger.error("Gagal mengambil daftar airdrop: %s", e, exc_info=True)
+        await update.message.reply_text("🔧 Gagal memuat daftar airdrop, coba lagi nanti.")
+
+async def list_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Tombol halaman /list: pesan yang sama diedit dengan halaman dari cache"""
+    query = update.callback_query
+    try:
+        _, page, kind, value = query.data.split(':', 3)
+        list_filter, page = (kind, value), int(page)
+    except ValueError:
+        await query.answer()
+        return
+
+    try:
+        view = await get_list_page(list_filter, page)
+    except Exception as e:
+        logger.error("Gagal mengambil daftar airdrop: %s", e, exc_info=True)
+        await query.answer("🔧 Gagal memuat daftar airdrop, coba lagi nanti.")
+        return
+    await query.answer()
+    keyboard = list_keyboard(list_filter, view)
+    if len(view.chunks) > 1:
+        # Halaman panjang tidak muat dalam satu pesan yang bisa diedit
+        for chunk in view.chunks[:-1]:
+            await query.message.reply_text(chunk)
+        await query.message.reply_text(view.chunks[-1], reply_markup=keyboard)
+        return
+    try:
+        await query.edit_message_text(view.chunks[0], reply_markup=keyboard)
+    except BadRequest as e:
+        # Tombol ditekan dua kali: isi pesan sudah sama
+        if 'not modified' not in str(e).lower():
+            raise
+
+def parse_topic_args(args) -> str:
+    """Topik /subscribe dan /unsubscribe dari argumen; ValueError berisi pesan untuk user"""
+    if args and args[0].lower() == '--network':
+        if len(args) < 2:
+            raise ValueError("❌ Harap masukkan network setelah --network (contoh: /subscribe --network Ethereum)")
+        return topic('network', args[1])
+    filter_type = args[0].lower()
+    if filter_type not in VALID_TYPES:
+        raise ValueError(
+            f"❌ Tipe '{args[0]}' tidak valid. Gunakan: {', '.join([t.capitalize() for t in VALID_TYPES])}"
+        )
+    return topic('type', filter_type)
+
+def describe_topic(name: str) -> str:
+    kind, _, value = name.partition(':')
+    return f"Network {value.capitalize()}" if kind == 'network' else value.capitalize()
+
+async def subscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Berlangganan pengingat Deadline untuk satu tipe atau network"""
+    store = get_state_store()
+    chat_id = update.effective_chat.id
+    if not context.args:
+        topics = await get_subscriptions(store, chat_id)
+        current = ', '.join(describe_topic(name) for name in topics) if topics else "belum ada"
+        await update.message.reply_text(
+            f"🔔 Langganan: {current}\n"
+            "Gunakan /subscribe <type> atau /subscribe --network <network> "
+            f"untuk pengingat {' dan '.join(str(d) for d in sorted(Config.REMINDER_DAYS, reverse=True))} hari "
+            "sebelum Deadline."
+        )
+        return
+    try:
+        name = parse_topic_args(context.args)
+        added = await subscribe(store, chat_id, name)
+    except ValueError as e:
+        await update.message.reply_text(str(e))
+        return
+    if added:
+        await update.message.reply_text(f"🔔 Pengingat Deadline untuk {describe_topic(name)} diaktifkan")
+    else:
+        await update.message.reply_text(f"ℹ️ Sudah berlangganan {describe_topic(name)}")
+
+async def unsubscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Berhenti berlangganan satu topik, atau semua dengan /unsubscribe all"""
+    store = get_state_store()
+    chat_id = update.effective_chat.id
+    if not context.args:
+        await update.message.reply_text("Gunakan /unsubscribe <type>, /unsubscribe --network <network>, atau /unsubscribe all")
+        return
+    if context.args[0].lower() == 'all':
+        removed = await unsubscribe(store, chat_id)
+        await update.message.reply_text("🔕 Semua langganan dihapus" if removed else "ℹ️ Belum ada langganan")
+        return
+    try:
+        name = parse_topic_args(context.args)
+    except ValueError as e:
+        await update.message.reply_text(str(e))
+        return
+    if await unsubscribe(store, chat_id, name):
+        await update.message.reply_text(f"🔕 Pengingat untuk {describe_topic(name)} dihentikan")
+    else:
+        await update.message.reply_text(f"ℹ️ Tidak berlangganan {describe_topic(name)}")
+
+SEARCH_LIMIT = 10
+
+def parse_search_args(args) -> SearchQuery:
+    """Kata kunci dan rentang Deadline dari argumen /search; ValueError berisi pesan untuk user"""
+    terms, bounds = [], {}
+    args = list(args or [])
+    while args:
+        arg = args.pop(0)
+        if arg.lower() in ('--before', '--after'):
+            if not args:
+                raise ValueError(f"❌ Harap masukkan tanggal setelah {arg.lower()} (contoh: /search zk {arg.lower()} 2025-12-31)")
             try:
-                filter_deadline = datetime.strptime(args[1], '%Y-%m-%d').date()
-                if len(args) > 2 and args[2].isdigit():
-                    page = int(args[2])
+                bounds[arg.lower()[2:]] = datetime.strptime(args.pop(0), '%Y-%m-%d').date()
             except ValueError:
-                await update.message.reply_text("❌ Format tanggal salah, gunakan YYYY-MM-DD")
-                return
-        elif args[0].lower() == '--network':
-            if len(args) < 2:
-                await update.message.reply_text("❌ Harap masukkan network setelah --network (contoh: /list --network Ethereum)")
-                return
-            filter_network = args[1].lower()
-            if len(args) > 2 and args[2].isdigit():
-                page = int(args[2])
+                raise ValueError("❌ Format tanggal salah, gunakan YYYY-MM-DD")
         else:
-            filter_type = args[0].lower()
-            if filter_type not in valid_types:
-                await update.message.reply_text(
-                    f"❌ Tipe '{args[0]}' tidak valid. Gunakan: {', '.join([t.capitalize() for t in valid_types])}"
-                )
-                return
-            if len(args) > 1 and args[1].isdigit():
-                page = int(args[1])
+            terms.extend(tokenize(arg))
+    if not terms and not bounds:
+        raise ValueError("🔍 Gunakan /search <kata kunci> [--after YYYY-MM-DD] [--before YYYY-MM-DD]")
+    return SearchQuery(tuple(terms), bounds.get('after'), bounds.get('before'))
 
+async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Mencari airdrop aktif berdasarkan Nama, Reward, Network, Type, dan rentang Deadline"""
     try:
-        worksheet = sheets_client.get_worksheet()
-        all_data = worksheet.get_all_values()
-        if len(all_data) <= 1:  # Hanya header atau kosong
-            await update.message.reply_text("📋 Tidak ada airdrop aktif saat ini.")
-            return
-
-        headers = all_data[0]
-        status_idx = headers.index('Status')
-        nama_idx = headers.index('Nama')
-        link_idx = headers.index('Link')
-        type_idx = headers.index('Type')
-        deadline_idx = headers.index('Deadline')
-        network_idx = headers.index('Network')
-
-        # Filter airdrop aktif
-        active_airdrops = [
-            row for row in all_data[1:]  # Lewati header
-            if row[status_idx] == 'Active'
-        ]
-
-        # Terapkan filter berdasarkan Type
-        if filter_type:
-            active_airdrops = [
-                row for row in active_airdrops
-                if row[type_idx].lower() == filter_type
-            ]
-
-        # Terapkan filter berdasarkan Deadline
-        if filter_deadline:
-            active_airdrops = [
-                row for row in active_airdrops
-                if row[deadline_idx] and datetime.strptime(row[deadline_idx], '%Y-%m-%d').date() == filter_deadline
-            ]
-
-        # Terapkan filter berdasarkan Network
-        if filter_network:
-            active_airdrops = [
-                row for row in active_airdrops
-                if row[network_idx].lower() == filter_network
-            ]
-
-        if not active_airdrops:
-            msg = (
-                f"📋 Tidak ada airdrop aktif dengan tipe '{filter_type.capitalize()}'."
-                if filter_type else
-                f"📋 Tidak ada airdrop aktif dengan deadline '{filter_deadline}'."
-                if filter_deadline else
-                f"📋 Tidak ada airdrop aktif dengan network '{filter_network.capitalize()}'."
-                if filter_network else
-                "📋 Tidak ada airdrop aktif saat ini."
-            )
-            await update.message.reply_text(msg)
-            return
-
-        # Pagination
-        total_items = len(active_airdrops)
-        total_pages = (total_items + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
-        page = max(1, min(page, total_pages))  # Pastikan page valid
-        start_idx = (page - 1) * ITEMS_PER_PAGE
-        end_idx = min(start_idx + ITEMS_PER_PAGE, total_items)
-        paginated_airdrops = active_airdrops[start_idx:end_idx]
-
-        # Format pesan
-        filter_text = (
-            f" ({filter_type.capitalize()})" if filter_type else
-            f" (Deadline: {filter_deadline})" if filter_deadline else
-            f" (Network: {filter_network.capitalize()})" if filter_network else ""
-        )
-        response = f"📋 Daftar Airdrop Aktif{filter_text} - Halaman {page}/{total_pages}:\n\n"
-        for i, row in enumerate(paginated_airdrops, start=start_idx + 1):
-            response += (
-                f"{i}. **{row[nama_idx]}**\n"
-                f"   Link: {row[link_idx]}\n"
-                f"   Type: {row[type_idx]}\n"
-                f"   Deadline: {row[deadline_idx] or 'Tidak ada'}\n"
-                f"   Network: {row[network_idx] or 'Tidak ada'}\n\n"
-            )
-
-        # Tambahkan info pagination
-        if total_pages > 1:
-            filter_arg = filter_type or (f"--deadline {filter_deadline}" if filter_deadline else f"--network {filter_network}" if filter_network else "")
-            response += f"Gunakan '/list {filter_arg} <page>' untuk halaman lain (contoh: /list {filter_arg} 2)"
-
-        # Bagi pesan jika terlalu panjang (batas Telegram 4096 karakter)
-        if len(response) > 4000:
-            parts = [response[i:i+4000] for i in range(0, len(response), 4000)]
-            for part in parts:
-                await update.message.reply_text(part)
-        else:
-            await update.message.reply_text(response)
+        query = parse_search_args(context.args)
+    except ValueError as e:
+        await update.message.reply_text(str(e))
+        return
 
-        logger.info("Daftar airdrop aktif ditampilkan untuk user %s, filter: %s, page: %d", 
-                   update.effective_user.id, filter_type or filter_deadline or filter_network or "tanpa filter", page)
+    try:
+        results, total = await get_search().search(query, limit=SEARCH_LIMIT)
     except Exception as e:
-        logger.error("Gagal mengambil daftar airdrop: %s", e, exc_info=True)
-        await update.message.reply_text("🔧 Gagal memuat daftar airdrop, coba lagi nanti.")
+        logger.error("Gagal mencari airdrop: %s", e, exc_info=True)
+        await update.message.reply_text("🔧 Gagal mencari airdrop, coba lagi nanti.")
+        return
+
+    if not total:
+        await update.message.reply_text("🔍 Tidak ada airdrop aktif yang cocok.")
+        return
+    shown = f", menampilkan {len(results)} teratas" if total > len(results) else ""
+    parts = [f"🔍 Hasil pencarian ({total} ditemukan{shown}):\n\n"]
+    for i, airdrop in enumerate(results, start=1):
+        parts.append(
+            f"{i}. **{airdrop.nama}**\n"
+            f"   Link: {airdrop.link}\n"
+            f"   Type: {airdrop.type}\n"
+            f"   Deadline: {airdrop.deadline or 'Tidak ada'}\n"
+            f"   Network: {airdrop.network or 'Tidak ada'}\n"
+            f"   Reward: {airdrop.reward or 'Tidak ada'}\n\n"
+        )
+    response = ''.join(parts)
+    for i in range(0, len(response), 4000):
+        await update.message.reply_text(response[i:i + 4000])
+    logger.info("Pencarian oleh user %s: %s, %d hasil", update.effective_user.id, query, total)
@@ -1,9 +1,9 @@
 from telegram import Update, ReplyKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 from src.config import Config
-from src.sheets import GoogleSheetsClient
-from src.utils import is_valid_url
-from datetime import datetime
+from src.models import Airdrop
+from src.storage import DuplicateError, get_repository
+from src.utils import is_valid_url, normalize_url, parse_deadline
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,7 +11,14 @@ logger = logging.getLogger(__name__)
 # States
 NAMA, TWITTER, DISCORD, TELEGRAM, LINK, TYPE, DEADLINE, REWARD, NETWORK, CONFIRM = range(10)
 
-sheets_client = GoogleSheetsClient()
+async def is_registered(field: str, url: str) -> bool:
+    """Cek duplikat saat input; jika penyimpanan gagal, input tetap diterima (confirm mengecek ulang)"""
+    key = normalize_url(url)
+    try:
+        return bool(key and await get_repository().find_existing(field, [key]))
+    except Exception as e:
+        logger.warning("Gagal mengecek duplikat %s: %s", field, e)
+        return False
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     await update.message.reply_text('Halo! Mari tambahkan airdrop baru. Silakan masukkan NAMA:')
@@ -27,6 +34,9 @@ async def get_twitter(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     if not is_valid_url(url):
         await update.message.reply_text("❌ Format URL Twitter tidak valid!")
         return TWITTER
+    if await is_registered('Twitter', url):
+        await update.message.reply_text("⚠️ Twitter ini sudah terdaftar di airdrop lain. Masukkan URL lain atau /cancel")
+        return TWITTER
     context.user_data['twitter'] = url
     await update.message.reply_text('Masukkan LINK DISCORD:')
     return DISCORD
@@ -36,6 +46,9 @@ async def get_discord(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     if not is_valid_url(url):
         await update.message.reply_text("❌ Format URL Discord tidak valid!")
         return DISCORD
+    if await is_registered('Discord', url):
+        await update.message.reply_text("⚠️ Discord ini sudah terdaftar di airdrop lain. Masukkan URL lain atau /cancel")
+        return DISCORD
     context.user_data['discord'] = url
     await update.message.reply_text('Masukkan LINK TELEGRAM:')
     return TELEGRAM
@@ -54,6 +67,9 @@ async def get_link(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     if not is_valid_url(url):
         await update.message.reply_text("❌ Format URL Airdrop tidak valid!")
         return LINK
+    if await is_registered('Link', url):
+        await update.message.reply_text("⚠️ Link ini sudah terdaftar di airdrop lain. Masukkan URL lain atau /cancel")
+        return LINK
     context.user_data['link'] = url
     
     reply_keyboard = [['Galxe', 'Testnet', 'Layer3'], ['Waitlist', 'Node']]
@@ -69,16 +85,12 @@ async def get_type(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     return DEADLINE
 
 async def get_deadline(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    text = update.message.text.strip().lower()
-    if text == 'skip':
-        context.user_data['deadline'] = ''
-    else:
-        try:
-            datetime.strptime(text, '%Y-%m-%d')
-            context.user_data['deadline'] = text
-        except ValueError:
-            await update.message.reply_text('❌ Format tanggal salah! Gunakan YYYY-MM-DD atau "skip"')
-            return DEADLINE
+    try:
+        deadline = parse_deadline(update.message.text)
+    except ValueError:
+        await update.message.reply_text('❌ Format tanggal salah! Gunakan YYYY-MM-DD atau "skip"')
+        return DEADLINE
+    context.user_data['deadline'] = deadline.isoformat() if deadline else ''
     await update.message.reply_text('Masukkan REWARD (contoh: 1000 XYZ) atau ketik "skip" jika tidak ada:')
     return REWARD
 
@@ -113,21 +125,30 @@ async def get_network(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
 async def confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     response = update.message.text.lower().strip()
     if response == 'ya':
-        worksheet = sheets_client.get_worksheet()
-        row = [
-            context.user_data['nama'],
-            context.user_data['twitter'],
-            context.user_data['discord'],
-            context.user_data['telegram'],
-            context.user_data['link'],
-            context.user_data['type'],
-            context.user_data['deadline'],
-            context.user_data['reward'],
-            str(update.effective_user.id),
-            context.user_data['status'],
-            context.user_data['network']
-        ]
-        if sheets_client.append_row(worksheet, row):
+        record = Airdrop(
+            nama=context.user_data['nama'],
+            twitter=context.user_data['twitter'],
+            discord=context.user_data['discord'],
+            telegram=context.user_data['telegram'],
+            link=context.user_data['link'],
+            type=context.user_data['type'],
+            deadline=context.user_data['deadline'],
+            reward=context.user_data['reward'],
+            user_id=str(update.effective_user.id),
+            status=context.user_data['status'],
+            network=context.user_data['network']
+        )
+        try:
+            await get_repository().add(record, unique=True)
+            saved = True
+        except DuplicateError as e:
+            await update.message.reply_text(f'⚠️ Airdrop ini sudah terdaftar ({e.field} sama), data tidak disimpan')
+            context.user_data.clear()
+            return ConversationHandler.END
+        except Exception as e:
+            logger.error("Gagal menyimpan data: %s", e, exc_info=True)
+            saved = False
+        if saved:
             await update.message.reply_text('✅ Data berhasil disimpan!')
         else:
             await update.message.reply_text('🔧 Gagal menyimpan data, coba lagi nanti')
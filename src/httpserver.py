@@ -0,0 +1,44 @@
+import asyncio
+from typing import Dict, NamedTuple
+
+class HttpRequest(NamedTuple):
+    method: str
+    path: str
+    headers: Dict[str, str]  # nama header huruf kecil
+    body: bytes
+
+class HttpError(Exception):
+    def __init__(self, status: str):
+        super().__init__(status)
+        self.status = status
+
+async def read_request(reader: asyncio.StreamReader, max_body: int = 1_000_000, timeout: float = 10) -> HttpRequest:
+    """Membaca satu request HTTP/1.1 sederhana (tanpa chunked encoding)"""
+    request_line = await asyncio.wait_for(reader.readline(), timeout)
+    parts = request_line.decode('latin-1').split()
+    if len(parts) < 2:
+        raise HttpError('400 Bad Request')
+    headers: Dict[str, str] = {}
+    while True:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length') or 0)
+    if length > max_body:
+        raise HttpError('413 Payload Too Large')
+    body = await asyncio.wait_for(reader.readexactly(length), timeout) if length else b''
+    return HttpRequest(parts[0].upper(), parts[1].split('?')[0], headers, body)
+
+async def write_response(
+    writer: asyncio.StreamWriter,
+    status: str,
+    body: bytes = b'',
+    content_type: str = 'text/plain; charset=utf-8'
+) -> None:
+    writer.write(
+        f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n'
+        f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body
+    )
+    await writer.drain()
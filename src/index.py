@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+from src.config import Config
+from src.metrics import ROWS_SCANNED
+from src.models import Airdrop, SheetSchema, parse_sheet
+from src.sheets import PRIORITY_INTERACTIVE, AsyncSheetsClient, get_sheets_client, is_retryable
+from src.utils import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Kolom URL untuk deteksi duplikat -> atribut Airdrop
+URL_FIELDS = {'Link': 'link', 'Twitter': 'twitter', 'Discord': 'discord'}
+
+class AirdropIndex:
+    """Cache lokal tabel airdrop dengan indeks sekunder untuk /list"""
+
+    def __init__(self, client: AsyncSheetsClient, ttl: float = Config.INDEX_TTL_SECONDS):
+        self.client = client
+        self.ttl = ttl
+        self.schema: Optional[SheetSchema] = None
+        self.rows: List[Airdrop] = []
+        self.version = 0
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._reset_indexes()
+
+    def _reset_indexes(self) -> None:
+        # Nilai indeks adalah posisi baris di self.rows (baris sheet = posisi + 2)
+        self.by_status: Dict[str, Set[int]] = defaultdict(set)
+        self.by_type: Dict[str, Set[int]] = defaultdict(set)
+        self.by_network: Dict[str, Set[int]] = defaultdict(set)
+        self.by_deadline: Dict[date, Set[int]] = defaultdict(set)
+        # Kolom -> URL ternormalisasi -> posisi pertama, untuk deteksi duplikat O(1)
+        self.by_url: Dict[str, Dict[str, int]] = defaultdict(dict)
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def invalidate(self) -> None:
+        """Menandai cache kedaluwarsa sehingga dimuat ulang pada akses berikutnya"""
+        self._loaded_at = None
+
+    async def refresh(self, force: bool = False, priority: int = PRIORITY_INTERACTIVE, stale_ok: bool = True) -> None:
+        """Memuat ulang seluruh tabel jika TTL habis (atau dipaksa).
+
+        Jika Sheets sedang bermasalah dan cache sudah pernah dimuat, data lama tetap
+        dipakai dan pemuatan dicoba lagi pada akses berikutnya, kecuali `stale_ok=False`.
+        """
+        async with self._lock:
+            if self.is_fresh and not force:
+                return
+            try:
+                all_data = await self.client.get_all_values(priority)
+            except Exception as e:
+                if self.version == 0 or not stale_ok or not is_retryable(e):
+                    raise
+                logger.warning("Gagal memuat ulang indeks, memakai data lama: %r", e)
+                return
+            self.load(all_data)
+
+    def load(self, all_data: List[List[str]]) -> None:
+        """Membangun ulang cache dari output get_all_values"""
+        self.schema, records = parse_sheet(all_data)
+        self.rows = []
+        self._reset_indexes()
+        for record in records:
+            self._add(record)
+        self._loaded_at = time.monotonic()
+        self.version += 1
+        ROWS_SCANNED.inc(len(self.rows), source='index')
+        logger.info("Indeks airdrop dimuat: %d baris", len(self.rows))
+
+    def add_rows(self, records: List[Airdrop]) -> None:
+        """Menambahkan baris yang baru ditulis bot ini tanpa memuat ulang sheet"""
+        if self._loaded_at is None:
+            return
+        for record in records:
+            self._add(record)
+        self.version += 1
+
+    def pending_deadlines(self) -> List[Tuple[date, int]]:
+        """Mengembalikan (deadline, posisi) untuk baris yang belum Ended"""
+        ended = self.by_status.get('Ended', set())
+        return [
+            (deadline, pos)
+            for deadline, positions in self.by_deadline.items()
+            for pos in positions
+            if pos not in ended
+        ]
+
+    def set_status(self, positions: List[int], status: str) -> None:
+        """Memperbarui Status beberapa baris beserta indeksnya"""
+        for pos in positions:
+            if pos >= len(self.rows):
+                continue
+            record = self.rows[pos]
+            self.by_status[record.status].discard(pos)
+            record.status = status
+            self.by_status[status].add(pos)
+        self.version += 1
+
+    def _add(self, record: Airdrop) -> None:
+        pos = len(self.rows)
+        self.rows.append(record)
+        self.by_status[record.status].add(pos)
+        self.by_type[record.type.lower()].add(pos)
+        self.by_network[record.network.lower()].add(pos)
+        for field, attr in URL_FIELDS.items():
+            key = normalize_url(getattr(record, attr))
+            if key:
+                self.by_url[field].setdefault(key, pos)
+        if record.due:
+            self.by_deadline[record.due].add(pos)
+        elif record.deadline:
+            logger.debug("Deadline tidak valid di baris %d: %s", pos + 2, record.deadline)
+
+    async def query(
+        self,
+        status: str = 'Active',
+        type_: Optional[str] = None,
+        network: Optional[str] = None,
+        deadline: Optional[date] = None
+    ) -> List[Airdrop]:
+        """Mengembalikan baris yang cocok dengan semua filter, urut sesuai sheet"""
+        await self.refresh()
+        candidates = [self.by_status.get(status, set())]
+        if type_:
+            candidates.append(self.by_type.get(type_.lower(), set()))
+        if network:
+            candidates.append(self.by_network.get(network.lower(), set()))
+        if deadline:
+            candidates.append(self.by_deadline.get(deadline, set()))
+        candidates.sort(key=len)
+        matched = candidates[0].intersection(*candidates[1:])
+        return [self.rows[pos] for pos in sorted(matched)]
+
+_shared_index: Optional[AirdropIndex] = None
+
+def get_airdrop_index() -> AirdropIndex:
+    """Mendapatkan indeks airdrop bersama untuk seluruh proses"""
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = AirdropIndex(get_sheets_client())
+    return _shared_index
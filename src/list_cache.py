@@ -0,0 +1,76 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+from src.config import Config
+from src.metrics import LIST_CACHE
+
+class ListPage(NamedTuple):
+    """Hasil render satu halaman /list, siap dikirim"""
+    chunks: List[str]  # potongan pesan <= 4000 karakter
+    page: int  # halaman yang benar-benar ditampilkan (setelah dibatasi ke total_pages)
+    total_pages: int
+
+class ListPageCache:
+    """Cache LRU halaman /list untuk satu versi data.
+
+    Key berisi filter dan nomor halaman. Begitu versi data repository berubah
+    (baris baru tersimpan, status diperbarui, atau indeks dimuat ulang) seluruh
+    isi cache dibuang, sehingga halaman lama tidak pernah ditampilkan lagi.
+    Permintaan bersamaan untuk halaman yang belum di-cache menunggu satu render yang sama.
+    """
+
+    def __init__(self, max_entries: int = Config.LIST_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.version: Any = None
+        self._pages: 'OrderedDict[Hashable, ListPage]' = OrderedDict()
+        self._rendering: Dict[Tuple[Hashable, Any], asyncio.Future] = {}
+
+    def get(self, key: Hashable, version: Any) -> Optional[ListPage]:
+        if version != self.version:
+            self.invalidate()
+            self.version = version
+        page = self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+        return page
+
+    async def get_or_render(self, key: Hashable, version: Any, render: Callable[[], Awaitable[ListPage]]) -> ListPage:
+        page = self.get(key, version)
+        if page is not None:
+            LIST_CACHE.inc(result='hit')
+            return page
+        task = self._rendering.get((key, version))
+        if task is not None:
+            LIST_CACHE.inc(result='shared')
+        else:
+            LIST_CACHE.inc(result='miss')
+            task = self._rendering[(key, version)] = asyncio.ensure_future(render())
+            task.add_done_callback(lambda _: self._rendering.pop((key, version), None))
+        # shield: user yang dibatalkan tidak ikut membatalkan render milik user lain
+        page = await asyncio.shield(task)
+        self.put(key, version, page)
+        return page
+
+    def put(self, key: Hashable, version: Any, page: ListPage) -> None:
+        if version != self.version:
+            return  # data sudah berubah selama render
+        self._pages[key] = page
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_entries:
+            self._pages.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self._pages.clear()
+        self.version = None
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+_shared_cache: Optional[ListPageCache] = None
+
+def get_list_cache() -> ListPageCache:
+    """Mendapatkan cache halaman /list bersama untuk seluruh proses"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ListPageCache()
+    return _shared_cache
@@ -0,0 +1,217 @@
+import asyncio
+import bisect
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from telegram.ext import Application, ApplicationHandlerStop, BaseHandler, ConversationHandler
+from src.httpserver import HttpError, read_request, write_response
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted(labels.items()))
+
+def _format_labels(key: LabelKey, extra: str = '') -> str:
+    parts = [f'{k}="{v}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+class Counter:
+    """Counter monotonik dengan label"""
+
+    def __init__(self, name: str, doc: str):
+        self.name = name
+        self.doc = doc
+        self.values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.doc}', f'# TYPE {self.name} counter']
+        for key, value in sorted(self.values.items()):
+            lines.append(f'{self.name}{_format_labels(key)} {value:g}')
+        return lines
+
+class Gauge:
+    """Nilai terakhir dengan label"""
+
+    def __init__(self, name: str, doc: str):
+        self.name = name
+        self.doc = doc
+        self.values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[_key(labels)] = value
+
+    def get(self, **labels: str) -> Optional[float]:
+        return self.values.get(_key(labels))
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.doc}', f'# TYPE {self.name} gauge']
+        for key, value in sorted(self.values.items()):
+            lines.append(f'{self.name}{_format_labels(key)} {value:g}')
+        return lines
+
+class Histogram:
+    """Histogram dengan bucket tetap (detik)"""
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name: str, doc: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.doc = doc
+        self.buckets = tuple(buckets)
+        # Per label: [jumlah per bucket (+Inf di akhir), total nilai, jumlah observasi]
+        self.values: Dict[LabelKey, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def quantile(self, q: float, **labels: str) -> Optional[float]:
+        """Perkiraan kuantil (batas atas bucket) untuk label tertentu"""
+        entry = self.values.get(_key(labels))
+        if not entry or not entry[2]:
+            return None
+        target = q * entry[2]
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), entry[0]):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.doc}', f'# TYPE {self.name} histogram']
+        for key, (counts, total, n) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                bucket_labels = _format_labels(key, 'le="%s"' % le)
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {total:g}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {n}')
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Any] = []
+
+    def counter(self, name: str, doc: str) -> Counter:
+        metric = Counter(name, doc)
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, doc: str) -> Gauge:
+        metric = Gauge(name, doc)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, doc: str, buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, doc, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+HANDLER_LATENCY = REGISTRY.histogram('airdrop_handler_seconds', 'Latensi handler Telegram')
+HANDLER_ERRORS = REGISTRY.counter('airdrop_handler_errors_total', 'Exception dari handler Telegram')
+SHEETS_CALLS = REGISTRY.counter('airdrop_sheets_calls_total', 'Panggilan API Google Sheets per method')
+SHEETS_LATENCY = REGISTRY.histogram('airdrop_sheets_call_seconds', 'Latensi panggilan API Google Sheets')
+SHEETS_ERRORS = REGISTRY.counter('airdrop_sheets_errors_total', 'Error API Google Sheets per method dan status HTTP')
+ROWS_SCANNED = REGISTRY.counter('airdrop_rows_scanned_total', 'Baris data yang dibaca per sumber')
+SHEETS_QUEUE_WAIT = REGISTRY.histogram('airdrop_sheets_queue_seconds', 'Waktu tunggu panggilan Sheets di antrian per prioritas')
+SHEETS_RETRIES = REGISTRY.counter('airdrop_sheets_retries_total', 'Percobaan ulang panggilan Sheets per method')
+SHEETS_BREAKER = REGISTRY.gauge('airdrop_sheets_breaker_open', '1 jika circuit breaker Sheets sedang terbuka')
+LIST_CACHE = REGISTRY.counter('airdrop_list_cache_total', 'Permintaan halaman /list per hasil cache (hit, shared, miss)')
+NOTIFICATIONS = REGISTRY.counter('airdrop_notifications_total', 'Pesan pengingat per hasil (sent, retry, blocked, error)')
+STARTUP_SECONDS = REGISTRY.gauge('airdrop_startup_seconds', 'Durasi fase startup terakhir (import, ready, warmup)')
+
+def timed_handler(name: str, callback: Callable[..., Any]) -> Callable[..., Any]:
+    """Membungkus callback handler agar latensinya tercatat"""
+    @functools.wraps(callback)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await callback(*args, **kwargs)
+        except ApplicationHandlerStop:
+            # Penghentian yang disengaja (mis. rate limit), bukan error
+            raise
+        except Exception:
+            HANDLER_ERRORS.inc(handler=name)
+            raise
+        finally:
+            HANDLER_LATENCY.observe(time.perf_counter() - start, handler=name)
+    return wrapper
+
+def instrument_application(application: Application) -> None:
+    """Memasang timed_handler ke semua handler terdaftar, termasuk isi ConversationHandler"""
+    def instrument(handler: BaseHandler) -> None:
+        if isinstance(handler, ConversationHandler):
+            for child in handler.entry_points + handler.fallbacks:
+                instrument(child)
+            for state_handlers in handler.states.values():
+                for child in state_handlers:
+                    instrument(child)
+        elif not getattr(handler.callback, '__wrapped__', None):
+            handler.callback = timed_handler(handler.callback.__name__, handler.callback)
+
+    for handlers in application.handlers.values():
+        for handler in handlers:
+            instrument(handler)
+
+class MetricsServer:
+    """Endpoint HTTP lokal bergaya Prometheus (GET /metrics)"""
+
+    def __init__(self, host: str, port: int, registry: Registry = REGISTRY):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info("Endpoint metrik aktif di http://%s:%d/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await read_request(reader, max_body=0, timeout=5)
+            if request.method == 'GET' and request.path == '/metrics':
+                await write_response(writer, '200 OK', self.registry.render().encode(), 'text/plain; version=0.0.4')
+            else:
+                await write_response(writer, '404 Not Found', b'not found\n')
+        except HttpError as e:
+            await write_response(writer, e.status)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
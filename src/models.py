@@ -0,0 +1,136 @@
+import sys
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.utils import today
+
+HEADERS = ['Nama', 'Twitter', 'Discord', 'Telegram', 'Link', 'Type', 'Deadline', 'Reward', 'User ID', 'Status', 'Network', 'Timestamp']
+# Nama atribut Airdrop (dan kolom SQLite), sejajar dengan HEADERS
+FIELDS = ('nama', 'twitter', 'discord', 'telegram', 'link', 'type', 'deadline', 'reward', 'user_id', 'status', 'network', 'timestamp')
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str) -> Optional[date]:
+    """Deadline YYYY-MM-DD sebagai date, None jika kosong atau tidak valid.
+
+    Di-cache karena jumlah tanggal berbeda jauh lebih kecil dari jumlah baris.
+    """
+    if not text:
+        return None
+    try:
+        return datetime.strptime(text, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+class Airdrop:
+    """Satu baris airdrop. Atribut sesuai FIELDS, ditambah `due` (Deadline yang sudah diurai)"""
+
+    __slots__ = FIELDS + ('due',)
+
+    def __init__(
+        self,
+        nama: str = '',
+        twitter: str = '',
+        discord: str = '',
+        telegram: str = '',
+        link: str = '',
+        type: str = '',
+        deadline: str = '',
+        reward: str = '',
+        user_id: str = '',
+        status: str = '',
+        network: str = '',
+        timestamp: str = ''
+    ):
+        self.nama = nama
+        self.twitter = twitter
+        self.discord = discord
+        self.telegram = telegram
+        self.link = link
+        self.type = type
+        self.deadline = deadline
+        self.reward = reward
+        self.user_id = user_id
+        self.status = status
+        self.network = network
+        self.timestamp = timestamp
+        self.due = parse_date(deadline)
+
+    @classmethod
+    def from_row(cls, row: Sequence[str]) -> 'Airdrop':
+        """Dari tepat len(HEADERS) sel berurutan sesuai HEADERS (baris SQLite, journal, backup)"""
+        record = cls.__new__(cls)
+        (record.nama, record.twitter, record.discord, record.telegram, record.link, record.type,
+         record.deadline, record.reward, record.user_id, record.status, record.network, record.timestamp) = row
+        record.due = parse_date(record.deadline)
+        return record
+
+    def to_row(self) -> List[str]:
+        """Sel berurutan sesuai HEADERS, untuk Sheets, journal, dan file"""
+        return [self.nama, self.twitter, self.discord, self.telegram, self.link, self.type,
+                self.deadline, self.reward, self.user_id, self.status, self.network, self.timestamp]
+
+    def is_due(self, today: date) -> bool:
+        """True jika Deadline sudah tiba (berlaku sejak pukul 00:00 tanggal tersebut)"""
+        return self.due is not None and self.due <= today
+
+    def prepare(self) -> 'Airdrop':
+        """Melengkapi Status berdasarkan Deadline dan mengisi Timestamp sebelum disimpan"""
+        self.status = 'Ended' if self.is_due(today()) else self.status or 'Active'
+        self.timestamp = datetime.now().isoformat()
+        return self
+
+    def __repr__(self) -> str:
+        return f"Airdrop({', '.join(f'{name}={getattr(self, name)!r}' for name in FIELDS if getattr(self, name))})"
+
+class SheetSchema:
+    """Posisi kolom HEADERS di sebuah sheet, di-resolve sekali per baris header"""
+
+    def __init__(self, headers: Sequence[str]):
+        self.headers = list(headers)
+        self.width = len(self.headers)
+        columns: Dict[str, int] = {}
+        for i, name in enumerate(self.headers):
+            columns.setdefault(name, i)
+        self.columns = columns
+        # Kolom yang tidak ada di sheet dibaca dari sel kosong tambahan di posisi `width`
+        self.positions: Tuple[int, ...] = tuple(columns.get(name, self.width) for name in HEADERS)
+        self.complete = self.width not in self.positions
+        self.exact = self.positions == tuple(range(len(HEADERS)))
+
+    def parse(self, rows: Sequence[Sequence[str]]) -> List[Airdrop]:
+        """Mengubah baris data (tanpa header) menjadi Airdrop dalam satu lintasan"""
+        positions = self.positions
+        width = self.width if self.complete else self.width + 1
+        size = len(HEADERS)
+        intern = sys.intern
+        from_row = Airdrop.from_row
+        records = []
+        for row in rows:
+            if len(row) < width:
+                row = list(row) + [''] * (width - len(row))
+            if self.exact:
+                record = from_row(row if len(row) == size else row[:size])
+            else:
+                record = from_row([row[i] for i in positions])
+            # Kolom dengan sedikit nilai berbeda berbagi satu objek string untuk semua baris
+            record.type = intern(record.type)
+            record.deadline = intern(record.deadline)
+            record.status = intern(record.status)
+            record.network = intern(record.network)
+            records.append(record)
+        return records
+
+@lru_cache(maxsize=16)
+def _schema(headers: Tuple[str, ...]) -> SheetSchema:
+    return SheetSchema(headers)
+
+def schema_for(headers: Sequence[str]) -> SheetSchema:
+    """SheetSchema untuk baris header ini; dipakai ulang selama header sheet tidak berubah"""
+    return _schema(tuple(headers))
+
+def parse_sheet(all_data: Sequence[Sequence[str]]) -> Tuple[SheetSchema, List[Airdrop]]:
+    """Output get_all_values (baris pertama header) menjadi schema dan daftar Airdrop"""
+    if not all_data:
+        return schema_for(HEADERS), []
+    schema = schema_for(all_data[0])
+    return schema, schema.parse(all_data[1:])
@@ -0,0 +1,128 @@
+import time
+from typing import Dict, List, Optional, Tuple
+from src.config import Config
+
+# Kelas perintah; hanya kelas di SHEETS_COST_CLASSES yang memakai bucket global
+COMMAND_CLASSES: Dict[str, str] = {
+    'start': 'conversation',
+    'cancel': 'conversation',
+    'help': 'conversation',
+    'list': 'read',
+    'search': 'conversation',  # dijawab dari indeks di memori
+    'subscribe': 'conversation',
+    'unsubscribe': 'conversation',
+    'stats': 'admin',
+    'backup': 'admin',
+    'import': 'admin',
+    'export': 'admin',
+}
+SHEETS_COST_CLASSES = {'read', 'write', 'admin'}
+
+class _Bucket:
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+class TokenBucketLimiter:
+    """Token bucket per (user, kelas perintah) ditambah satu bucket global untuk kuota Sheets.
+
+    Bucket disimpan di beberapa shard (user_id % shards). Bucket yang sudah terisi
+    penuh kembali tidak berbeda dengan bucket baru, jadi dihapus saat sweep bertahap
+    sehingga memori hanya sebanding dengan jumlah user yang aktif belakangan ini.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, Tuple[float, float]] = Config.RATE_LIMITS,
+        global_per_minute: float = Config.SHEETS_QUOTA_PER_MINUTE,
+        shards: int = 16,
+        sweep_every: int = 1024
+    ):
+        self.limits = limits  # kelas -> (kapasitas, token per detik)
+        self.global_capacity = float(global_per_minute)
+        self.global_rate = global_per_minute / 60
+        self.global_bucket = _Bucket(self.global_capacity, time.monotonic())
+        self.shards: List[Dict[Tuple[int, str], _Bucket]] = [{} for _ in range(shards)]
+        self.sweep_every = sweep_every
+        self._ops = 0
+        self._next_shard = 0
+
+    @staticmethod
+    def _refill(bucket: _Bucket, capacity: float, rate: float, now: float) -> None:
+        bucket.tokens = min(capacity, bucket.tokens + max(0.0, now - bucket.updated) * rate)
+        bucket.updated = now
+
+    def acquire(self, user_id: int, command_class: str, now: Optional[float] = None) -> float:
+        """Mengambil satu token; mengembalikan 0 jika diizinkan, atau detik tunggu jika ditolak"""
+        now = time.monotonic() if now is None else now
+        self._ops += 1
+        if self._ops % self.sweep_every == 0:
+            # Sebelum bucket diambil: bucket yang baru dibuat di panggilan ini tidak ikut terhapus
+            self._sweep(now)
+        capacity, rate = self.limits[command_class]
+        shard = self.shards[user_id % len(self.shards)]
+        key = (user_id, command_class)
+        bucket = shard.get(key)
+        if bucket is None:
+            bucket = shard[key] = _Bucket(capacity, now)
+        else:
+            self._refill(bucket, capacity, rate, now)
+
+        if bucket.tokens < 1:
+            return (1 - bucket.tokens) / rate
+        if command_class in SHEETS_COST_CLASSES:
+            self._refill(self.global_bucket, self.global_capacity, self.global_rate, now)
+            if self.global_bucket.tokens < 1:
+                return (1 - self.global_bucket.tokens) / self.global_rate
+            self.global_bucket.tokens -= 1
+        bucket.tokens -= 1
+        return 0.0
+
+    def _sweep(self, now: float) -> None:
+        """Menghapus bucket yang sudah penuh kembali dari satu shard"""
+        shard = self.shards[self._next_shard]
+        self._next_shard = (self._next_shard + 1) % len(self.shards)
+        for key in [k for k, b in shard.items()
+                    if b.tokens + (now - b.updated) * self.limits[k[1]][1] >= self.limits[k[1]][0]]:
+            del shard[key]
+
+    def export(self, now: float) -> Dict[Tuple[int, str], Tuple[float, float]]:
+        """Bucket yang belum penuh sebagai {(user, kelas): (token, umur detik)}"""
+        entries = {}
+        for shard in self.shards:
+            for key, b in shard.items():
+                capacity, rate = self.limits[key[1]]
+                if b.tokens + max(0.0, now - b.updated) * rate < capacity:
+                    entries[key] = (b.tokens, max(0.0, now - b.updated))
+        return entries
+
+    def restore(self, entries: Dict[Tuple[int, str], Tuple[float, float]], now: float) -> None:
+        for (user_id, command_class), (tokens, age) in entries.items():
+            if command_class in self.limits:
+                self.shards[user_id % len(self.shards)][(user_id, command_class)] = _Bucket(tokens, now - age)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+def classify(text: Optional[str]) -> str:
+    """Menentukan kelas perintah dari teks pesan"""
+    if not text:
+        return 'conversation'
+    text = text.strip()
+    if text.startswith('/'):
+        command = text.split()[0][1:].split('@')[0].lower()
+        return COMMAND_CLASSES.get(command, 'conversation')
+    # 'ya' pada langkah CONFIRM memicu penyimpanan data
+    return 'write' if text.lower() == 'ya' else 'conversation'
+
+_shared_limiter: Optional[TokenBucketLimiter] = None
+
+def get_rate_limiter() -> TokenBucketLimiter:
+    """Mendapatkan rate limiter bersama untuk seluruh proses"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        # Kuota Sheets dibagi rata antar worker
+        _shared_limiter = TokenBucketLimiter(global_per_minute=Config.SHEETS_QUOTA_PER_MINUTE / Config.WORKERS)
+    return _shared_limiter
@@ -0,0 +1,302 @@
+"""Langganan /subscribe dan pengingat Deadline yang dikirim ke banyak chat.
+
+Pelanggan disimpan di StateStore (hash `subscriptions`: chat_id -> JSON daftar topik
+seperti "type:galxe" atau "network:ethereum"). Setiap hari pada REMINDER_TIME,
+ReminderScheduler mengambil airdrop yang Deadline-nya tinggal REMINDER_DAYS hari dari
+DeadlineIndex di memori, menggabungkan semua pengingat untuk satu chat menjadi satu
+pesan, lalu menyerahkannya ke NotificationQueue yang mengirim per batch sesuai batas
+Telegram (global per detik dan per chat).
+"""
+import asyncio
+import bisect
+import heapq
+import itertools
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, RetryAfter, TelegramError
+from telegram.ext import ContextTypes, JobQueue
+from src.config import Config
+from src.metrics import NOTIFICATIONS
+from src.models import Airdrop
+from src.state import StateStore
+from src.storage import AirdropRepository
+from src.utils import local_timezone, today
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTIONS = 'subscriptions'
+REMINDERS = 'reminders'
+MAX_ITEMS_PER_MESSAGE = 20  # sisanya diringkas, detail lewat /list
+
+def topic(kind: str, value: str) -> str:
+    return f'{kind}:{value.lower()}'
+
+def record_topics(record: Airdrop) -> Tuple[str, ...]:
+    return topic('type', record.type), topic('network', record.network)
+
+async def get_subscriptions(store: StateStore, chat_id: int) -> List[str]:
+    value = await store.hget(SUBSCRIPTIONS, str(chat_id))
+    return json.loads(value) if value else []
+
+async def subscribe(store: StateStore, chat_id: int, name: str) -> bool:
+    """Menambahkan topik; False jika sudah berlangganan. ValueError jika batas topik tercapai"""
+    topics = await get_subscriptions(store, chat_id)
+    if name in topics:
+        return False
+    if len(topics) >= Config.MAX_SUBSCRIPTIONS:
+        raise ValueError(f"❌ Maksimal {Config.MAX_SUBSCRIPTIONS} langganan per chat")
+    topics.append(name)
+    await store.hset(SUBSCRIPTIONS, str(chat_id), json.dumps(topics))
+    return True
+
+async def unsubscribe(store: StateStore, chat_id: int, name: Optional[str] = None) -> bool:
+    """Menghapus satu topik, atau semua jika name None; False jika tidak ada yang dihapus"""
+    topics = await get_subscriptions(store, chat_id)
+    if name is None or topics == [name]:
+        return bool(await store.hdel(SUBSCRIPTIONS, str(chat_id)))
+    if name not in topics:
+        return False
+    topics.remove(name)
+    await store.hset(SUBSCRIPTIONS, str(chat_id), json.dumps(topics))
+    return True
+
+async def load_subscribers(store: StateStore) -> Dict[str, Set[int]]:
+    """Indeks terbalik topik -> chat untuk satu putaran pengingat"""
+    subscribers: Dict[str, Set[int]] = defaultdict(set)
+    for chat_id, value in (await store.hgetall(SUBSCRIPTIONS)).items():
+        for name in json.loads(value):
+            subscribers[name].add(int(chat_id))
+    return subscribers
+
+class DeadlineIndex:
+    """Airdrop yang Deadline-nya belum lewat, diurutkan per tanggal untuk query rentang dengan bisect"""
+
+    def __init__(self):
+        self.dates: List[date] = []
+        self.records: List[Airdrop] = []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def load(self, records: Iterable[Airdrop], today: date) -> None:
+        entries = sorted(((r.due, i, r) for i, r in enumerate(records) if r.due and r.due >= today),
+                         key=lambda entry: entry[:2])
+        self.dates = [due for due, _, _ in entries]
+        self.records = [record for _, _, record in entries]
+
+    def add(self, record: Airdrop) -> None:
+        if record.due is None:
+            return
+        pos = bisect.bisect_right(self.dates, record.due)
+        self.dates.insert(pos, record.due)
+        self.records.insert(pos, record)
+
+    def prune(self, today: date) -> None:
+        """Membuang Deadline sebelum hari ini"""
+        pos = bisect.bisect_left(self.dates, today)
+        if pos:
+            del self.dates[:pos]
+            del self.records[:pos]
+
+    def between(self, start: date, end: date) -> List[Airdrop]:
+        """Airdrop dengan start <= Deadline <= end"""
+        return self.records[bisect.bisect_left(self.dates, start):bisect.bisect_right(self.dates, end)]
+
+class NotificationQueue:
+    """Antrian pesan berprioritas yang dikirim per batch.
+
+    Setiap detik paling banyak `rate` pesan dikirim bersamaan (Telegram membatasi
+    ~30 pesan/detik per bot), dan satu chat menerima paling banyak satu pesan per
+    `chat_interval` detik; pesan untuk chat yang masih ditahan disisihkan sampai
+    waktunya tanpa menghambat chat lain. Prioritas kecil dikirim lebih dulu.
+    """
+
+    def __init__(self, bot: Bot, rate: int = Config.NOTIFY_RATE_PER_SECOND,
+                 chat_interval: float = Config.NOTIFY_CHAT_INTERVAL,
+                 on_blocked: Optional[Callable[[int], Any]] = None):
+        self.bot = bot
+        self.rate = max(1, rate)
+        self.chat_interval = chat_interval
+        self.on_blocked = on_blocked  # dipanggil (async) untuk chat yang memblokir bot
+        self.heap: List[Tuple[int, int, int, str]] = []  # (prioritas, urutan, chat_id, teks)
+        self.deferred: List[Tuple[float, Tuple[int, int, int, str]]] = []  # (boleh kirim pada, item)
+        self._next_allowed: Dict[int, float] = {}
+        self._seq = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._paused_until = 0.0
+
+    def __len__(self) -> int:
+        return len(self.heap) + len(self.deferred)
+
+    def put(self, chat_id: int, text: str, priority: int = 0) -> None:
+        heapq.heappush(self.heap, (priority, next(self._seq), chat_id, text))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    async def join(self) -> None:
+        """Menunggu sampai antrian kosong"""
+        while self._task and not self._task.done():
+            await asyncio.shield(self._task)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _drain(self) -> None:
+        while self.heap or self.deferred:
+            tick = time.monotonic()
+            while self.deferred and self.deferred[0][0] <= tick:
+                heapq.heappush(self.heap, heapq.heappop(self.deferred)[1])
+            batch = []
+            while self.heap and len(batch) < self.rate:
+                item = heapq.heappop(self.heap)
+                ready_at = self._next_allowed.get(item[2], 0.0)
+                if ready_at > tick:
+                    heapq.heappush(self.deferred, (ready_at, item))
+                    continue
+                self._next_allowed[item[2]] = tick + self.chat_interval
+                batch.append(item)
+            if batch:
+                await asyncio.gather(*(self._send(item) for item in batch))
+            # Batch berikutnya paling cepat satu detik setelah batch ini dimulai
+            wake = tick + 1.0 if batch else (self.deferred[0][0] if self.deferred else tick)
+            await asyncio.sleep(max(0.0, wake - time.monotonic(), self._paused_until - time.monotonic()))
+        now = time.monotonic()
+        self._next_allowed = {chat: t for chat, t in self._next_allowed.items() if t > now}
+
+    async def _send(self, item: Tuple[int, int, int, str]) -> None:
+        _, _, chat_id, text = item
+        try:
+            await self.bot.send_message(chat_id, text)
+            NOTIFICATIONS.inc(result='sent')
+        except RetryAfter as e:
+            # Flood control berlaku untuk seluruh bot: tahan semua pengiriman lalu ulangi
+            retry_after = e.retry_after.total_seconds() if isinstance(e.retry_after, timedelta) else e.retry_after
+            logger.warning("Telegram membatasi pengiriman, jeda %s detik", retry_after)
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            heapq.heappush(self.heap, item)
+            NOTIFICATIONS.inc(result='retry')
+        except (Forbidden, BadRequest) as e:
+            if isinstance(e, BadRequest) and 'chat not found' not in str(e).lower():
+                logger.warning("Gagal mengirim pengingat ke chat %s: %s", chat_id, e)
+                NOTIFICATIONS.inc(result='error')
+                return
+            # Bot diblokir atau chat sudah tidak ada
+            logger.info("Pengingat ke chat %s gagal, langganan dihapus: %s", chat_id, e)
+            NOTIFICATIONS.inc(result='blocked')
+            if self.on_blocked:
+                await self.on_blocked(chat_id)
+        except TelegramError as e:
+            logger.warning("Gagal mengirim pengingat ke chat %s: %s", chat_id, e)
+            NOTIFICATIONS.inc(result='error')
+
+def format_reminders(items: List[Tuple[int, Airdrop]]) -> List[str]:
+    """Satu pesan (dipecah per 4000 karakter) untuk semua pengingat satu chat"""
+    items = sorted(items, key=lambda item: (item[0], item[1].nama))
+    parts = ["⏰ Pengingat Deadline airdrop:\n\n"]
+    for i, (days, record) in enumerate(items[:MAX_ITEMS_PER_MESSAGE], start=1):
+        when = "berakhir malam ini" if days <= 1 else f"tinggal {days} hari"
+        parts.append(
+            f"{i}. {record.nama} ({when}, Deadline {record.deadline})\n"
+            f"   Link: {record.link}\n"
+            f"   Type: {record.type} | Network: {record.network or 'Tidak ada'}\n\n"
+        )
+    if len(items) > MAX_ITEMS_PER_MESSAGE:
+        parts.append(f"... dan {len(items) - MAX_ITEMS_PER_MESSAGE} lainnya. Gunakan /list --deadline <tanggal> untuk detail.")
+    text = ''.join(parts)
+    return [text[i:i + 4000] for i in range(0, len(text), 4000)]
+
+class ReminderScheduler:
+    """Mengirim pengingat harian ke pelanggan topik berdasarkan DeadlineIndex.
+
+    Deadline berlaku sejak 00:00 (lihat ExpiryScheduler), jadi "tinggal 1 hari"
+    berarti airdrop berakhir malam ini. Tanggal putaran terakhir disimpan di store
+    agar restart tidak mengirim ulang pengingat hari yang sama. Dengan `shared=True`
+    indeks dimuat ulang setiap putaran karena baris dari worker lain tidak lewat
+    add listener proses ini.
+    """
+
+    def __init__(self, repository: AirdropRepository, job_queue: JobQueue, store: StateStore,
+                 shared: bool = False, queue: Optional[NotificationQueue] = None):
+        self.repository = repository
+        self.job_queue = job_queue
+        self.store = store
+        self.shared = shared
+        self.index = DeadlineIndex()
+        if queue is None:
+            queue = NotificationQueue(job_queue.application.bot, on_blocked=self._on_blocked)
+        self.queue = queue
+        self.days = sorted(set(d for d in Config.REMINDER_DAYS if d >= 1))
+        self.tz = local_timezone()
+        self.send_at = datetime.strptime(Config.REMINDER_TIME, '%H:%M').time()  # jam di zona self.tz
+        self._started = False
+        repository.add_listeners.append(self._on_added)
+
+    async def start(self) -> None:
+        """Memuat indeks, menjadwalkan job harian, dan mengejar putaran hari ini jika terlewat"""
+        now = datetime.now(self.tz)
+        today = now.date()
+        self.index.load(await self.repository.list_active(), today)
+        logger.info("Pengingat: %d deadline dipantau", len(self.index))
+        if not self._started:
+            # Jam tanpa tzinfo dianggap UTC oleh JobQueue
+            self.job_queue.run_daily(self._run, time=self.send_at.replace(tzinfo=self.tz), name='reminders')
+            self._started = True
+        if now.time() >= self.send_at:
+            await self.run_once(today)
+
+    async def stop(self) -> None:
+        await self.queue.stop()
+
+    def _on_added(self, key: Any, record: Airdrop) -> None:
+        if record.status != 'Ended':
+            self.index.add(record)
+
+    async def _on_blocked(self, chat_id: int) -> None:
+        await unsubscribe(self.store, chat_id)
+
+    async def _run(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        try:
+            await self.run_once(today())
+        except Exception as e:
+            logger.error("Gagal mengirim pengingat: %s", e, exc_info=True)
+
+    async def run_once(self, today: date) -> int:
+        """Mengantrekan pengingat hari ini; mengembalikan jumlah chat yang dikirimi.
+
+        Putaran yang sudah berjalan untuk `today` (mis. sebelum restart) tidak diulang.
+        """
+        if not self.days or await self.store.hget(REMINDERS, 'last_run') == today.isoformat():
+            return 0
+        if self.shared:
+            self.index.load(await self.repository.list_active(), today)
+        else:
+            self.index.prune(today)
+        subscribers = await load_subscribers(self.store)
+        due: Dict[int, List[Tuple[int, Airdrop]]] = defaultdict(list)
+        wanted = set(self.days)
+        if subscribers:
+            for record in self.index.between(today + timedelta(days=self.days[0]), today + timedelta(days=self.days[-1])):
+                days = (record.due - today).days
+                if days not in wanted or record.status == 'Ended':
+                    continue
+                chats = set().union(*(subscribers.get(name, ()) for name in record_topics(record)))
+                for chat_id in chats:
+                    due[chat_id].append((days, record))
+        for chat_id, items in due.items():
+            priority = min(days for days, _ in items)
+            for text in format_reminders(items):
+                self.queue.put(chat_id, text, priority)
+        await self.store.hset(REMINDERS, 'last_run', today.isoformat())
+        logger.info("Pengingat: %d chat diantrekan", len(due))
+        return len(due)
@@ -0,0 +1,265 @@
+"""Pencarian /search dari memori: inverted index atas Nama, Reward, Network, dan Type.
+
+Setiap kata di query dicocokkan secara persis, sebagai awalan ("zk" -> "zksync"), atau
+dengan salah ketik satu huruf ("galxy" -> "galxe", lewat kamus varian hapus-satu-huruf).
+Semua kata harus cocok. Skor adalah jumlah bobot kolom dikali kualitas kecocokan, lalu
+hasil diurutkan dengan Deadline terdekat lebih dulu. Rentang Deadline (--after/--before)
+dijawab dengan bisect atas daftar tanggal yang terurut.
+"""
+import asyncio
+import bisect
+import heapq
+import logging
+import re
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from src.config import Config
+from src.models import Airdrop
+from src.storage import AirdropRepository, get_repository
+from src.utils import today
+
+logger = logging.getLogger(__name__)
+
+# Atribut Airdrop yang diindeks -> bobot skor
+FIELD_WEIGHTS = {'nama': 3.0, 'type': 2.0, 'network': 2.0, 'reward': 1.0}
+EXACT, PREFIX, FUZZY = 1.0, 0.6, 0.4
+MAX_EXPANSIONS = 50  # kata kosakata per awalan query
+MIN_FUZZY_LENGTH = 4
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+def _deletes(term: str) -> Set[str]:
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """True jika a dan b berbeda paling banyak satu sisipan, hapusan, penggantian, atau tukar posisi"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        return len(diff) == 1 or (len(diff) == 2 and diff[1] == diff[0] + 1
+                                  and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]])
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    return any(longer[:i] + longer[i + 1:] == shorter for i in range(len(longer)))
+
+class SearchQuery(NamedTuple):
+    terms: Tuple[str, ...]
+    after: Optional[date] = None  # Deadline >= after
+    before: Optional[date] = None  # Deadline <= before
+
+class SearchIndex:
+    """Inverted index dan indeks tanggal atas daftar Airdrop; id dokumen = posisi di self.docs"""
+
+    def __init__(self):
+        self.docs: List[Airdrop] = []
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.vocab: List[str] = []  # terurut, untuk pencarian awalan
+        self.deletes: Dict[str, Set[str]] = defaultdict(set)  # varian hapus-satu-huruf -> kata
+        self.dates: List[date] = []
+        self.date_docs: List[int] = []  # sejajar dengan self.dates
+
+    @classmethod
+    def build(cls, records: Iterable[Airdrop]) -> 'SearchIndex':
+        """Membangun indeks sekaligus; kosakata dan tanggal diurutkan sekali di akhir"""
+        index = cls()
+        dated: List[Tuple[date, int]] = []
+        for record in records:
+            doc = index._index(record)
+            if record.due:
+                dated.append((record.due, doc))
+        index.vocab = sorted(index.postings)
+        for term in index.vocab:
+            index._add_deletes(term)
+        dated.sort()
+        index.dates = [due for due, _ in dated]
+        index.date_docs = [doc for _, doc in dated]
+        return index
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def _index(self, record: Airdrop) -> int:
+        doc = len(self.docs)
+        self.docs.append(record)
+        postings = self.postings
+        for attr, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(getattr(record, attr)):
+                entry = postings[term]
+                entry[doc] = max(entry.get(doc, 0.0), weight)
+        return doc
+
+    def _add_deletes(self, term: str) -> None:
+        if len(term) >= MIN_FUZZY_LENGTH and not term.isdigit():
+            for variant in _deletes(term):
+                self.deletes[variant].add(term)
+
+    def add(self, record: Airdrop) -> None:
+        """Menambahkan satu baris baru tanpa membangun ulang indeks"""
+        new_terms = {t for attr in FIELD_WEIGHTS for t in tokenize(getattr(record, attr)) if t not in self.postings}
+        doc = self._index(record)
+        for term in new_terms:
+            bisect.insort(self.vocab, term)
+            self._add_deletes(term)
+        if record.due:
+            pos = bisect.bisect_right(self.dates, record.due)
+            self.dates.insert(pos, record.due)
+            self.date_docs.insert(pos, doc)
+
+    def expand(self, term: str) -> Dict[str, float]:
+        """Kata kosakata yang cocok dengan satu kata query beserta faktor kualitasnya"""
+        matches: Dict[str, float] = {}
+        if term in self.postings:
+            matches[term] = EXACT
+        start = bisect.bisect_left(self.vocab, term)
+        for candidate in self.vocab[start:start + MAX_EXPANSIONS + 1]:
+            if not candidate.startswith(term):
+                break
+            matches.setdefault(candidate, PREFIX)
+        if not matches and len(term) >= MIN_FUZZY_LENGTH:
+            candidates = set(self.deletes.get(term, ()))
+            for variant in _deletes(term):
+                if variant in self.postings:
+                    candidates.add(variant)
+                candidates |= self.deletes.get(variant, set())
+            for candidate in candidates:
+                if _within_one_edit(term, candidate):
+                    matches[candidate] = FUZZY
+        return matches
+
+    def _scores(self, matches: Dict[str, float]) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for candidate, factor in matches.items():
+            for doc, weight in self.postings[candidate].items():
+                score = weight * factor
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def _date_range(self, after: Optional[date], before: Optional[date]) -> List[int]:
+        lo = bisect.bisect_left(self.dates, after) if after else 0
+        hi = bisect.bisect_right(self.dates, before) if before else len(self.dates)
+        return self.date_docs[lo:hi]
+
+    def search(self, query: SearchQuery, today: date, limit: int = 10) -> Tuple[List[Airdrop], int]:
+        """Hasil teratas (skor tertinggi, lalu Deadline terdekat) dan jumlah semua yang cocok.
+
+        Hanya airdrop yang masih berjalan: Status bukan Ended dan Deadline belum tiba.
+        """
+        ranged = query.after is not None or query.before is not None
+        if query.terms:
+            # Kata dengan posting paling sedikit dihitung penuh; kata lain hanya dicek untuk kandidatnya
+            expansions = sorted((self.expand(term) for term in query.terms),
+                                key=lambda matches: sum(len(self.postings[c]) for c in matches))
+            scores = self._scores(expansions[0])
+            for matches in expansions[1:]:
+                postings = [(self.postings[c], factor) for c, factor in matches.items()]
+                if len(postings) == 1:
+                    weights, factor = postings[0]
+                    scores = {doc: score + weights[doc] * factor for doc, score in scores.items() if doc in weights}
+                    continue
+                narrowed = {}
+                for doc, score in scores.items():
+                    best = max([weights.get(doc, 0.0) * factor for weights, factor in postings], default=0.0)
+                    if best:
+                        narrowed[doc] = score + best
+                scores = narrowed
+            if ranged:
+                after = query.after or date.min
+                before = query.before or date.max
+                scores = {doc: s for doc, s in scores.items() if self.docs[doc].due and after <= self.docs[doc].due <= before}
+        elif ranged:
+            scores = dict.fromkeys(self._date_range(query.after, query.before), 0.0)
+        else:
+            return [], 0
+        docs = self.docs
+        live = [doc for doc in scores
+                if docs[doc].status != 'Ended' and (docs[doc].due is None or docs[doc].due > today)]
+        top = heapq.nsmallest(limit, live, key=lambda doc: (-scores[doc], docs[doc].due or date.max, doc))
+        return [docs[doc] for doc in top], len(live)
+
+class AirdropSearch:
+    """SearchIndex yang dijaga tetap mutakhir untuk satu repository.
+
+    Baris baru masuk lewat add listener. Perubahan lain (Status, baris dari luar
+    bot atau worker lain) terlihat dari data_version; indeks lalu dibangun ulang di
+    latar belakang paling sering sekali per INDEX_TTL_SECONDS, sementara query tetap
+    dijawab dari indeks lama.
+    """
+
+    def __init__(self, repository: AirdropRepository, ttl: float = Config.INDEX_TTL_SECONDS):
+        self.repository = repository
+        self.ttl = ttl
+        self.index: Optional[SearchIndex] = None
+        self.version: Any = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+        self._rebuild: Optional[asyncio.Task] = None
+        self._added_during_build: Optional[List[Airdrop]] = None
+        repository.add_listeners.append(self._on_added)
+
+    def _on_added(self, key: Any, record: Airdrop) -> None:
+        if self._added_during_build is not None:
+            self._added_during_build.append(record)
+        if self.index is not None:
+            self.index.add(record)
+
+    async def refresh(self) -> None:
+        """Membangun indeks dari semua airdrop Active"""
+        async with self._lock:
+            self._added_during_build = []
+            try:
+                version = await self.repository.data_version()
+                records = await self.repository.list_active()
+                start = time.perf_counter()
+                index = await asyncio.to_thread(SearchIndex.build, records)
+                # Baris yang tersimpan selagi indeks dibangun belum tentu ada di snapshot
+                known = {(r.link, r.timestamp) for r in records}
+                for record in self._added_during_build:
+                    if (record.link, record.timestamp) not in known:
+                        index.add(record)
+            finally:
+                self._added_during_build = None
+            self.index, self.version, self._built_at = index, version, time.monotonic()
+            logger.info("Indeks pencarian dibangun: %d baris, %d kata dalam %.0f ms",
+                        len(index), len(index.vocab), (time.perf_counter() - start) * 1000)
+
+    def _refresh_task(self) -> asyncio.Task:
+        """Satu pembangunan indeks sekaligus; pemanggil lain menunggu task yang sama"""
+        if self._rebuild is None or self._rebuild.done():
+            self._rebuild = asyncio.create_task(self.refresh())
+            self._rebuild.add_done_callback(self._log_failure)
+        return self._rebuild
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Gagal membangun indeks pencarian: %s", task.exception())
+
+    async def start(self) -> None:
+        await asyncio.shield(self._refresh_task())
+
+    async def search(self, query: SearchQuery, limit: int = 10) -> Tuple[List[Airdrop], int]:
+        if self.index is None:
+            await asyncio.shield(self._refresh_task())
+        elif time.monotonic() - self._built_at >= self.ttl and (self._rebuild is None or self._rebuild.done()):
+            if await self.repository.data_version() != self.version:
+                self._refresh_task()
+            else:
+                self._built_at = time.monotonic()
+        return self.index.search(query, today(), limit)
+
+_shared_search: Optional[AirdropSearch] = None
+
+def get_search() -> AirdropSearch:
+    """Mendapatkan indeks pencarian bersama untuk seluruh proses"""
+    global _shared_search
+    if _shared_search is None:
+        _shared_search = AirdropSearch(get_repository())
+    return _shared_search
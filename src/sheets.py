@@ -1,96 +1,607 @@
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from datetime import datetime
+import asyncio
+import functools
+import heapq
+import itertools
+import json
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from typing import List, Optional
+import threading
+import time
+import re
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
 from src.config import Config
+from src.metrics import (
+    ROWS_SCANNED, SHEETS_BREAKER, SHEETS_CALLS, SHEETS_ERRORS, SHEETS_LATENCY, SHEETS_QUEUE_WAIT, SHEETS_RETRIES
+)
+from src.models import HEADERS, Airdrop, parse_sheet, schema_for
+from src.utils import today
+
+# gspread dan oauth2client (~0,25 detik) baru diimpor saat Sheets pertama kali dipakai
+if TYPE_CHECKING:
+    import gspread
 
 logger = logging.getLogger(__name__)
 
+# Kolom yang ditampilkan /list; hanya ini yang diminta pada query sisi server
+LIST_COLUMNS = ['Nama', 'Link', 'Type', 'Deadline', 'Network']
+
 class GoogleSheetsClient:
-    def __init__(self):
+    def __init__(self, client: Optional['gspread.Client'] = None):
         self.scope = [
             'https://spreadsheets.google.com/feeds',
             'https://www.googleapis.com/auth/drive'
         ]
-        self.client = self._authorize()
+        self._lock = threading.RLock()
+        self._spreadsheet: Optional['gspread.Spreadsheet'] = None
+        self._worksheet: Optional['gspread.Worksheet'] = None
+        # Header sheet -> (huruf kolom, tipe Query Visualization), lihat _columns
+        self._columns: Optional[Dict[str, Tuple[str, str]]] = None
+        self._columns_at = 0.0
+        self._authorized_at = 0.0
+        # Client yang diberikan dari luar (mis. benchmark) tidak diautentikasi ulang.
+        # Tanpa client, autentikasi ditunda sampai panggilan API pertama.
+        self._owns_auth = client is None
+        self.client = client
 
-    def _authorize(self) -> gspread.Client:
+    def _authorize(self) -> 'gspread.Client':
         """Mengautentikasi ke Google Sheets"""
         try:
+            import gspread
+            from oauth2client.service_account import ServiceAccountCredentials
             creds = ServiceAccountCredentials.from_json_keyfile_name(
                 Config.CREDENTIALS_PATH, self.scope
             )
-            return gspread.authorize(creds)
+            client = gspread.authorize(creds)
+            self._authorized_at = time.monotonic()
+            return client
         except Exception as e:
             logger.critical("Gagal mengautentikasi Google Sheets: %s", e, exc_info=True)
             raise
 
-    def get_worksheet(self) -> gspread.Worksheet:
-        """Mendapatkan worksheet utama"""
+    def _ensure_authorized(self) -> None:
+        """Mengautentikasi saat pertama dipakai dan memperbarui sesi sebelum token kedaluwarsa"""
+        with self._lock:
+            if self.client is None:
+                self.client = self._authorize()
+            elif self._owns_auth and time.monotonic() - self._authorized_at >= Config.TOKEN_REFRESH_SECONDS:
+                logger.info("Memperbarui sesi Google Sheets")
+                self.client = self._authorize()
+                self._spreadsheet = None
+                self._worksheet = None
+                self._columns = None
+
+    def invalidate(self) -> None:
+        """Menghapus cache spreadsheet, worksheet, dan kolom"""
+        with self._lock:
+            self._spreadsheet = None
+            self._worksheet = None
+            self._columns = None
+
+    def get_spreadsheet(self) -> 'gspread.Spreadsheet':
+        """Mendapatkan spreadsheet (di-cache)"""
+        with self._lock:
+            self._ensure_authorized()
+            if self._spreadsheet is None:
+                self._spreadsheet = self._api('open_by_key', lambda: self.client.open_by_key(Config.SPREADSHEET_ID))
+            return self._spreadsheet
+
+    def get_worksheet(self) -> 'gspread.Worksheet':
+        """Mendapatkan worksheet utama (di-cache)"""
+        import gspread
+        with self._lock:
+            sh = self.get_spreadsheet()
+            if self._worksheet is None:
+                try:
+                    self._worksheet = self._api('worksheet', lambda: sh.worksheet(Config.SHEET_NAME))
+                except gspread.exceptions.WorksheetNotFound:
+                    logger.warning("Worksheet tidak ditemukan, membuat baru")
+                    self._worksheet = self._create_worksheet(sh)
+            return self._worksheet
+
+    def _api(self, method: str, func: Callable[[], Any]) -> Any:
+        """Menjalankan satu panggilan API gspread sambil mencatat jumlah, latensi, dan error"""
+        import gspread
+        start = time.perf_counter()
         try:
-            sh = self.client.open_by_key(Config.SPREADSHEET_ID)
-            return sh.worksheet(Config.SHEET_NAME)
-        except gspread.exceptions.WorksheetNotFound:
-            logger.warning("Worksheet tidak ditemukan, membuat baru")
-            return self._create_worksheet(sh)
+            return func()
+        except gspread.exceptions.APIError as e:
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            SHEETS_ERRORS.inc(method=method, status=str(status))
+            raise
+        finally:
+            SHEETS_CALLS.inc(method=method)
+            SHEETS_LATENCY.observe(time.perf_counter() - start, method=method)
 
-    def _create_worksheet(self, spreadsheet: gspread.Spreadsheet) -> gspread.Worksheet:
+    def _with_worksheet(self, method: str, func: Callable[['gspread.Worksheet'], Any]) -> Any:
+        """Menjalankan func pada worksheet; cache direset dan dicoba ulang sekali jika 404"""
+        import gspread
+        try:
+            worksheet = self.get_worksheet()
+            return self._api(method, lambda: func(worksheet))
+        except (gspread.exceptions.APIError, gspread.exceptions.WorksheetNotFound) as e:
+            if not _is_not_found(e):
+                raise
+            logger.warning("Worksheet tidak ditemukan di cache, memuat ulang")
+            self.invalidate()
+            worksheet = self.get_worksheet()
+            return self._api(method, lambda: func(worksheet))
+
+    def get_all_values(self) -> List[List[str]]:
+        """Mengambil semua nilai dari worksheet utama"""
+        return self._with_worksheet('get_all_values', lambda ws: ws.get_all_values())
+
+    def _gviz(self, query: str) -> Tuple[List[dict], List[List[Any]]]:
+        """Menjalankan query Google Visualization pada worksheet utama; hasil (kolom, baris nilai mentah)"""
+        url = f'https://docs.google.com/spreadsheets/d/{Config.SPREADSHEET_ID}/gviz/tq'
+        params = {'tqx': 'out:json', 'sheet': Config.SHEET_NAME, 'headers': 1, 'tq': query}
+        self._ensure_authorized()
+        # gspread 6 menyimpan sesi di http_client, gspread 5 langsung di Client
+        http = getattr(self.client, 'http_client', self.client)
+        response = self._api('gviz_query', lambda: http.request('get', url, params=params))
+        return _parse_gviz(response.text)
+
+    def _columns_by_header(self) -> Dict[str, Tuple[str, str]]:
+        """Header sheet -> (huruf kolom, tipe), dibaca dari baris header sheet yang sebenarnya.
+
+        Tipe ditentukan Google per kolom (mis. Deadline yang diketik manual menjadi 'date'),
+        jadi di-cache selama INDEX_TTL_SECONDS saja.
+        """
+        with self._lock:
+            if self._columns is None or time.monotonic() - self._columns_at >= Config.INDEX_TTL_SECONDS:
+                cols, _ = self._gviz('limit 0')
+                columns: Dict[str, Tuple[str, str]] = {}
+                for col in cols:
+                    columns.setdefault(col.get('label', '').strip(), (col['id'], col.get('type', 'string')))
+                self._columns, self._columns_at = columns, time.monotonic()
+            return self._columns
+
+    def query_active(
+        self,
+        type_: Optional[str] = None,
+        network: Optional[str] = None,
+        deadline: Optional[str] = None,
+        limit: int = 5,
+        offset: int = 0
+    ) -> Tuple[List[Airdrop], int]:
+        """Mengambil satu halaman airdrop Active beserta total, difilter di sisi server.
+
+        Hanya kolom LIST_COLUMNS dan baris halaman yang ditransfer; atribut lain berisi ''.
+        Query Visualization membaca sel yang tipenya berbeda dari mayoritas kolom sebagai
+        null, jadi hasil bisa kurang lengkap untuk kolom campuran; jalur ini hanya dipakai
+        selagi indeks lokal belum dimuat.
+        """
+        columns = self._columns_by_header()
+        missing = [name for name in {'Status', 'Type', 'Network', 'Deadline', *LIST_COLUMNS} if name not in columns]
+        if missing:
+            raise ValueError(f"Kolom tidak ada di header sheet: {', '.join(sorted(missing))}")
+        letter = {name: columns[name][0] for name in columns}
+        where = [f"{letter['Status']} = 'Active'"]
+        if type_:
+            where.append(f"lower({letter['Type']}) = '{_quote(type_.lower())}'")
+        if network:
+            where.append(f"lower({letter['Network']}) = '{_quote(network.lower())}'")
+        if deadline:
+            where.append(_date_equals(*columns['Deadline'], _quote(deadline)))
+        where_sql = ' and '.join(where)
+
+        select = ', '.join(letter[name] for name in LIST_COLUMNS)
+        cols, page = self._gviz(f'select {select} where {where_sql} limit {int(limit)} offset {int(offset)}')
+        _, count = self._gviz(f"select count({letter['Nama']}) where {where_sql}")
+        total = int(count[0][0]) if count and count[0] and count[0][0] is not None else 0
+
+        types = [col.get('type', 'string') for col in cols]
+        records = schema_for(LIST_COLUMNS).parse([[_gviz_text(v, t) for v, t in zip(row, types)] for row in page])
+        ROWS_SCANNED.inc(len(records), source='gviz')
+        return records, total
+
+    def _create_worksheet(self, spreadsheet: 'gspread.Spreadsheet') -> 'gspread.Worksheet':
         """Membuat worksheet baru dengan header"""
-        headers = ['Nama', 'Twitter', 'Discord', 'Telegram', 'Link', 'Type', 'Deadline', 'Reward', 'User ID', 'Status', 'Network', 'Timestamp']
-        worksheet = spreadsheet.add_worksheet(Config.SHEET_NAME, rows=1000, cols=15)
-        worksheet.append_row(headers)
+        worksheet = self._api('add_worksheet', lambda: spreadsheet.add_worksheet(Config.SHEET_NAME, rows=1000, cols=15))
+        self._api('append_row', lambda: worksheet.append_row(HEADERS))
         return worksheet
 
-    def backup(self) -> Optional[str]:
-        """Membuat backup spreadsheet"""
-        try:
-            sh = self.client.open_by_key(Config.SPREADSHEET_ID)
-            backup_name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            sh.duplicate_sheet(
-                source_sheet_id=sh.worksheet(Config.SHEET_NAME).id,
-                new_sheet_name=backup_name
-            )
-            logger.info("Backup berhasil: %s", backup_name)
-            return backup_name
-        except Exception as e:
-            logger.error("Gagal membuat backup: %s", e, exc_info=True)
-            return None
+    def append_rows(self, rows: List[List[str]]) -> dict:
+        """Menambahkan banyak baris yang sudah disiapkan dalam satu panggilan API"""
+        return self._with_worksheet('append_rows', lambda ws: ws.append_rows(rows))
 
-    def append_row(self, worksheet: gspread.Worksheet, values: List[str]) -> bool:
-        """Menambahkan baris ke worksheet dengan pengecekan Deadline"""
-        try:
-            deadline = values[6]  # Indeks Deadline
-            if deadline and datetime.strptime(deadline, '%Y-%m-%d') < datetime.now():
-                values[9] = 'Ended'  # Indeks Status
-            else:
-                values[9] = values[9] or 'Active'  # Pastikan Status default Active
-            
-            values.append(datetime.now().isoformat())  # Tambah timestamp
-            worksheet.append_row(values)
-            logger.info("Data berhasil disimpan: %s", values)
-            return True
-        except gspread.exceptions.APIError as e:
-            logger.error("API Error saat menyimpan data: %s", e, exc_info=True)
-            return False
+    def batch_update(self, updates: List[dict]) -> None:
+        """Menulis beberapa range sekaligus"""
+        self._with_worksheet('batch_update', lambda ws: ws.batch_update(updates))
 
     def update_status(self) -> None:
-        """Memperbarui status semua entry berdasarkan Deadline"""
+        """Memperbarui status semua entry berdasarkan Deadline dengan scan penuh (pembanding ExpiryScheduler di bench)"""
+        _, records = parse_sheet(self.get_all_values())
+        ROWS_SCANNED.inc(len(records), source='update_status')
+
+        current = today()
+        expired = [
+            (i, 'Ended')
+            for i, record in enumerate(records, start=2)  # Mulai dari baris 2 (setelah header)
+            if record.status != 'Ended' and record.is_due(current)
+        ]
+
+        if expired:
+            self.batch_update(status_updates(expired))
+            logger.info("Status diperbarui untuk %d baris", len(expired))
+
+
+def _column_letter(name: str) -> str:
+    return chr(ord('A') + HEADERS.index(name))
+
+_GVIZ_DATE = re.compile(r'Date\((\d+),(\d+),(\d+)')
+
+def _parse_gviz(text: str) -> Tuple[List[dict], List[List[Any]]]:
+    """Respons JSONP Query Visualization menjadi (kolom, baris nilai mentah)"""
+    payload = json.loads(text[text.index('(') + 1:text.rindex(')')])
+    if payload.get('status') == 'error':
+        messages = [e.get('detailed_message') or e.get('message', '') for e in payload.get('errors', [])]
+        raise ValueError(f"Query Visualization gagal: {'; '.join(messages)}")
+    table = payload.get('table', {})
+    rows = [[cell.get('v') if cell else None for cell in row.get('c', [])] for row in table.get('rows', [])]
+    return table.get('cols', []), rows
+
+def _gviz_text(value: Any, type_: str) -> str:
+    """Nilai mentah gviz sebagai teks sel; tanggal menjadi YYYY-MM-DD"""
+    if value is None:
+        return ''
+    if type_ in ('date', 'datetime'):
+        match = _GVIZ_DATE.match(str(value))
+        if match:
+            year, month, day = (int(g) for g in match.groups())
+            return f'{year:04d}-{month + 1:02d}-{day:02d}'  # bulan gviz dimulai dari 0
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _date_equals(letter: str, type_: str, value: str) -> str:
+    """Kondisi kolom tanggal = value (YYYY-MM-DD) sesuai tipe kolom menurut Google"""
+    if type_ == 'date':
+        return f"{letter} = date '{value}'"
+    if type_ == 'datetime':
+        return f"toDate({letter}) = date '{value}'"
+    if type_ == 'string':
+        return f"{letter} = '{value}'"
+    raise ValueError(f"Tipe kolom Deadline tidak didukung: {type_}")
+
+def _quote(value: str) -> str:
+    """Query Visualization tidak mendukung escape, jadi tanda kutip dibuang"""
+    return value.replace("'", '').replace('"', '').replace('\\', '')
+
+def status_updates(rows: Iterable[Tuple[int, str]]) -> List[dict]:
+    """Mengelompokkan (baris sheet, status) menjadi range kolom Status yang bersebelahan"""
+    col = _column_letter('Status')
+    updates: List[dict] = []
+    start = prev = None
+    values: List[List[str]] = []
+    for row, status in sorted(rows):
+        if prev is not None and row == prev + 1:
+            values.append([status])
+        else:
+            if start is not None:
+                updates.append({'range': f'{col}{start}:{col}{prev}', 'values': values})
+            start, values = row, [[status]]
+        prev = row
+    if start is not None:
+        updates.append({'range': f'{col}{start}:{col}{prev}', 'values': values})
+    return updates
+
+def first_updated_row(response: Any) -> Optional[int]:
+    """Mengambil nomor baris pertama dari respons append (mis. 'airdropbot!A10:L12')"""
+    try:
+        match = re.search(r'![A-Z]+(\d+)', response['updates']['updatedRange'])
+        return int(match.group(1)) if match else None
+    except (KeyError, TypeError):
+        return None
+
+def _status_code(e: Exception) -> Optional[int]:
+    return getattr(getattr(e, 'response', None), 'status_code', None)
+
+def is_retryable(e: Exception) -> bool:
+    """True jika error bersifat sementara (429, 5xx, timeout, jaringan/DNS, atau circuit breaker terbuka)"""
+    import requests
+    from google.auth.exceptions import TransportError
+    # OSError mencakup ConnectionError dan socket.gaierror
+    if isinstance(e, (asyncio.TimeoutError, SheetsUnavailable, OSError, requests.ConnectionError, requests.Timeout,
+                      TransportError)):
+        return True
+    status = _status_code(e)
+    return status == 429 or (status is not None and status >= 500)
+
+def is_permanent(e: Exception) -> bool:
+    """True hanya jika Sheets pasti menolak permintaan (APIError 4xx selain 401/403/429).
+
+    Error lain, termasuk jaringan, DNS, dan refresh token, bisa pulih sendiri.
+    """
+    import gspread
+    status = _status_code(e)
+    return (isinstance(e, gspread.exceptions.APIError) and status is not None
+            and 400 <= status < 500 and status not in (401, 403, 429))
+
+def _is_not_found(e: Exception) -> bool:
+    """True jika error menandakan spreadsheet/worksheet sudah tidak ada"""
+    import gspread
+    if isinstance(e, gspread.exceptions.WorksheetNotFound):
+        return True
+    return _status_code(e) == 404
+
+# Prioritas antrian Sheets: angka kecil dijalankan lebih dulu
+PRIORITY_INTERACTIVE = 0  # permintaan user (/list, cek duplikat)
+PRIORITY_WRITE = 1  # antrian tulis, mirror, dan penjadwal kedaluwarsa
+PRIORITY_BATCH = 2  # job terjadwal (backup, bootstrap)
+PRIORITY_NAMES = ('interactive', 'write', 'batch')
+
+class SheetsQuota:
+    """Sisa kuota baca/tulis Google Sheets dalam jendela 60 detik terakhir"""
+
+    WINDOW = 60.0
+
+    def __init__(self, read_per_minute: int, write_per_minute: int):
+        self.limits = {'read': max(1, read_per_minute), 'write': max(1, write_per_minute)}
+        self.calls: Dict[str, Deque[float]] = {kind: deque() for kind in self.limits}
+        self.paused_until = {kind: 0.0 for kind in self.limits}
+
+    def _trim(self, kind: str, now: float) -> Deque[float]:
+        calls = self.calls[kind]
+        while calls and calls[0] <= now - self.WINDOW:
+            calls.popleft()
+        return calls
+
+    def remaining(self, kind: str, now: Optional[float] = None) -> int:
+        now = time.monotonic() if now is None else now
+        return max(0, self.limits[kind] - len(self._trim(kind, now)))
+
+    def delay(self, kind: str, cost: int = 1, now: Optional[float] = None) -> float:
+        """Detik sampai `cost` panggilan boleh dijalankan (0 jika sekarang)"""
+        now = time.monotonic() if now is None else now
+        if self.paused_until[kind] > now:
+            return self.paused_until[kind] - now
+        calls = self._trim(kind, now)
+        excess = len(calls) + min(cost, self.limits[kind]) - self.limits[kind]
+        if excess <= 0:
+            return 0.0
+        return calls[excess - 1] + self.WINDOW - now
+
+    def take(self, kind: str, cost: int = 1, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self.calls[kind].extend([now] * cost)
+
+    def pause(self, kind: str, seconds: float) -> None:
+        """Menahan semua panggilan jenis ini setelah Sheets membalas 429"""
+        self.paused_until[kind] = max(self.paused_until[kind], time.monotonic() + seconds)
+
+class _Job:
+    __slots__ = ('priority', 'seq', 'kind', 'cost', 'func', 'timeout', 'future', 'queued_at')
+
+    def __init__(self, priority: int, seq: int, kind: str, cost: int, func: Callable[[], Any],
+                 timeout: float, future: 'asyncio.Future[Any]'):
+        self.priority = priority
+        self.seq = seq
+        self.kind = kind
+        self.cost = cost
+        self.func = func
+        self.timeout = timeout
+        self.future = future
+        self.queued_at = time.monotonic()
+
+    def __lt__(self, other: '_Job') -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+class SheetsScheduler:
+    """Antrian panggilan Sheets berprioritas dengan batas konkurensi dan kuota per menit.
+
+    Setiap jenis kuota (read/write) punya heap sendiri. Job berikutnya adalah
+    job berprioritas tertinggi yang kuotanya tersedia; jika semua jenis habis,
+    antrian dibangunkan lagi saat kuota tertua keluar dari jendela.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, max_concurrency: int, quota: SheetsQuota):
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.quota = quota
+        self.queues: Dict[str, List[_Job]] = {kind: [] for kind in quota.limits}
+        self.running = 0
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, kind: str, func: Callable[[], Any], priority: int = PRIORITY_INTERACTIVE,
+               cost: int = 1, timeout: float = Config.SHEETS_TIMEOUT) -> 'asyncio.Future[Any]':
+        """Mengantrekan func; future selesai dengan hasilnya. Timeout dihitung sejak job mulai berjalan"""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.queues[kind], _Job(priority, next(self._seq), kind, cost, func, timeout, future))
+        self._pump()
+        return future
+
+    def pending(self) -> int:
+        return sum(not job.future.done() for queue in self.queues.values() for job in queue)
+
+    def _pump(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        while self.running < self.max_concurrency:
+            job, wait = self._next_job()
+            if job is None:
+                if wait is not None:
+                    self._timer = asyncio.get_running_loop().call_later(wait, self._pump)
+                return
+            self._start(job)
+
+    def _next_job(self) -> Tuple[Optional[_Job], Optional[float]]:
+        best: Optional[_Job] = None
+        wait: Optional[float] = None
+        for kind, queue in self.queues.items():
+            # Job yang dibatalkan pemanggilnya selagi mengantre dibuang
+            while queue and queue[0].future.done():
+                heapq.heappop(queue)
+            if not queue:
+                continue
+            delay = self.quota.delay(kind, queue[0].cost)
+            if delay > 0:
+                wait = delay if wait is None else min(wait, delay)
+            elif best is None or queue[0] < best:
+                best = queue[0]
+        if best is not None:
+            heapq.heappop(self.queues[best.kind])
+        return best, wait
+
+    def _start(self, job: _Job) -> None:
+        self.running += 1
+        self.quota.take(job.kind, job.cost)
+        SHEETS_QUEUE_WAIT.observe(time.monotonic() - job.queued_at, priority=PRIORITY_NAMES[job.priority])
+        task = asyncio.get_running_loop().create_task(self._execute(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, job: _Job) -> None:
+        """Jika timeout, thread tetap berjalan sampai selesai tetapi hasilnya diabaikan"""
         try:
-            worksheet = self.get_worksheet()
-            all_data = worksheet.get_all_values()
-            headers = all_data[0]
-            deadline_idx = headers.index('Deadline')
-            status_idx = headers.index('Status')
-            
-            updates = []
-            for i, row in enumerate(all_data[1:], start=2):  # Mulai dari baris 2 (setelah header)
-                deadline = row[deadline_idx]
-                if deadline and datetime.strptime(deadline, '%Y-%m-%d') < datetime.now() and row[status_idx] != 'Ended':
-                    updates.append({'range': f'J{i}', 'values': [['Ended']]})
-            
-            if updates:
-                worksheet.batch_update(updates)
-                logger.info("Status diperbarui untuk %d baris", len(updates))
+            inner = asyncio.get_running_loop().run_in_executor(self.executor, job.func)
+            result = await asyncio.wait_for(inner, job.timeout)
         except Exception as e:
-            logger.error("Gagal memperbarui status: %s", e, exc_info=True)
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            if not job.future.done():
+                job.future.cancel()
+            self.running -= 1
+            self._pump()
+
+class SheetsUnavailable(Exception):
+    """Circuit breaker terbuka: Sheets dianggap tidak sehat dan tidak dipanggil"""
+
+class CircuitBreaker:
+    """Berhenti memanggil Sheets setelah beberapa error sementara berturut-turut.
+
+    Setelah `cooldown` detik satu panggilan percobaan dibiarkan lewat; jika
+    berhasil breaker tertutup lagi, jika gagal breaker tetap terbuka.
+    """
+
+    def __init__(self, threshold: int = Config.SHEETS_BREAKER_THRESHOLD,
+                 cooldown: float = Config.SHEETS_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def check(self) -> None:
+        """SheetsUnavailable jika breaker terbuka dan belum waktunya mencoba lagi"""
+        if self.opened_at is None:
+            return
+        now = time.monotonic()
+        if now - self.opened_at < self.cooldown:
+            raise SheetsUnavailable(f"Google Sheets tidak tersedia, dicoba lagi dalam {self.opened_at + self.cooldown - now:.0f} detik")
+        # Panggilan ini menjadi percobaan; panggilan lain menunggu cooldown berikutnya
+        self.opened_at = now
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("Google Sheets pulih, circuit breaker ditutup")
+            SHEETS_BREAKER.set(0)
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.warning("Circuit breaker Sheets dibuka setelah %d error berturut-turut", self.failures)
+                SHEETS_BREAKER.set(1)
+            self.opened_at = time.monotonic()
+
+# Executor, antrian, dan circuit breaker dipakai bersama oleh semua AsyncSheetsClient.
+# Kuota dibagi rata antar worker seperti rate limiter global.
+_executor = ThreadPoolExecutor(max_workers=Config.SHEETS_MAX_CONCURRENCY, thread_name_prefix='sheets')
+_scheduler = SheetsScheduler(_executor, Config.SHEETS_MAX_CONCURRENCY, SheetsQuota(
+    Config.SHEETS_READ_QUOTA_PER_MINUTE // Config.WORKERS, Config.SHEETS_WRITE_QUOTA_PER_MINUTE // Config.WORKERS
+))
+_breaker = CircuitBreaker()
+
+class AsyncSheetsClient:
+    """Facade async untuk GoogleSheetsClient agar handler tidak memblokir event loop"""
+
+    def __init__(self, client: Optional[GoogleSheetsClient] = None, timeout: float = Config.SHEETS_TIMEOUT,
+                 scheduler: Optional[SheetsScheduler] = None, breaker: Optional[CircuitBreaker] = None):
+        self.sync = client or GoogleSheetsClient()
+        self.timeout = timeout
+        self.scheduler = scheduler or _scheduler
+        self.breaker = breaker or _breaker
+
+    async def _run(
+        self,
+        method: str,
+        func: Callable[[], Any],
+        kind: str = 'read',
+        priority: int = PRIORITY_INTERACTIVE,
+        idempotent: bool = True,
+        cost: int = 1
+    ) -> Any:
+        """Menjalankan panggilan blocking lewat antrian Sheets.
+
+        Error sementara (429, 5xx, timeout) dicoba ulang dengan jeda acak (full jitter)
+        hanya jika panggilan idempoten; append tidak diulang di sini karena bisa
+        menggandakan baris (antrian tulis punya journal dan retry sendiri).
+        """
+        attempt = 0
+        while True:
+            self.breaker.check()
+            try:
+                result = await self.scheduler.submit(kind, func, priority, cost, self.timeout)
+            except Exception as e:
+                if not is_retryable(e):
+                    # Sheets menjawab (mis. 400/404), jadi tetap dianggap sehat
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                attempt += 1
+                delay = random.uniform(0, min(Config.SHEETS_RETRY_MAX_DELAY, Config.SHEETS_RETRY_BASE_DELAY * 2 ** attempt))
+                if _status_code(e) == 429:
+                    self.scheduler.quota.pause(kind, delay)
+                if not idempotent or attempt > Config.SHEETS_RETRIES or self.breaker.is_open:
+                    raise
+                SHEETS_RETRIES.inc(method=method)
+                logger.warning("%s gagal (%r), percobaan ulang %d dalam %.1f detik", method, e, attempt, delay)
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def get_worksheet(self, priority: int = PRIORITY_INTERACTIVE) -> 'gspread.Worksheet':
+        return await self._run('get_worksheet', self.sync.get_worksheet, priority=priority)
+
+    async def get_all_values(self, priority: int = PRIORITY_INTERACTIVE) -> List[List[str]]:
+        return await self._run('get_all_values', self.sync.get_all_values, priority=priority)
+
+    async def query_active(self, type_=None, network=None, deadline=None, limit=5, offset=0) -> Tuple[List[Airdrop], int]:
+        # Dua query gviz: halaman dan jumlah total
+        return await self._run(
+            'query_active', lambda: self.sync.query_active(type_, network, deadline, limit, offset), cost=2
+        )
+
+    async def append_rows(self, rows: List[List[str]], priority: int = PRIORITY_WRITE) -> dict:
+        return await self._run(
+            'append_rows', functools.partial(self.sync.append_rows, rows),
+            kind='write', priority=priority, idempotent=False
+        )
+
+    async def batch_update(self, updates: List[dict], priority: int = PRIORITY_WRITE) -> None:
+        # Menulis nilai yang sama dua kali tidak mengubah hasil, jadi aman diulang
+        await self._run('batch_update', functools.partial(self.sync.batch_update, updates), kind='write', priority=priority)
+
+_shared_client: Optional[AsyncSheetsClient] = None
+
+def get_sheets_client() -> AsyncSheetsClient:
+    """Mendapatkan client Sheets bersama untuk seluruh proses"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncSheetsClient()
+    return _shared_client
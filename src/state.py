@@ -0,0 +1,269 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from telegram.ext import BasePersistence, PersistenceInput
+from src.config import Config
+from src.ratelimit import TokenBucketLimiter
+
+logger = logging.getLogger(__name__)
+
+CONVERSATIONS_PREFIX = 'conversations:'
+USER_DATA = 'user_data'
+RATE_LIMITS = 'rate_limits'
+
+class StateStore(ABC):
+    """Penyimpanan hash string -> string dengan nama method seperti Redis.
+
+    Klien `redis.asyncio.Redis(decode_responses=True)` memenuhi antarmuka ini
+    secara langsung, sehingga backend bisa diganti tanpa mengubah pemakainya.
+    """
+
+    @abstractmethod
+    async def hgetall(self, name: str) -> Dict[str, str]:
+        pass
+
+    @abstractmethod
+    async def hget(self, name: str, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def hset(self, name: str, key: Optional[str] = None, value: Optional[str] = None,
+                   mapping: Optional[Dict[str, str]] = None) -> int:
+        pass
+
+    @abstractmethod
+    async def hdel(self, name: str, *keys: str) -> int:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+def _items(key: Optional[str], value: Optional[str], mapping: Optional[Dict[str, str]]) -> Dict[str, str]:
+    items = dict(mapping or {})
+    if key is not None:
+        items[key] = value
+    return items
+
+class MemoryStateStore(StateStore):
+    """Pengganti Redis di memori, untuk pengujian dan satu proses tanpa persistensi"""
+
+    def __init__(self):
+        self.hashes: Dict[str, Dict[str, str]] = {}
+
+    async def hgetall(self, name: str) -> Dict[str, str]:
+        return dict(self.hashes.get(name, {}))
+
+    async def hget(self, name: str, key: str) -> Optional[str]:
+        return self.hashes.get(name, {}).get(key)
+
+    async def hset(self, name, key=None, value=None, mapping=None) -> int:
+        items = _items(key, value, mapping)
+        target = self.hashes.setdefault(name, {})
+        added = sum(1 for k in items if k not in target)
+        target.update(items)
+        return added
+
+    async def hdel(self, name: str, *keys: str) -> int:
+        target = self.hashes.get(name, {})
+        return sum(1 for k in keys if target.pop(k, None) is not None)
+
+class SQLiteStateStore(StateStore):
+    """Hash disimpan di tabel SQLite (WAL) sehingga bisa dibaca ulang setelah restart"""
+
+    def __init__(self, path: str = Config.STATE_PATH):
+        self.path = path
+        self.conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='state')
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        if self.conn is None:
+            await loop.run_in_executor(self._executor, self._open)
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _open(self) -> None:
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS state (name TEXT NOT NULL, key TEXT NOT NULL, '
+                'value TEXT NOT NULL, PRIMARY KEY (name, key))'
+            )
+            self.conn.commit()
+
+    async def hgetall(self, name: str) -> Dict[str, str]:
+        return await self._run(
+            lambda: dict(self.conn.execute('SELECT key, value FROM state WHERE name = ?', (name,)).fetchall())
+        )
+
+    async def hget(self, name: str, key: str) -> Optional[str]:
+        def run() -> Optional[str]:
+            row = self.conn.execute('SELECT value FROM state WHERE name = ? AND key = ?', (name, key)).fetchone()
+            return row[0] if row else None
+        return await self._run(run)
+
+    async def hset(self, name, key=None, value=None, mapping=None) -> int:
+        items = _items(key, value, mapping)
+
+        def run() -> int:
+            with self.conn:
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO state (name, key, value) VALUES (?, ?, ?)',
+                    [(name, k, v) for k, v in items.items()]
+                )
+            return len(items)
+        return await self._run(run)
+
+    async def hdel(self, name: str, *keys: str) -> int:
+        def run() -> int:
+            with self.conn:
+                return self.conn.executemany(
+                    'DELETE FROM state WHERE name = ? AND key = ?', [(name, k) for k in keys]
+                ).rowcount
+        return await self._run(run)
+
+    async def aclose(self) -> None:
+        if self.conn:
+            await self._run(self.conn.close)
+            self.conn = None
+
+class StorePersistence(BasePersistence):
+    """Persistensi PTB untuk state ConversationHandler dan user_data di atas StateStore.
+
+    Dengan `partition=(index, count)` hanya user dengan `user_id % count == index`
+    yang dimuat, sesuai pembagian update antar worker.
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        partition: Optional[Tuple[int, int]] = None,
+        update_interval: float = Config.PERSISTENCE_INTERVAL
+    ):
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, chat_data=False, user_data=True, callback_data=False),
+            update_interval=update_interval
+        )
+        self.store = store
+        self.partition = partition
+
+    def _owns(self, user_id: int) -> bool:
+        return self.partition is None or user_id % self.partition[1] == self.partition[0]
+
+    async def get_user_data(self) -> Dict[int, Dict[Any, Any]]:
+        data = await self.store.hgetall(USER_DATA)
+        return {int(k): json.loads(v) for k, v in data.items() if self._owns(int(k))}
+
+    async def update_user_data(self, user_id: int, data: Dict[Any, Any]) -> None:
+        if data:
+            await self.store.hset(USER_DATA, str(user_id), json.dumps(data))
+        else:
+            await self.store.hdel(USER_DATA, str(user_id))
+
+    async def drop_user_data(self, user_id: int) -> None:
+        await self.store.hdel(USER_DATA, str(user_id))
+
+    async def refresh_user_data(self, user_id: int, user_data: Dict[Any, Any]) -> None:
+        pass
+
+    async def get_conversations(self, name: str) -> Dict[Tuple[int, ...], object]:
+        data = await self.store.hgetall(CONVERSATIONS_PREFIX + name)
+        conversations = {}
+        for k, v in data.items():
+            key = tuple(json.loads(k))
+            if self._owns(key[-1]):
+                conversations[key] = json.loads(v)
+        return conversations
+
+    async def update_conversation(self, name: str, key: Tuple[int, ...], new_state: Optional[object]) -> None:
+        field = json.dumps(list(key))
+        if new_state is None:
+            await self.store.hdel(CONVERSATIONS_PREFIX + name, field)
+        else:
+            await self.store.hset(CONVERSATIONS_PREFIX + name, field, json.dumps(new_state))
+
+    # chat_data, bot_data dan callback_data tidak dipakai bot ini
+    async def get_chat_data(self) -> Dict[int, Dict[Any, Any]]:
+        return {}
+
+    async def get_bot_data(self) -> Dict[Any, Any]:
+        return {}
+
+    async def get_callback_data(self) -> None:
+        return None
+
+    async def update_chat_data(self, chat_id: int, data: Dict[Any, Any]) -> None:
+        pass
+
+    async def update_bot_data(self, data: Dict[Any, Any]) -> None:
+        pass
+
+    async def update_callback_data(self, data: Any) -> None:
+        pass
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        pass
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: Dict[Any, Any]) -> None:
+        pass
+
+    async def refresh_bot_data(self, bot_data: Dict[Any, Any]) -> None:
+        pass
+
+    async def flush(self) -> None:
+        pass
+
+async def save_rate_limits(limiter: TokenBucketLimiter, store: StateStore) -> int:
+    """Menyimpan bucket yang belum penuh agar batasan tetap berlaku setelah restart"""
+    now, wall = time.monotonic(), time.time()
+    entries = {
+        f'{user_id}:{command_class}': json.dumps([tokens, wall - age])
+        for (user_id, command_class), (tokens, age) in limiter.export(now).items()
+    }
+    if entries:
+        await store.hset(RATE_LIMITS, mapping=entries)
+    return len(entries)
+
+async def load_rate_limits(limiter: TokenBucketLimiter, store: StateStore,
+                           partition: Optional[Tuple[int, int]] = None) -> int:
+    """Memuat bucket milik partisi ini lalu menghapusnya dari store"""
+    data = await store.hgetall(RATE_LIMITS)
+    now, wall = time.monotonic(), time.time()
+    entries, loaded = {}, []
+    for field, value in data.items():
+        user_id, _, command_class = field.partition(':')
+        if partition and int(user_id) % partition[1] != partition[0]:
+            continue
+        tokens, saved_at = json.loads(value)
+        entries[(int(user_id), command_class)] = (tokens, max(0.0, wall - saved_at))
+        loaded.append(field)
+    limiter.restore(entries, now)
+    if loaded:
+        await store.hdel(RATE_LIMITS, *loaded)
+    return len(loaded)
+
+_shared_store: Optional[StateStore] = None
+
+def get_state_store() -> StateStore:
+    """Mendapatkan StateStore sesuai Config.STATE_BACKEND"""
+    global _shared_store
+    if _shared_store is None:
+        if Config.STATE_BACKEND == 'sqlite':
+            _shared_store = SQLiteStateStore(Config.STATE_PATH)
+        elif Config.STATE_BACKEND == 'redis':
+            import redis.asyncio  # dependensi opsional, hanya untuk backend redis
+            _shared_store = redis.asyncio.from_url(Config.REDIS_URL, decode_responses=True)
+        elif Config.STATE_BACKEND == 'memory':
+            _shared_store = MemoryStateStore()
+        else:
+            raise ValueError(f"STATE_BACKEND tidak dikenal: {Config.STATE_BACKEND}")
+    return _shared_store
+
+def worker_partition() -> Optional[Tuple[int, int]]:
+    """Partisi user milik proses ini, atau None jika hanya ada satu worker"""
+    return (Config.WORKER_INDEX, Config.WORKERS) if Config.WORKERS > 1 else None
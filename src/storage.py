@@ -0,0 +1,718 @@
+import asyncio
+import logging
+import sqlite3
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+from src.backup import IncrementalBackup
+from src.config import Config
+from src.metrics import ROWS_SCANNED
+from src.index import URL_FIELDS, AirdropIndex, get_airdrop_index
+from src.models import FIELDS, Airdrop, parse_date, parse_sheet
+from src.sheets import (
+    PRIORITY_BATCH, PRIORITY_WRITE, AsyncSheetsClient, first_updated_row, get_sheets_client, is_retryable,
+    status_updates
+)
+from src.utils import normalize_url, today
+from src.write_queue import WriteBehindQueue, get_write_queue
+
+logger = logging.getLogger(__name__)
+
+# Kolom URL yang menandai airdrop yang sama (sama dengan index.URL_FIELDS), beserta kolom key SQLite-nya
+DEDUP_FIELDS = {'Link': 'link_key', 'Twitter': 'twitter_key', 'Discord': 'discord_key'}
+
+class DuplicateError(Exception):
+    def __init__(self, field: str):
+        super().__init__(f"{field} sudah terdaftar")
+        self.field = field
+
+def row_identity(record: Airdrop) -> Tuple[str, str]:
+    """Link ternormalisasi dan Nama, untuk mengenali baris sheet yang sama setelah nomor barisnya bergeser"""
+    return normalize_url(record.link) or '', record.nama
+
+def url_keys(record: Airdrop) -> Dict[str, Optional[str]]:
+    """Key ternormalisasi untuk setiap kolom DEDUP_FIELDS"""
+    return {field: normalize_url(getattr(record, URL_FIELDS[field])) for field in DEDUP_FIELDS}
+
+class AirdropRepository(ABC):
+    """Antarmuka penyimpanan airdrop; baris dibaca dan ditulis sebagai Airdrop"""
+
+    def __init__(self):
+        # Dipanggil dengan (key, record) setiap kali baris baru benar-benar tersimpan
+        self.add_listeners: List[Callable[[Any, Airdrop], None]] = []
+        # Jumlah perubahan isi tabel oleh proses ini, bagian dari data_version
+        self.writes = 0
+
+    def _notify_added(self, key: Any, record: Airdrop) -> None:
+        self.writes += 1
+        for listener in self.add_listeners:
+            try:
+                listener(key, record)
+            except Exception as e:
+                logger.error("Listener penyimpanan gagal: %s", e, exc_info=True)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def warm_up(self) -> None:
+        """Menyiapkan koneksi dan cache yang lambat (mis. autentikasi Sheets); dijalankan di latar belakang"""
+
+    @abstractmethod
+    async def add(self, record: Airdrop, unique: bool = False) -> Airdrop:
+        """Menyimpan baris baru (Status dan Timestamp dilengkapi otomatis).
+
+        Dengan `unique=True` baris ditolak dengan DuplicateError jika salah satu
+        URL di DEDUP_FIELDS sudah terdaftar.
+        """
+
+    async def add_many(self, records: List[Airdrop]) -> List[Airdrop]:
+        """Menyimpan banyak baris sekaligus; mengembalikan baris yang benar-benar tersimpan.
+
+        Tidak ada pengecekan duplikat di sini, kecuali UNIQUE index Link di SQLite yang
+        melewati baris dengan Link yang sudah tersimpan.
+        """
+        return [await self.add(record) for record in records]
+
+    @abstractmethod
+    async def find_existing(self, field: str, keys: List[str]) -> Set[str]:
+        """Mengembalikan key URL ternormalisasi (kolom `field`) yang sudah tersimpan di antara `keys`"""
+
+    async def find_duplicate(self, record: Airdrop) -> Optional[str]:
+        """Nama kolom DEDUP_FIELDS pertama yang URL-nya sudah terdaftar, atau None"""
+        for field, key in url_keys(record).items():
+            if key and await self.find_existing(field, [key]):
+                return field
+        return None
+
+    @abstractmethod
+    def iter_rows(self, batch_size: int = 1000) -> AsyncIterator[List[Airdrop]]:
+        """Semua baris per batch, tanpa memuat seluruh tabel sekaligus"""
+
+    @abstractmethod
+    async def list_active(
+        self,
+        type_: Optional[str] = None,
+        network: Optional[str] = None,
+        deadline: Optional[date] = None
+    ) -> List[Airdrop]:
+        """Mengembalikan airdrop Active yang cocok dengan filter"""
+
+    @abstractmethod
+    async def list_active_page(
+        self,
+        type_: Optional[str] = None,
+        network: Optional[str] = None,
+        deadline: Optional[date] = None,
+        offset: int = 0,
+        limit: int = 5
+    ) -> Tuple[List[Airdrop], int]:
+        """Mengembalikan satu halaman airdrop Active beserta jumlah total yang cocok"""
+
+    @abstractmethod
+    async def data_version(self) -> Any:
+        """Nilai yang berubah setiap kali hasil list_active bisa berubah (key cache /list)"""
+
+    @abstractmethod
+    async def pending_deadlines(self) -> List[Tuple[date, Any]]:
+        """Mengembalikan (deadline, key) untuk semua airdrop yang belum Ended"""
+
+    @abstractmethod
+    async def expire(self, keys: List[Any]) -> int:
+        """Menandai baris dengan key tersebut sebagai Ended"""
+
+    @abstractmethod
+    async def backup(self) -> Optional[str]:
+        """Membuat backup dan mengembalikan namanya"""
+
+class SheetsRepository(AirdropRepository):
+    """Google Sheets sebagai penyimpanan utama (indeks lokal + antrian tulis)"""
+
+    def __init__(self, client: AsyncSheetsClient, index: AirdropIndex, queue: WriteBehindQueue):
+        super().__init__()
+        self.client = client
+        self.index = index
+        self.queue = queue
+        self.queue.on_flush = self._on_flush
+        # Sheets tidak mencatat baris yang berubah, jadi perubahan dicari lewat hash baris
+        self.backups = IncrementalBackup()
+        self._add_lock = asyncio.Lock()
+        # Nomor baris yang sedang dipantau penjadwal kedaluwarsa -> isi baris saat itu
+        self._expected: Dict[int, Tuple[str, str]] = {}
+
+    def _on_flush(self, records: List[Airdrop], first_row: Optional[int]) -> None:
+        """Key baris Sheets adalah nomor barisnya"""
+        if first_row is None:
+            self.index.invalidate()
+            return
+        if first_row == len(self.index.rows) + 2:
+            self.index.add_rows(records)
+        else:
+            # Ada penulis lain di sheet; posisi indeks tidak lagi cocok
+            self.index.invalidate()
+        for offset, record in enumerate(records):
+            self._expected[first_row + offset] = row_identity(record)
+            self._notify_added(first_row + offset, record)
+
+    async def start(self) -> None:
+        await self.queue.start()
+
+    async def stop(self) -> None:
+        await self.queue.stop()
+
+    async def warm_up(self) -> None:
+        # Autentikasi, cache worksheet, dan indeks dimuat sekaligus
+        await self.index.refresh()
+
+    async def add(self, record: Airdrop, unique: bool = False) -> Airdrop:
+        if not unique:
+            return await self.queue.enqueue(record)
+        async with self._add_lock:  # cek dan antrekan tanpa diselingi submit lain
+            field = await self.find_duplicate(record)
+            if field:
+                raise DuplicateError(field)
+            return await self.queue.enqueue(record)
+
+    async def add_many(self, records: List[Airdrop]) -> List[Airdrop]:
+        return await self.queue.enqueue_many(records)
+
+    async def find_existing(self, field: str, keys: List[str]) -> Set[str]:
+        if self.index.version == 0:
+            await self.index.refresh()
+        elif not self.index.is_fresh:
+            # Indeks lama tetap dipakai (baris bot ini sudah masuk lewat _on_flush), dimuat ulang di latar belakang
+            asyncio.create_task(self._warm_index())
+        known = self.index.by_url[field]
+        found = {key for key in keys if key in known}
+        # Baris yang masih di antrian tulis belum ada di indeks
+        attr = URL_FIELDS[field]
+        wanted = set(keys) - found
+        for record in self.queue.pending if wanted else ():
+            key = normalize_url(getattr(record, attr))
+            if key in wanted:
+                found.add(key)
+        return found
+
+    async def iter_rows(self, batch_size: int = 1000) -> AsyncIterator[List[Airdrop]]:
+        await self.index.refresh()
+        rows = self.index.rows
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+    async def list_active(self, type_=None, network=None, deadline=None) -> List[Airdrop]:
+        return await self.index.query(status='Active', type_=type_, network=network, deadline=deadline)
+
+    async def list_active_page(self, type_=None, network=None, deadline=None, offset=0, limit=5):
+        if not self.index.is_fresh:
+            # Indeks dingin: ambil halaman ini saja dari server sambil memanaskan indeks di latar belakang
+            asyncio.create_task(self._warm_index())
+            try:
+                return await self.client.query_active(
+                    type_, network, deadline.isoformat() if deadline else None, limit, offset
+                )
+            except Exception as e:
+                logger.warning("Query sisi server gagal, memakai indeks: %s", e)
+        rows = await self.list_active(type_=type_, network=network, deadline=deadline)
+        return rows[offset:offset + limit], len(rows)
+
+    async def data_version(self) -> Tuple[int, int]:
+        # Versi indeks juga berubah saat sheet dimuat ulang, termasuk perubahan dari luar bot
+        return self.index.version, self.writes
+
+    async def _warm_index(self) -> None:
+        try:
+            await self.index.refresh()
+        except Exception as e:
+            logger.warning("Gagal memuat indeks airdrop: %s", e)
+
+    async def pending_deadlines(self) -> List[Tuple[date, int]]:
+        await self.index.refresh()
+        pending = [(deadline, pos + 2) for deadline, pos in self.index.pending_deadlines()]
+        self._expected = {row: row_identity(self.index.rows[row - 2]) for _, row in pending}
+        return pending
+
+    async def expire(self, keys: List[int]) -> int:
+        """Menandai baris Ended setelah memastikan nomor barisnya masih menunjuk airdrop yang sama.
+
+        Baris bisa disisipkan atau dihapus langsung di sheet, sehingga nomor baris di
+        heap penjadwal bisa bergeser. Sheet dibaca ulang dulu; baris yang pindah dicari
+        lewat Link, dan baris yang tidak ditemukan dilewati.
+        """
+        if not keys:
+            return 0
+        await self.index.refresh(force=True, priority=PRIORITY_WRITE, stale_ok=False)
+        current = today()
+        positions = []
+        for row in keys:
+            pos = self._resolve_row(row, self._expected.pop(row, None))
+            if pos is None:
+                logger.warning("Baris %d sudah tidak berisi airdrop yang dijadwalkan, dilewati", row)
+                continue
+            record = self.index.rows[pos]
+            if record.status != 'Ended' and record.is_due(current):
+                positions.append(pos)
+        if positions:
+            await self.client.batch_update(status_updates((pos + 2, 'Ended') for pos in positions))
+            self.index.set_status(positions, 'Ended')
+        return len(positions)
+
+    def _resolve_row(self, row: int, expected: Optional[Tuple[str, str]]) -> Optional[int]:
+        """Posisi indeks untuk baris sheet `row` yang dulu berisi `expected`"""
+        pos = row - 2
+        if 0 <= pos < len(self.index.rows) and (expected is None or row_identity(self.index.rows[pos]) == expected):
+            return pos
+        if expected and expected[0]:
+            moved = self.index.by_url['Link'].get(expected[0])
+            if moved is not None and row_identity(self.index.rows[moved]) == expected:
+                return moved
+        return None
+
+    async def backup(self) -> Optional[str]:
+        try:
+            # Job malam: kalah prioritas dari /list dan antrian tulis
+            await self.index.refresh(priority=PRIORITY_BATCH)
+            rows = [(pos + 2, record.to_row()) for pos, record in enumerate(await self.list_all())]
+            name = await asyncio.to_thread(self.backups.snapshot_rows, rows)
+            logger.info("Backup berhasil: %s", name)
+            return name
+        except Exception as e:
+            logger.error("Gagal membuat backup: %s", e, exc_info=True)
+            return None
+
+    async def list_all(self) -> List[Airdrop]:
+        """Semua baris dari indeks"""
+        await self.index.refresh()
+        return list(self.index.rows)
+
+# Nama kolom SQLite, sama dengan atribut Airdrop
+COLUMNS = list(FIELDS)
+
+_COLUMN_DEFS = ',\n    '.join(f"{c} TEXT NOT NULL DEFAULT ''" for c in COLUMNS)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS airdrops (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    {_COLUMN_DEFS},
+    type_key TEXT NOT NULL DEFAULT '',
+    network_key TEXT NOT NULL DEFAULT '',
+    sheet_row INTEGER,
+    synced INTEGER NOT NULL DEFAULT 0,
+    status_synced INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_airdrops_status_type ON airdrops (status, type_key);
+CREATE INDEX IF NOT EXISTS idx_airdrops_status_network ON airdrops (status, network_key);
+CREATE INDEX IF NOT EXISTS idx_airdrops_status_deadline ON airdrops (status, deadline);
+CREATE INDEX IF NOT EXISTS idx_airdrops_synced ON airdrops (synced, status_synced);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Kolom yang ditambahkan setelah SCHEMA awal: nama -> (definisi, SQL tambahan)
+MIGRATIONS = {
+    # 0 = berubah sejak backup terakhir
+    'backup_synced': (
+        'INTEGER NOT NULL DEFAULT 0',
+        ('CREATE INDEX IF NOT EXISTS idx_airdrops_backup ON airdrops (backup_synced) WHERE backup_synced = 0',),
+    ),
+    # URL ternormalisasi untuk deteksi duplikat (lihat utils.normalize_url)
+    **{
+        column: ("TEXT NOT NULL DEFAULT ''", (f"CREATE INDEX IF NOT EXISTS idx_airdrops_{column} ON airdrops ({column})",))
+        for column in DEDUP_FIELDS.values()
+    },
+}
+# Satu baris per Link, juga saat beberapa worker menulis bersamaan ('' = tanpa Link valid)
+MIGRATIONS['link_key'] = (MIGRATIONS['link_key'][0], MIGRATIONS['link_key'][1] + (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_airdrops_link_key_unique ON airdrops (link_key) WHERE link_key != ''",
+))
+
+class SQLiteRepository(AirdropRepository):
+    """SQLite sebagai penyimpanan utama; Google Sheets menjadi mirror yang disinkronkan di latar belakang"""
+
+    def __init__(self, path: str = Config.SQLITE_PATH, mirror_client: Optional[AsyncSheetsClient] = None):
+        super().__init__()
+        self.path = path
+        self.mirror_client = mirror_client
+        self.conn: Optional[sqlite3.Connection] = None
+        # Satu thread agar semua akses koneksi berurutan
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+        self._mirror: Optional[SheetsMirror] = None
+        self.backups = IncrementalBackup()
+        self.bootstrapped = False
+        self._bootstrap_lock = asyncio.Lock()
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def start(self) -> None:
+        await self._run(self._open)
+        if self.mirror_client:
+            # Isi awal dari sheet dimuat di warm_up / oleh mirror, tidak menahan startup
+            self._mirror = SheetsMirror(self, self.mirror_client)
+            self._mirror.start()
+
+    async def stop(self) -> None:
+        if self._mirror:
+            await self._mirror.stop()
+        if self.conn:
+            await self._run(self.conn.close)
+            self.conn = None
+
+    async def warm_up(self) -> None:
+        if self.mirror_client:
+            await self.bootstrap_from_sheet()
+            await self.mirror_client.get_worksheet()
+
+    def _open(self) -> None:
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.migrate(self.conn)
+        self.conn.commit()
+        self.bootstrapped = self._get_meta('bootstrap_done') == '1'
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def migrate(conn: sqlite3.Connection) -> None:
+        """Menambahkan kolom baru ke database lama"""
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(airdrops)')}
+        for column, (definition, _) in MIGRATIONS.items():
+            if column not in existing:
+                conn.execute(f'ALTER TABLE airdrops ADD COLUMN {column} {definition}')
+        if not set(DEDUP_FIELDS.values()) <= existing:
+            # Isi key URL untuk baris yang sudah ada sebelum kolomnya dibuat
+            sql = f"SELECT id, {', '.join(COLUMNS)} FROM airdrops"
+            updates = [
+                (*(key or '' for key in url_keys(Airdrop.from_row(r[1:])).values()), r[0])
+                for r in conn.execute(sql).fetchall()
+            ]
+            conn.executemany(
+                f"UPDATE airdrops SET {', '.join(f'{c} = ?' for c in DEDUP_FIELDS.values())} WHERE id = ?", updates
+            )
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_airdrops_link_key_unique'").fetchone():
+            # Duplikat yang tersimpan sebelum UNIQUE index ada tetap disimpan, tetapi hanya baris pertama yang memegang key
+            conn.execute(
+                "UPDATE airdrops SET link_key = '' WHERE link_key != '' AND id NOT IN "
+                "(SELECT MIN(id) FROM airdrops WHERE link_key != '' GROUP BY link_key)"
+            )
+        for _, extra_sql in MIGRATIONS.values():
+            for sql in extra_sql:
+                conn.execute(sql)
+        if conn.execute("SELECT 1 FROM airdrops WHERE synced = 1 LIMIT 1").fetchone():
+            # Database lama yang sudah pernah disinkronkan dengan sheet tidak diisi ulang
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('bootstrap_done', '1')")
+
+    async def bootstrap_from_sheet(self) -> None:
+        """Mengimpor isi sheet yang sudah ada satu kali; gagal memuat sheet dilempar agar dicoba ulang.
+
+        Ditandai dengan flag `bootstrap_done` di tabel meta, bukan dari tabel yang kosong,
+        karena baris baru bisa tersimpan lebih dulu selagi Sheets belum bisa dihubungi.
+        """
+        if self.bootstrapped:
+            return
+        async with self._bootstrap_lock:
+            if self.bootstrapped:
+                return
+            all_data = await self.mirror_client.get_all_values(PRIORITY_BATCH)
+            _, records = parse_sheet(all_data) if len(all_data) > 1 else (None, [])
+            rows = [(record, sheet_row) for sheet_row, record in enumerate(records, start=2)]
+
+            def run() -> None:
+                # Link ganda di sheet (atau yang sudah tersimpan lokal) tetap diimpor, tanpa key unik
+                taken = self._existing('Link', [key for key in (normalize_url(r.link) for r, _ in rows) if key])
+                params = []
+                for record, sheet_row in rows:
+                    values = self._insert_params(record, sheet_row, True)
+                    key = values[self._LINK_KEY]
+                    if key in taken:
+                        values = values[:self._LINK_KEY] + ('',) + values[self._LINK_KEY + 1:]
+                    elif key:
+                        taken.add(key)
+                    params.append(values)
+                with self.conn:  # baris sheet dan flag disimpan dalam satu transaksi
+                    self.conn.executemany(self._INSERT_SQL, params)
+                    self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('bootstrap_done', '1')")
+
+            await self._run(run)
+            self.bootstrapped = True
+            if rows:
+                self.writes += 1
+                logger.info("Database diisi dari Sheets: %d baris", len(rows))
+
+    _INSERT_SQL = (
+        f"INSERT INTO airdrops ({', '.join(COLUMNS)}, type_key, network_key, {', '.join(DEDUP_FIELDS.values())}, "
+        f"sheet_row, synced) VALUES ({', '.join('?' * (len(COLUMNS) + len(DEDUP_FIELDS) + 4))})"
+    )
+    _INSERT_OR_IGNORE_SQL = _INSERT_SQL.replace('INSERT', 'INSERT OR IGNORE', 1)
+    _LINK_KEY = len(COLUMNS) + 2  # posisi link_key di _insert_params
+
+    @staticmethod
+    def _insert_params(record: Airdrop, sheet_row: Optional[int], synced: bool) -> tuple:
+        keys = (key or '' for key in url_keys(record).values())
+        return (*record.to_row(), record.type.lower(), record.network.lower(), *keys, sheet_row, int(synced))
+
+    def _insert(self, record: Airdrop, unique: bool = False) -> int:
+        if unique:
+            # Dalam job executor yang sama dengan INSERT sehingga tidak ada submit lain di antaranya
+            for field, key in url_keys(record).items():
+                if key and self._existing(field, [key]):
+                    raise DuplicateError(field)
+        try:
+            with self.conn:
+                return self.conn.execute(self._INSERT_SQL, self._insert_params(record, None, False)).lastrowid
+        except sqlite3.IntegrityError:
+            # Worker lain menyimpan Link yang sama setelah pengecekan di atas (UNIQUE index link_key)
+            raise DuplicateError('Link')
+
+    async def add(self, record: Airdrop, unique: bool = False) -> Airdrop:
+        record.prepare()
+        row_id = await self._run(self._insert, record, unique)
+        self._notify_added(row_id, record)
+        return record
+
+    async def add_many(self, records: List[Airdrop]) -> List[Airdrop]:
+        prepared = [record.prepare() for record in records]
+
+        def run() -> List[Tuple[int, Airdrop]]:
+            stored = []
+            with self.conn:  # satu transaksi untuk seluruh batch
+                for record in prepared:
+                    cursor = self.conn.execute(self._INSERT_OR_IGNORE_SQL, self._insert_params(record, None, False))
+                    if cursor.rowcount:  # 0 = Link sudah tersimpan
+                        stored.append((cursor.lastrowid, record))
+            return stored
+
+        stored = await self._run(run)
+        for row_id, record in stored:
+            self._notify_added(row_id, record)
+        return [record for _, record in stored]
+
+    def _existing(self, field: str, keys: List[str]) -> Set[str]:
+        column = DEDUP_FIELDS[field]
+        found: Set[str] = set()
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            sql = f"SELECT {column} FROM airdrops WHERE {column} IN ({', '.join('?' * len(chunk))})"
+            found.update(r[0] for r in self.conn.execute(sql, chunk))
+        return found
+
+    async def find_existing(self, field: str, keys: List[str]) -> Set[str]:
+        return await self._run(self._existing, field, keys)
+
+    async def iter_rows(self, batch_size: int = 1000) -> AsyncIterator[List[Airdrop]]:
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM airdrops WHERE id > ? ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            batch = await self._run(lambda: self.conn.execute(sql, (last_id, batch_size)).fetchall())
+            if not batch:
+                return
+            last_id = batch[-1][0]
+            yield [Airdrop.from_row(r[1:]) for r in batch]
+
+    @staticmethod
+    def _active_where(type_, network, deadline) -> Tuple[str, List[Any]]:
+        clauses = ['status = ?']
+        params: List[Any] = ['Active']
+        if type_:
+            clauses.append('type_key = ?')
+            params.append(type_.lower())
+        if network:
+            clauses.append('network_key = ?')
+            params.append(network.lower())
+        if deadline:
+            clauses.append('deadline = ?')
+            params.append(deadline.isoformat())
+        return ' AND '.join(clauses), params
+
+    async def list_active(self, type_=None, network=None, deadline=None) -> List[Airdrop]:
+        where, params = self._active_where(type_, network, deadline)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM airdrops WHERE {where} ORDER BY id"
+        rows = await self._run(lambda: [Airdrop.from_row(r) for r in self.conn.execute(sql, params)])
+        ROWS_SCANNED.inc(len(rows), source='sqlite')
+        return rows
+
+    async def list_active_page(self, type_=None, network=None, deadline=None, offset=0, limit=5):
+        where, params = self._active_where(type_, network, deadline)
+        page_sql = f"SELECT {', '.join(COLUMNS)} FROM airdrops WHERE {where} ORDER BY id LIMIT ? OFFSET ?"
+        count_sql = f"SELECT COUNT(*) FROM airdrops WHERE {where}"
+
+        def run() -> Tuple[List[Airdrop], int]:
+            rows = [Airdrop.from_row(r) for r in self.conn.execute(page_sql, params + [limit, offset])]
+            return rows, self.conn.execute(count_sql, params).fetchone()[0]
+
+        rows, total = await self._run(run)
+        ROWS_SCANNED.inc(len(rows), source='sqlite')
+        return rows, total
+
+    async def data_version(self) -> Tuple[int, int]:
+        # PRAGMA data_version berubah saat koneksi lain (worker lain, CLI import) melakukan commit
+        pragma = await self._run(lambda: self.conn.execute('PRAGMA data_version').fetchone()[0])
+        return self.writes, pragma
+
+    async def pending_deadlines(self) -> List[Tuple[date, int]]:
+        sql = "SELECT id, deadline FROM airdrops WHERE status != 'Ended' AND deadline != ''"
+        rows = await self._run(lambda: self.conn.execute(sql).fetchall())
+        pending = []
+        for row_id, deadline in rows:
+            due = parse_date(deadline)
+            if due:
+                pending.append((due, row_id))
+            else:
+                logger.debug("Deadline tidak valid untuk id %d: %s", row_id, deadline)
+        return pending
+
+    async def expire(self, keys: List[int]) -> int:
+        if not keys:
+            return 0
+
+        def run() -> int:
+            updated = 0
+            with self.conn:
+                for i in range(0, len(keys), 500):  # batas jumlah parameter SQLite
+                    chunk = keys[i:i + 500]
+                    updated += self.conn.execute(
+                        "UPDATE airdrops SET status = 'Ended', status_synced = 0, backup_synced = 0 "
+                        f"WHERE status != 'Ended' AND id IN ({', '.join('?' * len(chunk))})",
+                        chunk
+                    ).rowcount
+            return updated
+
+        updated = await self._run(run)
+        if updated:
+            self.writes += 1
+        return updated
+
+    async def backup(self) -> Optional[str]:
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM airdrops WHERE backup_synced = 0 ORDER BY id"
+
+        def run() -> str:
+            # Dalam satu job executor agar tidak ada perubahan yang terselip di antara baca dan tandai
+            changes = [(r[0], list(r[1:])) for r in self.conn.execute(sql)]
+            name = self.backups.write_snapshot(changes)
+            with self.conn:
+                for i in range(0, len(changes), 500):
+                    chunk = [row_id for row_id, _ in changes[i:i + 500]]
+                    self.conn.execute(
+                        f"UPDATE airdrops SET backup_synced = 1 WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                    )
+            return name
+
+        try:
+            backup_name = await self._run(run)
+            logger.info("Backup berhasil: %s", backup_name)
+            return backup_name
+        except Exception as e:
+            logger.error("Gagal membuat backup: %s", e, exc_info=True)
+            return None
+
+    # Dipakai oleh SheetsMirror
+
+    async def unsynced_rows(self, limit: int) -> List[Tuple[int, List[str]]]:
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM airdrops WHERE synced = 0 ORDER BY id LIMIT ?"
+        return await self._run(lambda: [(r[0], list(r[1:])) for r in self.conn.execute(sql, (limit,))])
+
+    async def mark_synced(self, ids: List[int], first_sheet_row: Optional[int]) -> None:
+        def run() -> None:
+            with self.conn:
+                for offset, row_id in enumerate(ids):
+                    sheet_row = first_sheet_row + offset if first_sheet_row else None
+                    self.conn.execute(
+                        'UPDATE airdrops SET synced = 1, sheet_row = ? WHERE id = ?', (sheet_row, row_id)
+                    )
+        await self._run(run)
+
+    async def unsynced_statuses(self, limit: int) -> List[Tuple[int, int, str]]:
+        sql = (
+            'SELECT id, sheet_row, status FROM airdrops '
+            'WHERE status_synced = 0 AND synced = 1 AND sheet_row IS NOT NULL ORDER BY sheet_row LIMIT ?'
+        )
+        return await self._run(lambda: self.conn.execute(sql, (limit,)).fetchall())
+
+    async def mark_statuses_synced(self, ids: List[int]) -> None:
+        def run() -> None:
+            with self.conn:
+                self.conn.executemany('UPDATE airdrops SET status_synced = 1 WHERE id = ?', [(i,) for i in ids])
+        await self._run(run)
+
+class SheetsMirror:
+    """Menyalin baris baru dan perubahan Status dari SQLite ke Google Sheets"""
+
+    def __init__(self, repo: SQLiteRepository, client: AsyncSheetsClient,
+                 interval: float = Config.MIRROR_INTERVAL_SECONDS, batch_size: int = Config.WRITE_MAX_BATCH_ROWS,
+                 status_batch_size: int = 1000):
+        self.repo = repo
+        self.client = client
+        self.interval = interval
+        self.batch_size = batch_size
+        # Perubahan Status dikirim dalam satu batch_update, jadi batch bisa jauh lebih besar
+        self.status_batch_size = status_batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        backoff = self.interval
+        while True:
+            await asyncio.sleep(backoff)
+            try:
+                await self.sync_once()
+                backoff = self.interval
+            except Exception as e:
+                if not is_retryable(e):
+                    logger.error("Sinkronisasi Sheets gagal: %s", e, exc_info=True)
+                else:
+                    logger.warning("Sinkronisasi Sheets tertunda: %s", e)
+                backoff = min(backoff * 2, Config.WRITE_MAX_BACKOFF)
+
+    async def sync_once(self) -> None:
+        """Mengirim satu batch baris baru dan satu batch perubahan Status"""
+        # Baris lokal baru dikirim setelah isi sheet diimpor, agar tidak ikut terimpor ulang
+        await self.repo.bootstrap_from_sheet()
+        rows = await self.repo.unsynced_rows(self.batch_size)
+        if rows:
+            response = await self.client.append_rows([values for _, values in rows])
+            await self.repo.mark_synced([row_id for row_id, _ in rows], first_updated_row(response))
+            logger.info("Mirror Sheets: %d baris baru", len(rows))
+
+        statuses = await self.repo.unsynced_statuses(self.status_batch_size)
+        if statuses:
+            await self.client.batch_update(status_updates(
+                (sheet_row, status) for _, sheet_row, status in statuses
+            ))
+            await self.repo.mark_statuses_synced([row_id for row_id, _, _ in statuses])
+            logger.info("Mirror Sheets: %d status diperbarui", len(statuses))
+
+_shared_repository: Optional[AirdropRepository] = None
+
+def get_repository() -> AirdropRepository:
+    """Mendapatkan repository sesuai Config.STORAGE_BACKEND"""
+    global _shared_repository
+    if _shared_repository is None:
+        if Config.STORAGE_BACKEND == 'sheets':
+            _shared_repository = SheetsRepository(get_sheets_client(), get_airdrop_index(), get_write_queue())
+        elif Config.STORAGE_BACKEND == 'sqlite':
+            # Dengan beberapa worker hanya worker 0 yang menyinkronkan ke Sheets
+            mirror = get_sheets_client() if Config.SHEETS_MIRROR and Config.WORKER_INDEX == 0 else None
+            _shared_repository = SQLiteRepository(Config.SQLITE_PATH, mirror)
+        else:
+            raise ValueError(f"STORAGE_BACKEND tidak dikenal: {Config.STORAGE_BACKEND}")
+    return _shared_repository
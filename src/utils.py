@@ -1,17 +1,89 @@
-from urllib.parse import urlparse
+from datetime import date, datetime, tzinfo
+import re
+from urllib.parse import ParseResult, parse_qsl, urlencode, urlparse
 from typing import Optional
 import logging
+from zoneinfo import ZoneInfo
+from src.config import Config
 
 logger = logging.getLogger(__name__)
 
-def is_valid_url(url: str) -> bool:
-    """Memvalidasi URL"""
+def local_timezone() -> tzinfo:
+    """Zona waktu Config.TIMEZONE, atau zona waktu server jika kosong"""
+    if Config.TIMEZONE:
+        return ZoneInfo(Config.TIMEZONE)
+    return datetime.now().astimezone().tzinfo
+
+def today() -> date:
+    """Tanggal hari ini di zona local_timezone(); dasar Deadline untuk status, pencarian, dan pengingat"""
+    return datetime.now(local_timezone()).date()
+
+def _parse_url(url: str) -> Optional[ParseResult]:
+    """Hasil urlparse jika URL http(s) dengan host, selain itu None"""
     try:
         result = urlparse(url.strip())
-        valid = all([result.scheme in ['http', 'https'], result.netloc])
-        if not valid:
-            logger.debug("URL tidak valid: %s", url)
-        return valid
+        if result.scheme in ['http', 'https'] and result.netloc:
+            return result
+        logger.debug("URL tidak valid: %s", url)
     except Exception as e:
         logger.debug("Error memvalidasi URL %s: %s", url, e)
-        return False
+    return None
+
+def is_valid_url(url: str) -> bool:
+    """Memvalidasi URL"""
+    return _parse_url(url) is not None
+
+# Parameter pelacak yang tidak mengubah tujuan URL
+TRACKING_PARAMS = {'fbclid', 'gclid', 'igshid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'ref_url', 's', 't', 'si'}
+HOST_ALIASES = {'x.com': 'twitter.com', 'mobile.twitter.com': 'twitter.com', 'discordapp.com': 'discord.com'}
+
+# URL sederhana (host huruf kecil, tanpa port, query, atau fragment) yang hasil normalisasinya
+# bisa langsung dibentuk tanpa urlparse; sebagian besar Link/Twitter/Discord berbentuk ini
+_SIMPLE_URL = re.compile(r'(?i:https?)://([a-z0-9.-]+)(/[^?#;@\s]*)?')
+
+def normalize_url(url: str) -> Optional[str]:
+    """Bentuk kanonik URL untuk deteksi duplikat; None jika URL tidak valid.
+
+    Skema diabaikan, host huruf kecil tanpa "www." dan port bawaan, parameter
+    pelacak (utm_*, fbclid, ...) dibuang, sisa query diurutkan, dan garis miring
+    di akhir path dihapus. Huruf besar/kecil path dipertahankan (kode undangan
+    Discord peka huruf besar/kecil).
+    """
+    if not url:
+        return None
+    simple = _SIMPLE_URL.fullmatch(url.strip())
+    if simple:
+        host = simple.group(1)
+        if host.startswith('www.'):
+            host = host[4:]
+        return HOST_ALIASES.get(host, host) + (simple.group(2) or '').rstrip('/')
+    return _normalize_parsed(url)
+
+def _normalize_parsed(url: str) -> Optional[str]:
+    """normalize_url lewat urlparse, untuk semua bentuk URL"""
+    result = _parse_url(url)
+    if result is None:
+        return None
+    host = (result.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    host = HOST_ALIASES.get(host, host)
+    try:
+        port = result.port
+    except ValueError:
+        return None
+    if port and port not in (80, 443):
+        host = f'{host}:{port}'
+    query = sorted(
+        (k, v) for k, v in parse_qsl(result.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    )
+    normalized = host + result.path.rstrip('/')
+    return f'{normalized}?{urlencode(query)}' if query else normalized
+
+def parse_deadline(text: str) -> Optional[date]:
+    """Mengurai deadline YYYY-MM-DD; kosong atau "skip" berarti tanpa deadline (ValueError jika format salah)"""
+    text = text.strip().lower()
+    if text in ('', 'skip'):
+        return None
+    return datetime.strptime(text, '%Y-%m-%d').date()
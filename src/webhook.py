@@ -0,0 +1,153 @@
+import asyncio
+import hmac
+import json
+import logging
+import signal
+from typing import Awaitable, Callable, Dict, Optional, Set
+from urllib.parse import urlparse
+from telegram import Update
+from telegram.ext import Application
+from src.config import Config
+from src.httpserver import HttpError, read_request, write_response
+
+logger = logging.getLogger(__name__)
+
+class WebhookServer:
+    """Server HTTP async yang menerima update Telegram lewat webhook.
+
+    Request tanpa header X-Telegram-Bot-Api-Secret-Token yang cocok ditolak (403).
+    Update diproses bersamaan hingga `max_concurrency`; jika penuh, jawaban HTTP
+    ditahan sampai ada slot kosong sehingga Telegram ikut melambat. Update dari
+    chat yang sama tetap diproses berurutan agar langkah percakapan tidak tertukar.
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        host: str = Config.WEBHOOK_HOST,
+        port: int = Config.WEBHOOK_PORT,
+        path: str = Config.WEBHOOK_PATH,
+        secret_token: str = Config.WEBHOOK_SECRET,
+        max_concurrency: int = Config.WEBHOOK_MAX_CONCURRENCY
+    ):
+        self.application = application
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret_token = secret_token
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+        self._tails: Dict[int, asyncio.Task] = {}  # chat id -> task terakhir
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Webhook aktif di http://%s:%d%s", self.host, self.port, self.path)
+
+    async def stop(self, timeout: float = 30) -> None:
+        """Berhenti menerima request lalu menunggu update yang sedang diproses"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._tasks:
+            logger.info("Menunggu %d update selesai diproses", len(self._tasks))
+            done, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning("%d update dibatalkan saat shutdown", len(pending))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = await read_request(reader)
+                if request.method != 'POST' or request.path != self.path:
+                    raise HttpError('404 Not Found')
+                token = request.headers.get('x-telegram-bot-api-secret-token', '')
+                if not hmac.compare_digest(token.encode(), self.secret_token.encode()):
+                    raise HttpError('403 Forbidden')
+                try:
+                    update = Update.de_json(json.loads(request.body), self.application.bot)
+                except (ValueError, TypeError, KeyError):
+                    raise HttpError('400 Bad Request')
+            except HttpError as e:
+                await write_response(writer, e.status)
+                return
+            await self.submit(update)
+            await write_response(writer, '200 OK')
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def submit(self, update: Update) -> asyncio.Task:
+        """Menjadwalkan satu update setelah mendapat slot pemrosesan"""
+        await self._slots.acquire()
+        chat_id = update.effective_chat.id if update.effective_chat else None
+        previous = self._tails.get(chat_id) if chat_id is not None else None
+        task = asyncio.create_task(self._process(update, previous))
+        self._tasks.add(task)
+        if chat_id is not None:
+            self._tails[chat_id] = task
+        task.add_done_callback(lambda t: self._done(t, chat_id))
+        return task
+
+    async def _process(self, update: Update, previous: Optional[asyncio.Task]) -> None:
+        try:
+            if previous:
+                await asyncio.wait({previous})
+            await self.application.process_update(update)
+        except Exception:
+            logger.exception("Gagal memproses update %s", update.update_id)
+
+    def _done(self, task: asyncio.Task, chat_id: Optional[int]) -> None:
+        self._tasks.discard(task)
+        self._slots.release()
+        if chat_id is not None and self._tails.get(chat_id) is task:
+            del self._tails[chat_id]
+
+async def serve(
+    application: Application,
+    server: WebhookServer,
+    after_start: Optional[Callable[[], Awaitable[None]]] = None
+) -> None:
+    """Menjalankan Application di belakang server sampai menerima SIGINT/SIGTERM"""
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+    await server.start()
+    if after_start:
+        await after_start()
+    await application.start()
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("Webhook berhenti, menyelesaikan update yang tersisa")
+        await server.stop()
+        await application.stop()
+        if application.post_stop:
+            await application.post_stop(application)
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+
+async def run_webhook(application: Application) -> None:
+    """Mode webhook satu proses"""
+    server = WebhookServer(application, path=urlparse(Config.WEBHOOK_URL).path or Config.WEBHOOK_PATH)
+
+    async def register() -> None:
+        await application.bot.set_webhook(
+            url=Config.WEBHOOK_URL,
+            secret_token=Config.WEBHOOK_SECRET,
+            allowed_updates=Update.ALL_TYPES,
+            max_connections=Config.WEBHOOK_MAX_CONCURRENCY
+        )
+
+    await serve(application, server, register)
@@ -0,0 +1,160 @@
+import asyncio
+import hmac
+import json
+import logging
+import multiprocessing
+import signal
+from typing import Any, Dict, List, Optional
+from telegram import Bot, Update
+from src.config import Config
+from src.httpserver import HttpError, read_request, write_response
+
+logger = logging.getLogger(__name__)
+
+WORKER_PATH = '/update'
+
+def update_user_id(data: Dict[str, Any]) -> int:
+    """User (atau chat) pengirim update, dibaca langsung dari JSON tanpa membangun objek Update"""
+    for key, value in data.items():
+        if key == 'update_id' or not isinstance(value, dict):
+            continue
+        for candidate in (value.get('from'), value.get('user'), value.get('chat'),
+                          (value.get('message') or {}).get('chat')):
+            if isinstance(candidate, dict) and 'id' in candidate:
+                return int(candidate['id'])
+    return 0
+
+class WebhookRouter:
+    """Front webhook yang meneruskan update ke worker `user_id % jumlah worker`.
+
+    Satu user selalu ditangani worker yang sama, jadi state percakapan dan bucket
+    rate limit tiap user hanya dipegang satu proses. Jawaban HTTP ke Telegram
+    menunggu jawaban worker sehingga batas concurrency worker tetap berlaku.
+    """
+
+    def __init__(
+        self,
+        worker_ports: List[int],
+        host: str = Config.WEBHOOK_HOST,
+        port: int = Config.WEBHOOK_PORT,
+        path: str = Config.WEBHOOK_PATH,
+        secret_token: str = Config.WEBHOOK_SECRET
+    ):
+        self.worker_ports = worker_ports
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret_token = secret_token
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Router webhook aktif di http://%s:%d%s untuk %d worker",
+                    self.host, self.port, self.path, len(self.worker_ports))
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = await read_request(reader)
+                if request.method != 'POST' or request.path != self.path:
+                    raise HttpError('404 Not Found')
+                token = request.headers.get('x-telegram-bot-api-secret-token', '')
+                if not hmac.compare_digest(token.encode(), self.secret_token.encode()):
+                    raise HttpError('403 Forbidden')
+                try:
+                    data = json.loads(request.body)
+                except ValueError:
+                    raise HttpError('400 Bad Request')
+                port = self.worker_ports[update_user_id(data) % len(self.worker_ports)]
+                status = await self.forward(port, request.body)
+            except HttpError as e:
+                status = e.status
+            await write_response(writer, status)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def forward(self, port: int, body: bytes) -> str:
+        """Meneruskan body update ke worker lokal; status selain 200 membuat Telegram mengirim ulang"""
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            return '503 Service Unavailable'
+        try:
+            writer.write(
+                f'POST {WORKER_PATH} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n'
+                f'X-Telegram-Bot-Api-Secret-Token: {self.secret_token}\r\n'
+                f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+            return status_line.decode('latin-1').split(' ', 1)[1].strip() or '502 Bad Gateway'
+        except (ConnectionError, IndexError):
+            return '502 Bad Gateway'
+        finally:
+            writer.close()
+
+def worker_main(index: int, count: int, port: int, ready: Any) -> None:
+    """Titik masuk proses worker: Application lengkap di belakang WebhookServer lokal"""
+    from src.bot import build_application
+    from src.webhook import WebhookServer, serve
+
+    Config.WORKER_INDEX = index
+    Config.WORKERS = count
+    application = build_application()
+    server = WebhookServer(application, host='127.0.0.1', port=port, path=WORKER_PATH)
+
+    async def mark_ready() -> None:
+        ready.set()
+
+    asyncio.run(serve(application, server, mark_ready))
+
+async def run_workers(count: int = Config.WORKERS) -> None:
+    """Menjalankan `count` proses worker dan router webhook sampai SIGINT/SIGTERM"""
+    ctx = multiprocessing.get_context('spawn')
+    ports = [Config.WORKER_PORT_BASE + i for i in range(count)]
+    processes = []
+    try:
+        for index, port in enumerate(ports):
+            ready = ctx.Event()
+            process = ctx.Process(target=worker_main, args=(index, count, port, ready), name=f'worker-{index}')
+            process.start()
+            processes.append(process)
+            # Worker dimulai berurutan: worker 0 mengisi database dari Sheets lebih dulu
+            while not await asyncio.to_thread(ready.wait, 1):
+                if not process.is_alive():
+                    raise RuntimeError(f"Worker {index} berhenti saat startup")
+            logger.info("Worker %d siap di port %d", index, port)
+
+        router = WebhookRouter(ports)
+        await router.start()
+        async with Bot(Config.BOT_TOKEN) as bot:
+            await bot.set_webhook(
+                url=Config.WEBHOOK_URL,
+                secret_token=Config.WEBHOOK_SECRET,
+                allowed_updates=Update.ALL_TYPES,
+                max_connections=Config.WEBHOOK_MAX_CONCURRENCY * count
+            )
+
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+        await stop_event.wait()
+        await router.stop()
+    finally:
+        # SIGTERM membuat tiap worker menyelesaikan update yang sedang diproses
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            await asyncio.to_thread(process.join)
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Callable, List, Optional
+from src.config import Config
+from src.models import Airdrop
+from src.sheets import AsyncSheetsClient, first_updated_row, get_sheets_client, is_permanent
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindQueue:
+    """Antrian write-behind: baris dikumpulkan lalu dikirim dengan satu append_rows.
+
+    Setiap baris dicatat ke journal lokal sebelum diakui, sehingga baris yang belum
+    terkirim dikirim ulang setelah restart. Pengiriman bersifat at-least-once: jika
+    proses mati tepat setelah append_rows berhasil, batch terakhir bisa terkirim dua kali.
+    """
+
+    def __init__(
+        self,
+        client: AsyncSheetsClient,
+        journal_path: str = Config.WRITE_JOURNAL_PATH,
+        flush_interval: float = Config.WRITE_FLUSH_MS / 1000,
+        batch_size: int = Config.WRITE_BATCH_SIZE,
+        max_batch_rows: int = Config.WRITE_MAX_BATCH_ROWS,
+        on_flush: Optional[Callable[[List[Airdrop], Optional[int]], None]] = None
+    ):
+        self.client = client
+        self.journal_path = journal_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size  # jumlah baris tertunda yang memicu flush lebih awal
+        self.max_batch_rows = max_batch_rows  # batas baris per append_rows
+        self.on_flush = on_flush
+        self.pending: List[Airdrop] = []
+        self._wakeup = asyncio.Event()
+        self._journal_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Memuat ulang journal dan menjalankan task flush"""
+        self.pending = await asyncio.to_thread(self._read_journal)
+        if self.pending:
+            logger.info("Memulihkan %d baris dari journal", len(self.pending))
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Menghentikan task flush dan mencoba mengirim sisa antrian"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            while self.pending:
+                await self.flush()
+        except Exception as e:
+            logger.warning("Sisa %d baris tetap di journal: %s", len(self.pending), e)
+
+    async def enqueue(self, record: Airdrop) -> Airdrop:
+        """Menyiapkan baris dan mencatatnya ke journal; kembali setelah tersimpan di disk"""
+        record.prepare()
+        async with self._journal_lock:
+            await asyncio.to_thread(self._append_journal, record)
+            self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self._wakeup.set()
+        return record
+
+    async def enqueue_many(self, records: List[Airdrop]) -> List[Airdrop]:
+        """Seperti enqueue, tetapi seluruh baris dicatat ke journal dengan satu fsync"""
+        prepared = [record.prepare() for record in records]
+        async with self._journal_lock:
+            await asyncio.to_thread(self._write_lines, self.journal_path, prepared, 'a')
+            self.pending.extend(prepared)
+        if len(self.pending) >= self.batch_size:
+            self._wakeup.set()
+        return prepared
+
+    async def _flush_loop(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                while self.pending:
+                    await self.flush()
+                backoff = 1.0
+            except Exception as e:
+                # Baris sudah diakui ke user, jadi hanya penolakan pasti yang dipindahkan dari journal
+                if is_permanent(e):
+                    await self._dead_letter(e)
+                else:
+                    logger.warning("Gagal mengirim antrian, coba lagi dalam %.0f detik: %r", backoff, e)
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, Config.WRITE_MAX_BACKOFF)
+
+    async def flush(self) -> None:
+        """Mengirim satu batch ke Sheets lalu memadatkan journal"""
+        # Satu pengirim pada satu waktu agar batch yang sama tidak terkirim dua kali
+        async with self._flush_lock:
+            batch = self.pending[:self.max_batch_rows]
+            if not batch:
+                return
+            response = await self.client.append_rows([record.to_row() for record in batch])
+            async with self._journal_lock:
+                del self.pending[:len(batch)]
+                await asyncio.to_thread(self._rewrite_journal, list(self.pending))
+        logger.info("Data berhasil disimpan: %d baris", len(batch))
+        if self.on_flush:
+            self.on_flush(batch, first_updated_row(response))
+
+    async def _dead_letter(self, error: Exception) -> None:
+        """Memindahkan batch yang ditolak permanen ke file .failed agar antrian tidak macet"""
+        batch = self.pending[:self.max_batch_rows]
+        logger.error("Batch ditolak Sheets, dipindahkan ke %s.failed: %s", self.journal_path, error)
+        async with self._journal_lock:
+            del self.pending[:len(batch)]
+            await asyncio.to_thread(self._write_lines, self.journal_path + '.failed', batch, 'a')
+            await asyncio.to_thread(self._rewrite_journal, list(self.pending))
+
+    def _read_journal(self) -> List[Airdrop]:
+        if not os.path.exists(self.journal_path):
+            return []
+        rows = []
+        with open(self.journal_path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(Airdrop.from_row(json.loads(line)))
+                except (json.JSONDecodeError, TypeError, ValueError):
+                    logger.warning("Baris journal rusak dilewati: %s", line)
+        return rows
+
+    def _append_journal(self, record: Airdrop) -> None:
+        self._write_lines(self.journal_path, [record], 'a')
+
+    def _rewrite_journal(self, rows: List[Airdrop]) -> None:
+        tmp_path = self.journal_path + '.tmp'
+        self._write_lines(tmp_path, rows, 'w')
+        os.replace(tmp_path, self.journal_path)
+
+    @staticmethod
+    def _write_lines(path: str, rows: List[Airdrop], mode: str) -> None:
+        with open(path, mode, encoding='utf-8') as f:
+            for record in rows:
+                f.write(json.dumps(record.to_row(), ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+_shared_queue: Optional[WriteBehindQueue] = None
+
+def get_write_queue() -> WriteBehindQueue:
+    """Mendapatkan antrian tulis bersama untuk seluruh proses"""
+    global _shared_queue
+    if _shared_queue is None:
+        journal_path = Config.WRITE_JOURNAL_PATH
+        if Config.WORKERS > 1:
+            journal_path = f'{journal_path}.{Config.WORKER_INDEX}'  # satu journal per worker
+        _shared_queue = WriteBehindQueue(get_sheets_client(), journal_path=journal_path)
+    return _shared_queue
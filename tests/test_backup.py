@@ -0,0 +1,57 @@
+import os
+import sqlite3
+import pytest
+from src.backup import IncrementalBackup
+from src.models import Airdrop
+
+def row(*values):
+    return list(values)
+
+def test_compact_merges_snapshots_outside_retention(tmp_path):
+    backups = IncrementalBackup(str(tmp_path), retention=2, chunk_rows=2)
+    first = backups.write_snapshot([(1, row('a')), (2, row('b'))])
+    second = backups.write_snapshot([(2, row('b2'))])
+    third = backups.write_snapshot([(3, row('c'))])
+    expected = {name: backups.materialize(name) for name in (second, third)}
+
+    assert backups.compact() == 2  # chunk snapshot pertama dan chunk lama snapshot kedua
+    assert [m['name'] for m in backups.snapshots()] == [second, third]
+    assert {name: backups.materialize(name) for name in (second, third)} == expected
+    with pytest.raises(KeyError):
+        backups.materialize(first)
+    referenced = {chunk for m in backups.snapshots() for chunk in m['chunks']}
+    assert {f.split('.', 1)[0] for f in os.listdir(backups.chunk_dir)} == referenced
+    assert backups.compact() == 0
+
+def test_write_snapshot_compacts_at_twice_the_retention(tmp_path):
+    backups = IncrementalBackup(str(tmp_path), retention=2)
+    for i in range(3):
+        backups.write_snapshot([(i, row(str(i)))])
+    assert len(backups.snapshots()) == 3
+    last = backups.write_snapshot([(0, row('baru'))])
+    snapshots = backups.snapshots()
+    assert len(snapshots) == 2 and snapshots[0]['compacted']
+    assert backups.materialize(last) == {0: ['baru'], 1: ['1'], 2: ['2']}
+
+def sheet_row(nama):
+    return Airdrop(nama=nama, link=f'https://{nama}.xyz', status='Active').to_row()
+
+def test_rows_missing_from_a_shorter_sheet_are_not_restored(tmp_path):
+    backups = IncrementalBackup(str(tmp_path), retention=2)
+    first = backups.snapshot_rows([(2, sheet_row('a')), (3, sheet_row('b')), (4, sheet_row('c'))])
+    # Baris 3 dihapus di sheet: baris 4 bergeser naik dan sheet memendek
+    second = backups.snapshot_rows([(2, sheet_row('a')), (3, sheet_row('c'))])
+    assert backups.snapshots()[-1]['rows'] == 2  # baris 3 berubah, baris 4 tombstone
+    assert sorted(backups.materialize(first)) == [2, 3, 4]
+    assert backups.materialize(second) == {2: sheet_row('a'), 3: sheet_row('c')}
+
+    third = backups.snapshot_rows([(2, sheet_row('a')), (3, sheet_row('c')), (4, sheet_row('d'))])
+    assert backups.compact() > 0
+    assert backups.materialize(second) == {2: sheet_row('a'), 3: sheet_row('c')}
+    assert sorted(backups.materialize(third)) == [2, 3, 4]
+
+    path = str(tmp_path / 'restored.db')
+    assert backups.restore_to_sqlite(second, path) == 2
+    conn = sqlite3.connect(path)
+    assert [r[0] for r in conn.execute('SELECT nama FROM airdrops ORDER BY id')] == ['a', 'c']
+    conn.close()
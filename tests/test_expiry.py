@@ -0,0 +1,55 @@
+import asyncio
+from datetime import timedelta
+from src.expiry import ExpiryScheduler
+from src.models import Airdrop
+from src.storage import SQLiteRepository
+from src.utils import today
+
+class FakeJob:
+    def __init__(self, when):
+        self.when = when
+        self.removed = False
+
+    def schedule_removal(self):
+        self.removed = True
+
+class FakeJobQueue:
+    def __init__(self):
+        self.jobs = []
+
+    def run_once(self, callback, when, name=None):
+        self.jobs.append(FakeJob(when))
+        return self.jobs[-1]
+
+def test_rows_written_by_another_process_are_expired(tmp_path):
+    path = str(tmp_path / 'airdrops.db')
+    current = today()
+
+    async def main():
+        repository, other = SQLiteRepository(path), SQLiteRepository(path)
+        await repository.start()
+        await other.start()
+        job_queue = FakeJobQueue()
+        scheduler = ExpiryScheduler(repository, job_queue)
+        await scheduler.start()
+        # Heap kosong, tetapi tetap bangun tengah malam nanti
+        assert scheduler.heap == [] and len(job_queue.jobs) == 1
+        assert job_queue.jobs[0].when <= 24 * 3600 + 1
+
+        # Misalnya CLI src.bulk: tidak lewat add listener repository bot
+        await other.add_many([
+            Airdrop(nama='Hari Ini', link='https://hari-ini.xyz', deadline=current.isoformat(), status='Active'),
+            Airdrop(nama='Besok', link='https://besok.xyz', deadline=(current + timedelta(days=1)).isoformat(),
+                    status='Active'),
+        ])
+        await scheduler._run(None)
+        statuses = await repository._run(
+            lambda: repository.conn.execute('SELECT nama, status FROM airdrops ORDER BY id').fetchall()
+        )
+        assert statuses == [('Hari Ini', 'Ended'), ('Besok', 'Active')]
+        assert [due for due, _ in scheduler.heap] == [current + timedelta(days=1)]
+        assert len(job_queue.jobs) == 2
+        await repository.stop()
+        await other.stop()
+
+    asyncio.run(main())
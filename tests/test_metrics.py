@@ -0,0 +1,23 @@
+import asyncio
+import pytest
+from telegram.ext import ApplicationHandlerStop
+from src.metrics import HANDLER_ERRORS, timed_handler
+
+def errors(name: str) -> float:
+    return HANDLER_ERRORS.values.get((('handler', name),), 0)
+
+def test_handler_stop_is_not_an_error():
+    async def limited(update, context):
+        raise ApplicationHandlerStop
+
+    with pytest.raises(ApplicationHandlerStop):
+        asyncio.run(timed_handler('test_limited', limited)(None, None))
+    assert errors('test_limited') == 0
+
+def test_exceptions_are_counted():
+    async def broken(update, context):
+        raise RuntimeError('gagal')
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(timed_handler('test_broken', broken)(None, None))
+    assert errors('test_broken') == 1
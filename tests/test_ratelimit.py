@@ -0,0 +1,56 @@
+import pytest
+from src.ratelimit import TokenBucketLimiter, classify
+
+LIMITS = {'read': (2, 1.0), 'conversation': (1, 0.5)}
+
+def test_bucket_refills_over_time():
+    limiter = TokenBucketLimiter(LIMITS, global_per_minute=600)
+    assert limiter.acquire(1, 'read', now=0.0) == 0
+    assert limiter.acquire(1, 'read', now=0.0) == 0
+    assert limiter.acquire(1, 'read', now=0.0) == pytest.approx(1.0)
+    assert limiter.acquire(1, 'read', now=0.5) == pytest.approx(0.5)
+    assert limiter.acquire(1, 'read', now=1.0) == 0
+    # Bucket per user dan per kelas
+    assert limiter.acquire(2, 'read', now=1.0) == 0
+    assert limiter.acquire(1, 'conversation', now=1.0) == 0
+
+def test_global_bucket_only_for_sheets_classes():
+    limiter = TokenBucketLimiter(LIMITS, global_per_minute=2)
+    assert limiter.acquire(1, 'read', now=0.0) == 0
+    assert limiter.acquire(2, 'read', now=0.0) == 0
+    assert limiter.acquire(3, 'read', now=0.0) == pytest.approx(30.0)
+    assert limiter.acquire(3, 'conversation', now=0.0) == 0
+    # Ditolak oleh bucket global tidak memakai token user
+    assert limiter.acquire(3, 'read', now=30.0) == 0
+
+def test_sweep_drops_refilled_buckets():
+    limiter = TokenBucketLimiter(LIMITS, global_per_minute=600, shards=1, sweep_every=3)
+    limiter.acquire(1, 'read', now=0.0)
+    limiter.acquire(2, 'read', now=0.0)
+    assert len(limiter) == 2
+    limiter.acquire(1, 'conversation', now=0.5)  # sweep: bucket 'read' belum penuh
+    assert len(limiter) == 3
+    for _ in range(3):
+        limiter.acquire(3, 'conversation', now=10.0)
+    assert len(limiter) == 1
+    assert limiter.acquire(1, 'read', now=10.0) == 0
+
+def test_export_and_restore_keep_partial_buckets():
+    limiter = TokenBucketLimiter(LIMITS, global_per_minute=600)
+    limiter.acquire(1, 'read', now=0.0)
+    limiter.acquire(1, 'read', now=0.0)
+    limiter.acquire(2, 'read', now=0.0)
+    entries = limiter.export(now=0.5)
+    assert entries == {(1, 'read'): (0.0, 0.5), (2, 'read'): (1.0, 0.5)}
+
+    restored = TokenBucketLimiter(LIMITS, global_per_minute=600)
+    restored.restore({**entries, (3, 'admin'): (0.0, 0.0)}, now=100.0)
+    assert len(restored) == 2
+    assert restored.acquire(1, 'read', now=100.0) == pytest.approx(0.5)
+
+def test_classify():
+    assert classify('/list galxe') == 'read'
+    assert classify('/LIST@airdrop_bot') == 'read'
+    assert classify('/unknown') == 'conversation'
+    assert classify(' Ya ') == 'write'
+    assert classify(None) == 'conversation'
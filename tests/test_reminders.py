@@ -0,0 +1,88 @@
+import asyncio
+from datetime import date, timedelta
+from src.models import Airdrop
+from src.reminders import (
+    MAX_ITEMS_PER_MESSAGE, REMINDERS, DeadlineIndex, ReminderScheduler, format_reminders, subscribe, topic
+)
+from src.state import MemoryStateStore
+from src.utils import today
+
+class FakeRepository:
+    def __init__(self, records):
+        self.records = records
+        self.add_listeners = []
+
+    async def list_active(self):
+        return self.records
+
+class FakeJobQueue:
+    def __init__(self):
+        self.daily = []
+
+    def run_daily(self, callback, time, name=None):
+        self.daily.append(time)
+
+class FakeQueue:
+    def __init__(self):
+        self.sent = []
+
+    def put(self, chat_id, text, priority=0):
+        self.sent.append(chat_id)
+
+def make_scheduler(current: date):
+    record = Airdrop(nama='Galxe Quest', link='https://quest.xyz', type='Galxe', network='Ethereum',
+                     deadline=(current + timedelta(days=1)).isoformat(), status='Active')
+    store = MemoryStateStore()
+    queue = FakeQueue()
+    scheduler = ReminderScheduler(FakeRepository([Airdrop.from_row(record.to_row())]), FakeJobQueue(), store,
+                                  queue=queue)
+    return scheduler, store, queue
+
+def test_daily_job_uses_configured_timezone():
+    scheduler, _, _ = make_scheduler(today())
+    asyncio.run(scheduler.start())
+    (when,) = scheduler.job_queue.daily
+    assert when.tzinfo is scheduler.tz
+    assert when.replace(tzinfo=None) == scheduler.send_at
+
+def test_round_runs_once_per_day():
+    async def main():
+        current = today()
+        scheduler, store, queue = make_scheduler(current)
+        await subscribe(store, 42, topic('type', 'Galxe'))
+        scheduler.index.load(await scheduler.repository.list_active(), current)
+        assert await scheduler.run_once(current) == 1
+        # Restart di hari yang sama: catch-up dan job terjadwal tidak mengirim ulang
+        assert await scheduler.run_once(current) == 0
+        assert queue.sent == [42]
+        assert await store.hget(REMINDERS, 'last_run') == current.isoformat()
+
+    asyncio.run(main())
+
+def test_format_reminders_groups_items_by_days_left():
+    soon = Airdrop(nama='Besok', link='https://besok.xyz', type='Galxe', deadline='2026-01-02')
+    later = Airdrop(nama='Nanti', link='https://nanti.xyz', type='Testnet', network='Solana', deadline='2026-01-04')
+    (text,) = format_reminders([(3, later), (1, soon)])
+    assert text.index('1. Besok (berakhir malam ini, Deadline 2026-01-02)') < text.index('2. Nanti (tinggal 3 hari')
+    assert 'Type: Galxe | Network: Tidak ada' in text
+    assert 'Type: Testnet | Network: Solana' in text
+
+def test_format_reminders_summarizes_and_splits_long_messages():
+    records = [(1, Airdrop(nama=f'Airdrop {i:02d}', link='https://x.xyz/' + 'a' * 300)) for i in range(25)]
+    parts = format_reminders(records)
+    assert len(parts) > 1 and all(len(part) <= 4000 for part in parts)
+    text = ''.join(parts)
+    assert f'{MAX_ITEMS_PER_MESSAGE}. Airdrop {MAX_ITEMS_PER_MESSAGE - 1:02d}' in text
+    assert 'Airdrop 20' not in text
+    assert text.endswith(f'... dan {25 - MAX_ITEMS_PER_MESSAGE} lainnya. Gunakan /list --deadline <tanggal> untuk detail.')
+
+def test_deadline_index_range_add_and_prune():
+    index = DeadlineIndex()
+    index.load([Airdrop(nama=n, deadline=d) for n, d in
+                [('B', '2026-01-03'), ('Lewat', '2025-12-31'), ('A', '2026-01-02'), ('Kosong', '')]], date(2026, 1, 1))
+    assert [r.nama for r in index.between(date(2026, 1, 1), date(2026, 1, 31))] == ['A', 'B']
+    index.add(Airdrop(nama='C', deadline='2026-01-02'))
+    index.add(Airdrop(nama='Tanpa'))
+    assert [r.nama for r in index.between(date(2026, 1, 2), date(2026, 1, 2))] == ['A', 'C']
+    index.prune(date(2026, 1, 3))
+    assert [r.nama for r in index.records] == ['B']
@@ -0,0 +1,65 @@
+from datetime import date
+from src.models import Airdrop
+from src.search import SearchIndex, SearchQuery
+
+TODAY = date(2026, 1, 1)
+
+def make_index():
+    return SearchIndex.build([
+        Airdrop(nama='zkSync Era', type='Galxe', network='Ethereum', reward='100 ZK', deadline='2026-02-01'),
+        Airdrop(nama='Scroll', type='Testnet', network='Ethereum', deadline='2026-01-10'),
+        Airdrop(nama='LayerZero', type='Galxe', network='Arbitrum'),
+        Airdrop(nama='Old Galxe', type='Galxe', status='Ended'),
+        Airdrop(nama='Past', type='Galxe', deadline='2025-12-01'),
+    ])
+
+def names(result):
+    records, total = result
+    return [record.nama for record in records], total
+
+def test_exact_terms_skip_ended_and_past_deadlines():
+    index = make_index()
+    # Deadline terdekat lebih dulu; tanpa Deadline paling akhir
+    assert names(index.search(SearchQuery(('galxe',)), TODAY)) == (['zkSync Era', 'LayerZero'], 2)
+    assert names(index.search(SearchQuery(('galxe', 'ethereum')), TODAY)) == (['zkSync Era'], 1)
+    assert names(index.search(SearchQuery(('solana',)), TODAY)) == ([], 0)
+
+def test_prefix_and_fuzzy_terms():
+    index = make_index()
+    assert names(index.search(SearchQuery(('zks',)), TODAY)) == (['zkSync Era'], 1)
+    assert names(index.search(SearchQuery(('layer',)), TODAY)) == (['LayerZero'], 1)
+    # Penggantian, hapusan, dan tukar posisi satu huruf
+    assert names(index.search(SearchQuery(('galxy',)), TODAY)) == (['zkSync Era', 'LayerZero'], 2)
+    assert names(index.search(SearchQuery(('sroll',)), TODAY)) == (['Scroll'], 1)
+    assert names(index.search(SearchQuery(('sclorl',)), TODAY)) == ([], 0)
+    assert names(index.search(SearchQuery(('scorll',)), TODAY)) == (['Scroll'], 1)
+
+def test_exact_match_scores_above_prefix():
+    index = SearchIndex.build([
+        Airdrop(nama='Zora Network', deadline='2026-01-05'),
+        Airdrop(nama='Zor', deadline='2026-03-01'),
+    ])
+    assert names(index.search(SearchQuery(('zor',)), TODAY)) == (['Zor', 'Zora Network'], 2)
+
+def test_date_range():
+    index = make_index()
+    assert names(index.search(SearchQuery((), after=date(2026, 1, 5), before=date(2026, 1, 31)), TODAY)) == (['Scroll'], 1)
+    assert names(index.search(SearchQuery((), after=date(2026, 1, 15)), TODAY)) == (['zkSync Era'], 1)
+    assert names(index.search(SearchQuery((), before=date(2026, 1, 10)), TODAY)) == (['Scroll'], 1)
+    assert names(index.search(SearchQuery(('ethereum',), before=date(2026, 1, 31)), TODAY)) == (['Scroll'], 1)
+    assert index.search(SearchQuery(()), TODAY) == ([], 0)
+
+def test_add_matches_build():
+    records = [
+        Airdrop(nama='Scroll', type='Testnet', deadline='2026-01-10'),
+        Airdrop(nama='Scrollmania', type='Galxe', deadline='2026-01-03'),
+        Airdrop(nama='Base', type='Testnet'),
+    ]
+    built = SearchIndex.build(records)
+    added = SearchIndex()
+    for record in records:
+        added.add(record)
+    assert added.vocab == built.vocab
+    assert added.dates == built.dates
+    for query in [SearchQuery(('scrol',)), SearchQuery(('testnt',)), SearchQuery((), before=date(2026, 1, 5))]:
+        assert names(added.search(query, TODAY)) == names(built.search(query, TODAY))
@@ -0,0 +1,52 @@
+import pytest
+from bench.fake_sheets import FakeGspreadClient
+from src.models import HEADERS
+from src.sheets import GoogleSheetsClient, _gviz_text, status_updates
+
+# Urutan kolom berbeda dari HEADERS, seperti sheet yang disusun ulang secara manual
+LAYOUT = ['Timestamp', 'Status', 'Nama', 'Network', 'Type', 'Link', 'Deadline', 'Reward', 'User ID',
+          'Twitter', 'Discord', 'Telegram']
+
+def rows(*records):
+    table = [list(LAYOUT)]
+    for nama, type_, network, deadline, status in records:
+        values = {'Nama': nama, 'Type': type_, 'Network': network, 'Deadline': deadline, 'Status': status,
+                  'Link': f'https://{nama.lower()}.xyz'}
+        table.append([values.get(name, '') for name in LAYOUT])
+    return table
+
+DATA = rows(
+    ('Alpha', 'Galxe', 'Ethereum', '2030-01-02', 'Active'),
+    ('Beta', 'Galxe', 'Polygon', '2030-01-02', 'Active'),
+    ('Gamma', 'Testnet', 'Ethereum', '2030-01-02', 'Active'),
+    ('Delta', 'Galxe', 'Ethereum', '2030-05-06', 'Ended'),
+    ('Epsilon', 'galxe', 'ethereum', '2030-01-02', 'Active'),
+)
+
+@pytest.mark.parametrize('date_columns', [(), ('Deadline',)])
+def test_query_active_uses_sheet_header_and_column_type(date_columns):
+    client = GoogleSheetsClient(FakeGspreadClient([list(r) for r in DATA], date_columns=date_columns))
+    records, total = client.query_active('Galxe', 'Ethereum', '2030-01-02')
+    assert total == 2
+    assert [(r.nama, r.deadline, r.type) for r in records] == [('Alpha', '2030-01-02', 'Galxe'),
+                                                                ('Epsilon', '2030-01-02', 'galxe')]
+    records, total = client.query_active(limit=2, offset=1)
+    assert total == 4
+    assert [r.nama for r in records] == ['Beta', 'Gamma']
+
+def test_query_active_requires_known_columns():
+    table = [[name for name in HEADERS if name != 'Deadline']]
+    client = GoogleSheetsClient(FakeGspreadClient(table))
+    with pytest.raises(ValueError):
+        client.query_active()
+
+def test_gviz_values_become_cell_text():
+    assert _gviz_text('Date(2030,0,2)', 'date') == '2030-01-02'
+    assert _gviz_text('Date(2030,11,31,8,0,0)', 'datetime') == '2030-12-31'
+    assert _gviz_text(1234.0, 'number') == '1234'
+    assert _gviz_text(None, 'string') == ''
+
+def test_status_updates_groups_adjacent_rows():
+    updates = status_updates([(5, 'Ended'), (3, 'Ended'), (4, 'Ended'), (9, 'Ended')])
+    assert [u['range'] for u in updates] == ['J3:J5', 'J9:J9']
+    assert updates[0]['values'] == [['Ended']] * 3
@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from src.ratelimit import TokenBucketLimiter
+from src.state import (
+    MemoryStateStore, SQLiteStateStore, StorePersistence, load_rate_limits, save_rate_limits
+)
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_store(request, tmp_path):
+    if request.param == 'memory':
+        store = MemoryStateStore()
+        return lambda: store
+    return lambda: SQLiteStateStore(str(tmp_path / 'state.db'))
+
+def test_persistence_round_trip(make_store):
+    async def main():
+        store = make_store()
+        persistence = StorePersistence(store)
+        await persistence.update_user_data(10, {'nama': 'Proyek', 'step': 2})
+        await persistence.update_user_data(11, {'nama': 'Lain'})
+        await persistence.update_user_data(11, {})  # user_data kosong dihapus
+        await persistence.update_conversation('submit', (10, 10), 3)
+        await persistence.update_conversation('submit', (11, 11), 1)
+        await persistence.update_conversation('submit', (11, 11), None)
+        await store.aclose()
+
+        # Seperti setelah restart: store dibuka ulang
+        restored = StorePersistence(make_store())
+        assert await restored.get_user_data() == {10: {'nama': 'Proyek', 'step': 2}}
+        assert await restored.get_conversations('submit') == {(10, 10): 3}
+        assert await restored.get_conversations('lain') == {}
+        await restored.store.aclose()
+
+    asyncio.run(main())
+
+def test_persistence_loads_only_the_workers_partition(make_store):
+    async def main():
+        store = make_store()
+        writer = StorePersistence(store)
+        for user_id in range(4):
+            await writer.update_user_data(user_id, {'user': user_id})
+            await writer.update_conversation('submit', (-100, user_id), user_id)
+        workers = [StorePersistence(store, partition=(index, 2)) for index in range(2)]
+        assert await workers[0].get_user_data() == {0: {'user': 0}, 2: {'user': 2}}
+        assert await workers[1].get_user_data() == {1: {'user': 1}, 3: {'user': 3}}
+        # Key percakapan dibagi menurut user (elemen terakhir), bukan chat
+        assert await workers[1].get_conversations('submit') == {(-100, 1): 1, (-100, 3): 3}
+        await store.aclose()
+
+    asyncio.run(main())
+
+def test_rate_limits_are_restored_per_partition(make_store):
+    async def main():
+        store = make_store()
+        limiter = TokenBucketLimiter({'read': (1, 0.01)}, global_per_minute=600)
+        limiter.acquire(1, 'read')
+        limiter.acquire(2, 'read')
+        assert await save_rate_limits(limiter, store) == 2
+
+        worker = TokenBucketLimiter({'read': (1, 0.01)}, global_per_minute=600)
+        assert await load_rate_limits(worker, store, partition=(1, 2)) == 1
+        assert worker.acquire(1, 'read') > 0
+        assert worker.acquire(2, 'read') == 0  # milik worker lain, tidak dimuat
+        assert list(await store.hgetall('rate_limits')) == ['2:read']
+        await store.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+import asyncio
+from bench.fake_sheets import FakeGspreadClient, make_rows
+from src.index import AirdropIndex
+from src.models import HEADERS, Airdrop
+from src.sheets import AsyncSheetsClient, GoogleSheetsClient
+from src.storage import DuplicateError, SheetsRepository, SQLiteRepository
+from src.write_queue import WriteBehindQueue
+
+class FakeMirrorClient:
+    """AsyncSheetsClient tiruan: get_all_values gagal selama `failures` kali pertama"""
+
+    def __init__(self, rows, failures: int = 0):
+        self.rows = rows
+        self.failures = failures
+        self.appended = []
+        self.fetches = 0
+
+    async def get_all_values(self, priority=None):
+        self.fetches += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('Sheets tidak bisa dihubungi')
+        return [list(r) for r in self.rows]
+
+    async def get_worksheet(self, priority=None):
+        return None
+
+    async def append_rows(self, rows, priority=None):
+        first = len(self.rows) + 1
+        self.rows.extend(rows)
+        self.appended.extend(rows)
+        return {'updates': {'updatedRange': f'airdropbot!A{first}:L{len(self.rows)}'}}
+
+    async def batch_update(self, updates, priority=None):
+        pass
+
+async def count(repository: SQLiteRepository) -> int:
+    return await repository._run(lambda: repository.conn.execute('SELECT COUNT(*) FROM airdrops').fetchone()[0])
+
+def test_bootstrap_is_retried_until_the_sheet_loads(tmp_path):
+    path = str(tmp_path / 'airdrops.db')
+    client = FakeMirrorClient(make_rows(3), failures=2)
+
+    async def main():
+        repository = SQLiteRepository(path, client)
+        await repository.start()  # tidak menunggu Sheets
+        await repository.add(Airdrop(nama='Baru', link='https://baru.xyz', type='Galxe'))
+        try:
+            await repository.warm_up()
+            raise AssertionError('warm_up seharusnya gagal')
+        except ConnectionError:
+            pass
+        # Mirror tidak mengirim baris lokal sebelum isi sheet diimpor
+        try:
+            await repository._mirror.sync_once()
+        except ConnectionError:
+            pass
+        assert client.appended == []
+
+        await repository.warm_up()
+        assert await count(repository) == 4
+        await repository._mirror.sync_once()
+        assert [row[0] for row in client.appended] == ['Baru']
+        await repository.stop()
+
+        # Flag tersimpan di database: restart tidak mengimpor ulang
+        fetches = client.fetches
+        repository = SQLiteRepository(path, client)
+        await repository.start()
+        await repository.warm_up()
+        assert client.fetches == fetches
+        assert await count(repository) == 4
+        await repository.stop()
+
+    asyncio.run(main())
+
+def make_sheets_repository(tmp_path, rows):
+    fake = FakeGspreadClient(rows)
+    client = AsyncSheetsClient(GoogleSheetsClient(fake))
+    queue = WriteBehindQueue(client, journal_path=str(tmp_path / 'journal.jsonl'))
+    return fake, SheetsRepository(client, AirdropIndex(client), queue)
+
+def sheet_row(nama: str, deadline: str, status: str = 'Active'):
+    return [nama, '', '', '', f'https://{nama.lower()}.xyz', 'Galxe', deadline, '', '', status, 'Ethereum', '']
+
+def test_expire_follows_rows_moved_in_the_sheet(tmp_path):
+    rows = [list(HEADERS), sheet_row('Lewat', '2000-01-01'), sheet_row('Nanti', '2999-01-01')]
+    fake, repository = make_sheets_repository(tmp_path, rows)
+
+    async def main():
+        pending = sorted(await repository.pending_deadlines())
+        due = [row for deadline, row in pending if deadline.year == 2000]
+        assert due == [2]
+        # Baris disisipkan langsung di sheet setelah heap dimuat
+        fake.spreadsheet.main.rows.insert(1, sheet_row('Sisipan', '2999-01-01'))
+        assert await repository.expire(due) == 1
+
+    asyncio.run(main())
+    statuses = {row[0]: row[9] for row in fake.spreadsheet.main.rows[1:]}
+    assert statuses == {'Sisipan': 'Active', 'Lewat': 'Ended', 'Nanti': 'Active'}
+
+def test_expire_skips_rows_that_no_longer_exist(tmp_path):
+    rows = [list(HEADERS), sheet_row('Lewat', '2000-01-01'), sheet_row('Nanti', '2999-01-01')]
+    fake, repository = make_sheets_repository(tmp_path, rows)
+
+    async def main():
+        await repository.pending_deadlines()
+        del fake.spreadsheet.main.rows[1]
+        assert await repository.expire([2]) == 0
+
+    asyncio.run(main())
+    assert [row[9] for row in fake.spreadsheet.main.rows[1:]] == ['Active']
+
+def test_migrate_keeps_duplicate_links_but_only_one_holds_the_key(tmp_path):
+    path = str(tmp_path / 'airdrops.db')
+
+    async def main():
+        repository = SQLiteRepository(path)
+        await repository.start()
+        await repository._run(repository.conn.execute, 'DROP INDEX idx_airdrops_link_key_unique')
+        await repository.add(Airdrop(nama='Satu', link='https://sama.xyz/', type='Galxe'))
+        await repository.add(Airdrop(nama='Dua', link='https://www.sama.xyz', type='Galxe'))
+        await repository.stop()
+
+        repository = SQLiteRepository(path)
+        await repository.start()
+        rows = await repository._run(
+            lambda: repository.conn.execute('SELECT nama, link_key FROM airdrops ORDER BY id').fetchall()
+        )
+        assert rows == [('Satu', 'sama.xyz'), ('Dua', '')]
+        await repository.stop()
+
+    asyncio.run(main())
+
+def test_second_connection_cannot_store_the_same_link(tmp_path):
+    path = str(tmp_path / 'airdrops.db')
+
+    async def main():
+        first, second = SQLiteRepository(path), SQLiteRepository(path)
+        await first.start()
+        await second.start()
+        await first.add(Airdrop(nama='Satu', link='https://sama.xyz', type='Galxe'), unique=True)
+        # Tanpa pengecekan awal (seperti worker lain yang lolos cek bersamaan)
+        try:
+            await second.add(Airdrop(nama='Dua', link='http://sama.xyz/', type='Galxe'))
+            raise AssertionError('Link ganda seharusnya ditolak')
+        except DuplicateError as e:
+            assert e.field == 'Link'
+        stored = await second.add_many([
+            Airdrop(nama='Tiga', link='https://sama.xyz?utm_source=x', type='Galxe'),
+            Airdrop(nama='Empat', link='https://empat.xyz', type='Galxe'),
+        ])
+        assert [record.nama for record in stored] == ['Empat']
+        assert await count(first) == 2
+        await first.stop()
+        await second.stop()
+
+    asyncio.run(main())
+
+def test_bootstrap_mirrors_sheet_rows_with_duplicate_links(tmp_path):
+    rows = [list(HEADERS), sheet_row('Sama', ''), sheet_row('Sama', ''), sheet_row('Lain', '')]
+    client = FakeMirrorClient(rows)
+
+    async def main():
+        repository = SQLiteRepository(str(tmp_path / 'airdrops.db'), client)
+        await repository.start()
+        await repository.warm_up()
+        keys = await repository._run(
+            lambda: repository.conn.execute('SELECT sheet_row, link_key FROM airdrops ORDER BY id').fetchall()
+        )
+        assert keys == [(2, 'sama.xyz'), (3, ''), (4, 'lain.xyz')]
+        await repository.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+import random
+from src.config import Config
+from src.models import Airdrop
+from src.utils import _SIMPLE_URL, _normalize_parsed, normalize_url, today
+
+def random_simple_urls(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    hosts = ['example.com', 'www.example.com', 'x.com', 'twitter.com', 'www.x.com', 'discordapp.com',
+             'discord.gg', 'a-b.c0.io', 'mobile.twitter.com', 'www.', 'localhost']
+    segments = ['', 'a', 'B', 'invite', 'AbC123', 'x y', '%20', '~user', 'status', '123', '.', '..', 'é']
+    for _ in range(n):
+        path = ''.join('/' + rng.choice(segments) for _ in range(rng.randint(0, 4)))
+        if rng.random() < 0.3:
+            path += '/' * rng.randint(1, 3)
+        yield f"{rng.choice(['http', 'https', 'HTTPS', 'Http'])}://{rng.choice(hosts)}{path}"
+
+def test_fast_path_matches_urlparse_path():
+    checked = 0
+    for url in random_simple_urls(5000):
+        if _SIMPLE_URL.fullmatch(url):
+            checked += 1
+            assert normalize_url(url) == _normalize_parsed(url), url
+    assert checked > 4000
+
+def test_normalize_url():
+    cases = {
+        'https://www.Example.com/path/': 'example.com/path',
+        'http://example.com:80/a': 'example.com/a',
+        'https://example.com:8443/a': 'example.com:8443/a',
+        'https://x.com/user?utm_source=tg&s=20': 'twitter.com/user',
+        'https://example.com/p?b=2&a=1&fbclid=x': 'example.com/p?a=1&b=2',
+        'https://discord.gg/AbC': 'discord.gg/AbC',
+        'https://discordapp.com/invite/AbC/': 'discord.com/invite/AbC',
+        'ftp://example.com': None,
+        'not a url': None,
+        '': None,
+    }
+    for url, expected in cases.items():
+        assert normalize_url(url) == expected, url
+
+def test_today_and_deadline_status_follow_configured_timezone(monkeypatch):
+    # UTC+14 selalu satu atau dua hari di depan UTC-12
+    monkeypatch.setattr(Config, 'TIMEZONE', 'Etc/GMT-14')
+    ahead = today()
+    record = Airdrop(nama='Tepat', deadline=ahead.isoformat())
+    assert record.prepare().status == 'Ended'
+    monkeypatch.setattr(Config, 'TIMEZONE', 'Etc/GMT+12')
+    assert today() < ahead
+    assert Airdrop(nama='Tepat', deadline=ahead.isoformat()).prepare().status == 'Active'
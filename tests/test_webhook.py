@@ -0,0 +1,101 @@
+import asyncio
+import json
+from telegram import Update
+from src.webhook import WebhookServer
+
+SECRET = 'test-secret'
+
+def update_data(update_id: int, chat_id: int, text: str = '/help') -> dict:
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id, 'date': 0, 'text': text,
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': {'id': chat_id, 'is_bot': False, 'first_name': 'User'},
+        },
+    }
+
+class FakeApplication:
+    """Application tiruan: process_update menunggu `delays[update_id]` detik lalu mencatat urutan"""
+
+    def __init__(self, delays=None):
+        self.bot = None
+        self.delays = delays or {}
+        self.processed = []
+
+    async def process_update(self, update: Update) -> None:
+        await asyncio.sleep(self.delays.get(update.update_id, 0))
+        self.processed.append(update.update_id)
+
+async def post(port: int, body: bytes, secret: str = SECRET, path: str = '/telegram') -> int:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(
+        f'POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n'
+        f'X-Telegram-Bot-Api-Secret-Token: {secret}\r\nContent-Length: {len(body)}\r\n\r\n'.encode() + body
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1])
+
+def make_server(application: FakeApplication, max_concurrency: int = 8) -> WebhookServer:
+    return WebhookServer(application, host='127.0.0.1', port=0, path='/telegram',
+                         secret_token=SECRET, max_concurrency=max_concurrency)
+
+def test_requests_are_checked_before_processing():
+    async def main():
+        application = FakeApplication()
+        server = make_server(application)
+        await server.start()
+        body = json.dumps(update_data(1, 7)).encode()
+        assert await post(server.port, body, secret='salah') == 403
+        assert await post(server.port, body, secret='') == 403
+        assert await post(server.port, body, path='/lain') == 404
+        assert await post(server.port, b'bukan json') == 400
+        assert await post(server.port, body) == 200
+        await server.stop()
+        assert application.processed == [1]
+
+    asyncio.run(main())
+
+def test_updates_from_one_chat_keep_their_order():
+    async def main():
+        # Update pertama chat 1 paling lambat; chat 2 tidak ikut menunggu
+        application = FakeApplication({1: 0.1, 2: 0.0, 3: 0.0})
+        server = make_server(application)
+        for update_id, chat_id in [(1, 1), (2, 2), (3, 1)]:
+            await server.submit(Update.de_json(update_data(update_id, chat_id), None))
+        await server.stop()
+        assert application.processed == [2, 1, 3]
+
+    asyncio.run(main())
+
+def test_concurrency_is_bounded():
+    async def main():
+        application = FakeApplication({i: 0.05 for i in range(1, 5)})
+        server = make_server(application, max_concurrency=2)
+        for update_id in range(1, 5):
+            await server.submit(Update.de_json(update_data(update_id, update_id), None))
+            assert len(server._tasks) <= 2
+        await server.stop()
+        assert sorted(application.processed) == [1, 2, 3, 4]
+
+    asyncio.run(main())
+
+def test_stop_drains_in_flight_updates():
+    async def main():
+        application = FakeApplication({1: 0.05, 2: 5.0})
+        server = make_server(application)
+        await server.start()
+        first = await server.submit(Update.de_json(update_data(1, 1), None))
+        await server.stop(timeout=1)
+        assert first.done() and application.processed == [1]
+
+        # Update yang melewati batas waktu dibatalkan
+        slow = await server.submit(Update.de_json(update_data(2, 2), None))
+        await server.stop(timeout=0.05)
+        await asyncio.sleep(0)
+        assert slow.cancelled() and application.processed == [1]
+
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import pytest
+from src.config import Config
+from src.httpserver import read_request, write_response
+from src.workers import WORKER_PATH, WebhookRouter, update_user_id
+from tests.test_webhook import SECRET, post, update_data
+
+class FakeWorker:
+    """Worker lokal yang mencatat user_id setiap update yang diterimanya"""
+
+    def __init__(self):
+        self.user_ids = []
+        self.server = None
+        self.port = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader, writer) -> None:
+        request = await read_request(reader)
+        assert request.path == WORKER_PATH
+        assert request.headers['x-telegram-bot-api-secret-token'] == SECRET
+        self.user_ids.append(update_user_id(json.loads(request.body)))
+        await write_response(writer, '200 OK')
+        writer.close()
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+def callback_data(update_id: int, user_id: int) -> dict:
+    return {
+        'update_id': update_id,
+        'callback_query': {
+            'id': str(update_id), 'chat_instance': 'x', 'data': 'list:2',
+            'from': {'id': user_id, 'is_bot': False, 'first_name': 'User'},
+            'message': {'message_id': 1, 'date': 0, 'chat': {'id': user_id, 'type': 'private'}},
+        },
+    }
+
+def test_update_user_id():
+    assert update_user_id(update_data(1, 42)) == 42
+    assert update_user_id(callback_data(1, 43)) == 43
+    assert update_user_id({'update_id': 1, 'edited_message': {'chat': {'id': 44}}}) == 44
+    assert update_user_id({'update_id': 1}) == 0
+
+def test_router_sends_each_user_to_the_same_worker():
+    async def main():
+        workers = [FakeWorker() for _ in range(3)]
+        for worker in workers:
+            await worker.start()
+        router = WebhookRouter([w.port for w in workers], host='127.0.0.1', port=0, path='/telegram',
+                               secret_token=SECRET)
+        await router.start()
+        update_id = 0
+        for user_id in range(1, 10):
+            for make in (update_data, callback_data, update_data):
+                update_id += 1
+                assert await post(router.port, json.dumps(make(update_id, user_id)).encode()) == 200
+        assert await post(router.port, json.dumps(update_data(99, 1)).encode(), secret='salah') == 403
+        for index, worker in enumerate(workers):
+            assert worker.user_ids and all(user_id % 3 == index for user_id in worker.user_ids)
+            assert len(worker.user_ids) == 3 * len(set(worker.user_ids))
+
+        # Worker mati: Telegram menerima 503 dan mengirim ulang update
+        await workers[1].stop()
+        assert await post(router.port, json.dumps(update_data(100, 1)).encode()) == 503
+        await router.stop()
+        for worker in (workers[0], workers[2]):
+            await worker.stop()
+
+    asyncio.run(main())
+
+@pytest.fixture
+def multi_worker_config(monkeypatch):
+    monkeypatch.setattr(Config, 'BOT_TOKEN', '0:test')
+    monkeypatch.setattr(Config, 'SPREADSHEET_ID', 'sheet')
+    monkeypatch.setattr(Config, 'WORKERS', 2)
+    monkeypatch.setattr(Config, 'WEBHOOK_URL', 'https://bot.example.com/telegram')
+    monkeypatch.setattr(Config, 'WEBHOOK_SECRET', SECRET)
+    monkeypatch.setattr(Config, 'STATE_BACKEND', 'sqlite')
+
+def test_validate_accepts_multi_worker_webhook(multi_worker_config):
+    Config.validate()
+
+def test_validate_requires_webhook_for_multiple_workers(multi_worker_config, monkeypatch):
+    monkeypatch.setattr(Config, 'WEBHOOK_URL', '')
+    with pytest.raises(ValueError, match='WEBHOOK_URL'):
+        Config.validate()
+
+def test_validate_requires_shared_state_for_multiple_workers(multi_worker_config, monkeypatch):
+    monkeypatch.setattr(Config, 'STATE_BACKEND', 'memory')
+    with pytest.raises(ValueError, match='STATE_BACKEND'):
+        Config.validate()
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import os
+import socket
+import gspread
+import requests
+from google.auth.exceptions import RefreshError, TransportError
+from src.models import Airdrop
+from src.sheets import is_permanent, is_retryable
+from src.write_queue import WriteBehindQueue
+
+def api_error(status: int) -> gspread.exceptions.APIError:
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps({'error': {'code': status, 'message': 'x', 'status': 'x'}}).encode()
+    return gspread.exceptions.APIError(response)
+
+class FlakyClient:
+    """append_rows gagal dengan error yang diberikan sebelum akhirnya berhasil"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.rows = []
+
+    async def append_rows(self, rows):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.rows.extend(rows)
+        return {'updates': {'updatedRange': f'airdropbot!A2:L{len(self.rows) + 1}'}}
+
+def record(i: int) -> Airdrop:
+    return Airdrop(nama=f'Project {i}', link=f'https://project{i}.xyz', type='Galxe')
+
+def run_queue(tmp_path, client, rows: int = 1) -> str:
+    journal = str(tmp_path / 'journal.jsonl')
+
+    async def main():
+        queue = WriteBehindQueue(client, journal_path=journal, flush_interval=0.01)
+        await queue.start()
+        for i in range(rows):
+            await queue.enqueue(record(i))
+        for _ in range(300):
+            if not queue.pending:
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+    asyncio.run(main())
+    return journal
+
+def test_only_definite_rejections_are_permanent():
+    assert is_permanent(api_error(400))
+    assert is_permanent(api_error(404))
+    for status in (401, 403, 429, 500, 503):
+        assert not is_permanent(api_error(status))
+    for error in (TransportError('Failed to resolve'), RefreshError('x'), socket.gaierror(-2, 'x'), OSError('x'),
+                  requests.ConnectionError('x'), asyncio.TimeoutError()):
+        assert not is_permanent(error)
+
+def test_network_errors_are_retryable():
+    for error in (TransportError('x'), socket.gaierror(-2, 'x'), OSError('x'), api_error(429), api_error(503)):
+        assert is_retryable(error)
+    assert not is_retryable(api_error(400))
+
+def test_transport_error_keeps_row_in_journal(tmp_path):
+    client = FlakyClient([TransportError('Failed to resolve sheets.googleapis.com')])
+    journal = run_queue(tmp_path, client)
+    assert [row[0] for row in client.rows] == ['Project 0']
+    assert not os.path.exists(journal + '.failed')
+
+def test_bad_request_is_dead_lettered(tmp_path):
+    client = FlakyClient([api_error(400)])
+    journal = run_queue(tmp_path, client)
+    assert client.rows == []
+    with open(journal + '.failed', encoding='utf-8') as f:
+        assert json.loads(f.readline())[0] == 'Project 0'